@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+"""Load test of the DevCrew REST API with many concurrent clients.
+
+Pre-populates a workspace with thousands of projects in the SQLite project
+store (the default) and generated artifacts for some of them. Half of
+those have an artifact manifest; the other half exercise the filesystem
+fallback. It then drives a weighted mix of traffic for a fixed duration:
+
+  status    GET /projects/{id}
+  list      GET /projects/?limit=50 (half with a status filter)
+  docs      GET /projects/{id}/docs
+  doc       GET /projects/{id}/docs/<file>
+  artifact  GET /projects/{id}/artifacts/<file>
+  create    POST /projects/ (the crew is stubbed: the worker pool emits task
+            events and completes after --crew-seconds)
+
+It reports p50/p95/p99 latency and throughput per endpoint and overall,
+and saves the results to benchmarks/results/.
+
+By default the app runs under uvicorn in a child process, so the server
+and the load generator don't share a CPU or event loop. --transport asgi
+calls the app in-process through httpx.ASGITransport instead. In that
+mode a POST's latency includes its background task, because the
+transport waits for the app to finish.
+
+    python benchmarks/api_load.py
+    python benchmarks/api_load.py --projects 10000 --concurrency 100 --duration 60
+    python benchmarks/api_load.py --transport asgi --mix status=1,list=1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+DEFAULT_MIX = 'status=50,list=15,docs=10,doc=10,artifact=10,create=5'
+STATUS_MIX = (('completed', 70), ('failed', 10), ('running', 10), ('queued', 5), ('cancelled', 5))
+DOCS = ('requirements/project_plan.md', 'architecture/architecture.md', 'technical_design/technical_design.md',
+        'implementation/implementation_summary.md', 'testing/test_results.md')
+SOURCES = ('src/app/page.tsx', 'src/app/layout.tsx', 'src/components/TaskList.tsx', 'package.json')
+STUB_TASKS = ('analyze_requirements', 'design_architecture', 'implement_requirements', 'create_documentation')
+
+# Workspace setup
+
+def populate(workspace: str, projects: int, artifact_projects: int, seed: int) -> Dict[str, List[str]]:
+    """Create project records and artifacts; returns the ids to target per endpoint"""
+    sys.path.insert(0, SRC_DIR)
+    from dev_crew.api.store import SQLiteProjectStore
+    from dev_crew.utils.manifest import ArtifactManifest
+
+    rng = random.Random(seed)
+    store = SQLiteProjectStore(os.path.join(workspace, '.devcrew', 'projects.sqlite'))
+    statuses = [status for status, weight in STATUS_MIX for _ in range(weight)]
+    started = datetime.now() - timedelta(days=30)
+    targets: Dict[str, List[str]] = {'all': [], 'artifacts': []}
+    doc_body = "# {title}\n\n" + "Generated content for the load test.\n" * 200
+
+    for i in range(projects):
+        project_id = f"load-{i:06d}"
+        status = 'completed' if i < artifact_projects else rng.choice(statuses)
+        created_at = (started + timedelta(seconds=i * 60)).isoformat()
+        project_dir = os.path.join(workspace, f"project_{i:06d}")
+        record = {
+            'status': status,
+            'created_at': created_at,
+            'updated_at': created_at,
+            'progress': 100 if status == 'completed' else rng.randint(0, 90),
+            'tasks_completed': list(STUB_TASKS) if status == 'completed' else [],
+            'request': {'requirements': 'Load test project', 'project_name': f"project_{i:06d}",
+                        'timeout': 3600, 'budget': None},
+            'artifacts_path': project_dir if status == 'completed' else None,
+            'error': 'Stub failure' if status == 'failed' else None
+        }
+        if i < artifact_projects:
+            for rel_path in [f"docs/{doc}" for doc in DOCS] + list(SOURCES):
+                path = os.path.join(project_dir, rel_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write(doc_body.format(title=rel_path))
+            if i % 2 == 0:
+                ArtifactManifest(project_dir).rebuild()
+            targets['artifacts'].append(project_id)
+        store.create(project_id, record)
+        targets['all'].append(project_id)
+    return targets
+
+# Server
+
+def serve(workspace: str, port: int, crew_seconds: float) -> None:
+    """Child process: the real app on uvicorn with a stubbed crew worker pool"""
+    import uvicorn
+    app = stub_app(crew_seconds)
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning', access_log=False)
+
+def stub_app(crew_seconds: float):
+    """The API app whose worker pool reports a few task events and completes without running a crew"""
+    from dev_crew.api import main as api
+
+    async def run(project_id: str, requirements: str, project_name: Optional[str] = None, timeout=None,
+                  on_start=None, on_event=None, budget=None, resume: bool = False, **kwargs) -> Dict[str, Any]:
+        if on_start:
+            await on_start()
+        for n, task in enumerate(STUB_TASKS, 1):
+            await asyncio.sleep(crew_seconds / len(STUB_TASKS))
+            if on_event:
+                await on_event({'type': 'task_started', 'task': task})
+                await on_event({'type': 'task_finished', 'task': task, 'duration': crew_seconds / len(STUB_TASKS),
+                                'progress': round(100 * n / len(STUB_TASKS), 1)})
+        project_dir = os.path.join(api.worker_pool.workspace_dir, project_name or project_id)
+        os.makedirs(project_dir, exist_ok=True)
+        return {'status': 'completed', 'artifacts_path': project_dir, 'result': 'stub crew'}
+
+    api.worker_pool.run = run
+    return api.app
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+# Load generation
+
+def parse_mix(mix: str) -> List[Tuple[str, int]]:
+    weights = []
+    for part in mix.split(','):
+        name, weight = part.split('=')
+        if name not in ('status', 'list', 'docs', 'doc', 'artifact', 'create'):
+            raise ValueError(f"Unknown endpoint in --mix: {name}")
+        weights.append((name, int(weight)))
+    return weights
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))]
+
+def request_for(kind: str, rng: random.Random, targets: Dict[str, List[str]]) -> Tuple[str, str, Optional[Dict]]:
+    if kind == 'status':
+        return 'GET', f"/projects/{rng.choice(targets['all'])}", None
+    if kind == 'list':
+        query = '?limit=50' + (f"&status={rng.choice(('completed', 'failed', 'running'))}" if rng.random() < 0.5 else '')
+        return 'GET', f"/projects/{query}", None
+    if kind == 'docs':
+        return 'GET', f"/projects/{rng.choice(targets['artifacts'])}/docs", None
+    if kind == 'doc':
+        return 'GET', f"/projects/{rng.choice(targets['artifacts'])}/docs/{rng.choice(DOCS)}", None
+    if kind == 'artifact':
+        return 'GET', f"/projects/{rng.choice(targets['artifacts'])}/artifacts/{rng.choice(SOURCES)}", None
+    return 'POST', '/projects/', {'requirements': 'Load test project', 'timeout': 600}
+
+async def generate_load(client, targets: Dict[str, List[str]], mix: List[Tuple[str, int]],
+                        concurrency: int, duration: float, seed: int) -> Tuple[Dict[str, Dict[str, Any]], float]:
+    kinds = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    samples: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    errors: Dict[str, Dict[str, int]] = {kind: {} for kind in kinds}
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(n: int) -> None:
+        rng = random.Random(seed + n)
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            method, url, body = request_for(kind, rng, targets)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                outcome = None if response.status_code < 400 else str(response.status_code)
+            except Exception as e:
+                outcome = type(e).__name__
+            samples[kind].append(time.perf_counter() - start)
+            if outcome:
+                errors[kind][outcome] = errors[kind].get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    def stats(values: List[float], errors_by_kind: Dict[str, int]) -> Dict[str, Any]:
+        values = sorted(values)
+        return {
+            'requests': len(values),
+            'errors': errors_by_kind,
+            'throughput_rps': round(len(values) / elapsed, 1),
+            'p50_ms': round(1000 * percentile(values, 0.50), 2),
+            'p95_ms': round(1000 * percentile(values, 0.95), 2),
+            'p99_ms': round(1000 * percentile(values, 0.99), 2),
+            'max_ms': round(1000 * values[-1], 2) if values else 0.0
+        }
+
+    report = {kind: stats(samples[kind], errors[kind]) for kind in kinds}
+    all_errors: Dict[str, int] = {}
+    for by_kind in errors.values():
+        for outcome, count in by_kind.items():
+            all_errors[outcome] = all_errors.get(outcome, 0) + count
+    report['overall'] = stats([v for values in samples.values() for v in values], all_errors)
+    return report, elapsed
+
+async def run_load(args: argparse.Namespace, workspace: str, targets: Dict[str, List[str]]) -> Tuple[Dict, float]:
+    import httpx
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    mix = parse_mix(args.mix)
+
+    if args.transport == 'asgi':
+        app = stub_app(args.crew_seconds)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=60) as client:
+            return await generate_load(client, targets, mix, args.concurrency, args.duration, args.seed)
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', '--port', str(port), '--workspace', workspace,
+         '--crew-seconds', str(args.crew_seconds)],
+        env=os.environ.copy(), stdout=subprocess.DEVNULL
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits) as client:
+            for _ in range(300):
+                try:
+                    if (await client.get('/health')).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError(f"API server exited with code {server.returncode}")
+                await asyncio.sleep(0.1)
+            return await generate_load(client, targets, mix, args.concurrency, args.duration, args.seed)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+def print_report(report: Dict[str, Dict[str, Any]]) -> None:
+    print(f"\n{'endpoint':<10} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9}")
+    for kind, stats in report.items():
+        print(f"{kind:<10} {stats['requests']:>9} {sum(stats['errors'].values()):>7} {stats['throughput_rps']:>9.1f} "
+              f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+    for kind, stats in report.items():
+        if stats['errors'] and kind != 'overall':
+            print(f"  {kind} errors: {stats['errors']}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', type=int, default=2000, help='project records to pre-populate')
+    parser.add_argument('--artifact-projects', type=int, default=200, help='completed projects given artifacts')
+    parser.add_argument('--concurrency', type=int, default=50, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=20, help='seconds of load')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument('--crew-seconds', type=float, default=0.5, help='duration of a stubbed crew run')
+    parser.add_argument('--transport', choices=('uvicorn', 'asgi'), default='uvicorn')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workspace', help='workspace to use (default: a temporary one, removed afterwards)')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/api-load-<timestamp>.json)')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # The API reads its workspace and store settings at import
+    workspace = os.path.abspath(args.workspace or tempfile.mkdtemp(prefix='devcrew-api-load-'))
+    os.environ.update({
+        'DEVCREW_WORKSPACE': workspace,
+        'DEVCREW_PROJECT_STORE': 'sqlite',
+        'DEVCREW_EXECUTION_MODE': 'process',
+        'DEVCREW_CACHE_DIR': os.path.join(workspace, '.cache'),
+        'PYTHONPATH': os.pathsep.join(filter(None, [SRC_DIR, os.environ.get('PYTHONPATH')]))
+    })
+    os.environ.pop('DEVCREW_PROJECT_DB', None)
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+    if args.serve:
+        serve(workspace, args.port, args.crew_seconds)
+        return 0
+
+    import logging
+    logging.disable(logging.INFO)
+    try:
+        started = time.perf_counter()
+        targets = populate(workspace, args.projects, min(args.artifact_projects, args.projects), args.seed)
+        print(f"Populated {args.projects} projects ({len(targets['artifacts'])} with artifacts) "
+              f"in {time.perf_counter() - started:.1f}s")
+        print(f"Driving {args.concurrency} clients for {args.duration:.0f}s over {args.transport} ({args.mix})")
+        report, elapsed = asyncio.run(run_load(args, workspace, targets))
+    finally:
+        if not args.workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+    print_report(report)
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'settings': {key: getattr(args, key) for key in ('projects', 'artifact_projects', 'concurrency', 'duration',
+                                                         'mix', 'crew_seconds', 'transport', 'seed')},
+        'elapsed_seconds': round(elapsed, 3),
+        'endpoints': report
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"api-load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults: {output}")
+    return 1 if report['overall']['errors'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
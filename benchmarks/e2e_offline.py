@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+"""Offline end-to-end benchmark of DevCrew's orchestration overhead.
+
+Starts a local OpenAI-compatible chat completions stub and a Serper
+stand-in (OPENAI_API_BASE / SERPER_BASE_URL), then runs the full pipeline
+with no network access:
+
+  crew  DevCrew(...).crew().kickoff() in a child process
+  api   the FastAPI app served by uvicorn in a child process, driven with
+        httpx (POST /projects/, poll GET /projects/{id}, fetch docs)
+
+Each run gets a fresh workspace and cache directory. It reports wall time,
+per-task (phase) time, tool time, LLM stub time, CPU, peak RSS and file
+I/O (/proc/<pid>/io, including reaped children). Results are saved to
+benchmarks/results/ and can be compared with an earlier file; the exit
+code is 1 when a compared metric regressed by more than --threshold.
+
+The stub answers every agent turn with a scripted ReAct reply: the first
+turn of a task calls Write File (or Search the internet when the agent has
+no file tool), the next one gives a final answer. --responses takes a
+JSONL file of {"match": "<text in the last message>", "content": "<reply>"}
+entries, e.g. recorded from real runs, that take precedence over the script.
+
+    python benchmarks/e2e_offline.py
+    python benchmarks/e2e_offline.py --mode crew --runs 3 --llm-latency 0.2
+    python benchmarks/e2e_offline.py --compare benchmarks/results/e2e-20260101-120000.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+PROJECT_NAME = 'bench_project'
+REQUIREMENTS = "Create a task tracker with Next.js 15, TypeScript, TailwindCSS and Jest tests"
+# Metrics compared against a baseline: lower is better for all of them
+COMPARED_METRICS = ('wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'write_mb', 'overhead_seconds')
+
+# Stub servers
+
+FINAL_DOCUMENT = """## Overview
+Scripted benchmark output for {task}. It stands in for an LLM-written document.
+
+## Components
+- TaskList: renders tasks from the data layer
+- TaskForm: validates and submits new tasks
+- api/tasks: REST route for task CRUD
+
+## Decisions
+Server Components by default; client components only for interactive forms.
+"""
+
+class ScriptedResponder:
+    """Replies to chat completions: recorded responses first, then the default two-turn script"""
+
+    def __init__(self, recorded: Optional[List[Dict[str, str]]] = None):
+        self.recorded = recorded or []
+        self.counter = 0
+        self._lock = threading.Lock()
+
+    def respond(self, messages: List[Dict[str, Any]]) -> str:
+        texts = [str(m.get('content') or '') for m in messages]
+        last = texts[-1] if texts else ''
+        for entry in self.recorded:
+            if entry['match'] in last:
+                return entry['content']
+
+        with self._lock:
+            self.counter += 1
+            n = self.counter
+        prompt = '\n'.join(texts)
+        task = re.search(r'Current Task:\s*(.{0,60})', prompt)
+        task = task.group(1).strip() if task else 'task'
+        # System prompt and task only: the agent hasn't used a tool yet
+        if len(messages) <= 2:
+            if 'Tool Name: Write File' in prompt:
+                content = json.dumps(f"# Note {n}\n\nGenerated while working on: {task}\n" * 20)
+                return ("Thought: I should record my notes first\nAction: Write File\n"
+                        f'Action Input: {{"file_path": "{PROJECT_NAME}/notes/note_{n}.md", "content": {content}}}')
+            if 'Tool Name: Search the internet' in prompt:
+                return ("Thought: I should research best practices\nAction: Search the internet with Serper\n"
+                        f'Action Input: {{"search_query": "next.js best practices {n}"}}')
+        return "Thought: I now know the final answer\nFinal Answer: " + FINAL_DOCUMENT.format(task=task)
+
+class StubServer(ThreadingHTTPServer):
+    """OpenAI /chat/completions and Serper /search + /news on one local port"""
+
+    daemon_threads = True
+
+    def __init__(self, responder: ScriptedResponder, llm_latency: float, search_latency: float):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.responder = responder
+        self.llm_latency = llm_latency
+        self.search_latency = search_latency
+        self.stats = {'llm_requests': 0, 'search_requests': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        if self.path.endswith('/chat/completions'):
+            self.server.count('llm_requests')
+            time.sleep(self.server.llm_latency)
+            content = self.server.responder.respond(request.get('messages', []))
+            prompt_tokens = sum(len(str(m.get('content') or '')) for m in request.get('messages', [])) // 4
+            self._send_json({
+                'id': f"chatcmpl-bench-{self.server.stats['llm_requests']}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': request.get('model', 'gpt-4o-mini'),
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': content}}],
+                'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': len(content) // 4,
+                          'total_tokens': prompt_tokens + len(content) // 4}
+            })
+        elif self.path.rstrip('/').endswith(('/search', '/news')):
+            self.server.count('search_requests')
+            time.sleep(self.server.search_latency)
+            query = request.get('q', '')
+            self._send_json({
+                'searchParameters': {'q': query, 'type': 'search'},
+                'organic': [{'title': f"{query} - result {i}", 'link': f"https://example.com/{i}",
+                             'snippet': f"Offline stub result {i} for {query}.", 'position': i}
+                            for i in range(1, int(request.get('num') or 10) + 1)]
+            })
+        else:
+            self.send_error(404)
+
+def start_stub(args: argparse.Namespace) -> StubServer:
+    recorded = []
+    if args.responses:
+        with open(args.responses, 'r') as f:
+            recorded = [json.loads(line) for line in f if line.strip()]
+    server = StubServer(ScriptedResponder(recorded), args.llm_latency, args.search_latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Measurements (run inside the child process)
+
+def allow_missing_docker() -> None:
+    """The engineer agent may execute code, which crewAI checks for Docker at construction.
+
+    The scripted responses never ask for code execution, so the check is
+    skipped on machines without Docker. Worker subprocesses run the check
+    themselves, so without Docker the api mode runs crews in threads.
+    """
+    if shutil.which('docker') is None:
+        from crewai import Agent
+        Agent._validate_docker_installation = lambda self: None
+
+def process_io() -> Dict[str, int]:
+    """Bytes read/written by this process and its reaped children (Linux)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return {key: int(fields[key]) for key in ('rchar', 'wchar', 'read_bytes', 'write_bytes')}
+    except OSError:
+        return {'rchar': 0, 'wchar': 0, 'read_bytes': 0, 'write_bytes': 0}
+
+def resource_usage() -> Dict[str, float]:
+    own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        'cpu_seconds': own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime,
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mb': max(own.ru_maxrss, children.ru_maxrss) / 1024
+    }
+
+def summarize_measurements(wall: float, import_seconds: float, io_before: Dict[str, int], io_after: Dict[str, int],
+                           tasks: Dict[str, float], tools: Dict[str, float], llm_seconds: float) -> Dict[str, Any]:
+    usage = resource_usage()
+    return {
+        'wall_seconds': round(wall, 3),
+        'import_seconds': round(import_seconds, 3),
+        'cpu_seconds': round(usage['cpu_seconds'], 3),
+        'peak_rss_mb': round(usage['peak_rss_mb'], 1),
+        'read_mb': round((io_after['rchar'] - io_before['rchar']) / 1e6, 3),
+        'write_mb': round((io_after['wchar'] - io_before['wchar']) / 1e6, 3),
+        'disk_write_mb': round((io_after['write_bytes'] - io_before['write_bytes']) / 1e6, 3),
+        'tasks': {name: round(seconds, 3) for name, seconds in tasks.items()},
+        'tools': {name: round(seconds, 3) for name, seconds in tools.items()},
+        'llm_seconds': round(llm_seconds, 3),
+        # Time not spent importing or waiting on the (stubbed) LLM: DevCrew's own orchestration and tool work
+        'overhead_seconds': round(wall - import_seconds - llm_seconds, 3)
+    }
+
+def child_crew(workspace: str) -> Dict[str, Any]:
+    io_before = process_io()
+    started = time.perf_counter()
+    from dev_crew.crew import DevCrew
+    from dev_crew.utils import metrics
+    import_seconds = time.perf_counter() - started
+    allow_missing_docker()
+
+    tasks: Dict[str, float] = {}
+    tools: Dict[str, float] = {}
+    llm_seconds = [0.0]
+
+    def on_metric(event: Dict[str, Any]) -> None:
+        if event['metric'] == metrics.TOOL_DURATION.name:
+            tool = event['labels'].get('tool', '?')
+            tools[tool] = tools.get(tool, 0.0) + event['value']
+        elif event['metric'] == metrics.LLM_REQUEST_DURATION.name:
+            llm_seconds[0] += event['value']
+
+    def on_event(event: Dict[str, Any]) -> None:
+        if event['type'] == 'task_finished' and event.get('duration') is not None:
+            tasks[event['task']] = event['duration']
+
+    metrics.set_forwarder(on_metric)
+    build_started = time.perf_counter()
+    crew = DevCrew(REQUIREMENTS, project_name=PROJECT_NAME, workspace_dir=workspace, event_sink=on_event).crew()
+    build_seconds = time.perf_counter() - build_started
+    crew.kickoff()
+    result = summarize_measurements(time.perf_counter() - started, import_seconds, io_before, process_io(),
+                                    tasks, tools, llm_seconds[0])
+    # Agents, tools and the task graph, before the first task starts
+    result['build_seconds'] = round(build_seconds, 3)
+    return result
+
+def parse_metric_sums(text: str, name: str, label: str) -> Dict[str, float]:
+    """<name>_sum values by one label from Prometheus text"""
+    sums = {}
+    for match in re.finditer(rf'^{name}_sum\{{([^}}]*)\}} (\S+)$', text, re.MULTILINE):
+        labels = dict(re.findall(r'(\w+)="([^"]*)"', match.group(1)))
+        sums[labels.get(label, '?')] = sums.get(labels.get(label, '?'), 0.0) + float(match.group(2))
+    return sums
+
+async def drive_api(port: int, requests: int) -> Dict[str, Any]:
+    import httpx
+    latencies: Dict[str, List[float]] = {'submit': [], 'status': [], 'docs': []}
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+        async def timed(kind: str, method: str, url: str, **kwargs) -> httpx.Response:
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies[kind].append(time.perf_counter() - start)
+            return response
+
+        async def one(i: int) -> str:
+            response = await timed('submit', 'POST', '/projects/', json={
+                'requirements': REQUIREMENTS, 'project_name': f"{PROJECT_NAME}_{i}", 'timeout': 600})
+            project_id = response.json()['project_id']
+            while True:
+                status = (await timed('status', 'GET', f"/projects/{project_id}")).json()['status']
+                if status in ('completed', 'failed', 'timeout', 'cancelled', 'budget_exceeded'):
+                    break
+                await asyncio.sleep(0.1)
+            await timed('docs', 'GET', f"/projects/{project_id}/docs")
+            return status
+
+        statuses = await asyncio.gather(*(one(i) for i in range(requests)))
+        metrics_text = (await client.get('/metrics')).text
+    return {
+        'statuses': statuses,
+        'latency_ms': {kind: round(1000 * sum(values) / len(values), 2) for kind, values in latencies.items() if values},
+        'tasks': parse_metric_sums(metrics_text, 'devcrew_task_duration_seconds', 'task'),
+        'tools': parse_metric_sums(metrics_text, 'devcrew_tool_duration_seconds', 'tool'),
+        'llm_seconds': sum(parse_metric_sums(metrics_text, 'devcrew_llm_request_duration_seconds', 'model').values())
+    }
+
+def child_api(workspace: str, requests: int) -> Dict[str, Any]:
+    io_before = process_io()
+    started = time.perf_counter()
+    import uvicorn
+    from dev_crew.api.main import app
+    import_seconds = time.perf_counter() - started
+    allow_missing_docker()
+
+    async def serve_and_drive() -> Dict[str, Any]:
+        server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=0, log_level='warning'))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        try:
+            return await drive_api(port, requests)
+        finally:
+            server.should_exit = True
+            await serving
+
+    outcome = asyncio.run(serve_and_drive())
+    result = summarize_measurements(time.perf_counter() - started, import_seconds, io_before, process_io(),
+                                    outcome['tasks'], outcome['tools'], outcome['llm_seconds'])
+    result.update(statuses=outcome['statuses'], latency_ms=outcome['latency_ms'])
+    return result
+
+# Orchestration (parent process)
+
+def run_child(mode: str, stub: StubServer, args: argparse.Namespace) -> Dict[str, Any]:
+    root = tempfile.mkdtemp(prefix=f"devcrew-bench-{mode}-")
+    workspace = os.path.join(root, 'workspace')
+    result_path = os.path.join(root, 'result.json')
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join(filter(None, [SRC_DIR, os.environ.get('PYTHONPATH')])),
+        'OPENAI_API_KEY': 'sk-offline-benchmark',
+        'OPENAI_API_BASE': f"{stub.url}/v1",
+        'SERPER_API_KEY': 'offline-benchmark',
+        'SERPER_BASE_URL': stub.url,
+        'DEVCREW_WORKSPACE': workspace,
+        'DEVCREW_CACHE_DIR': args.cache_dir or os.path.join(root, 'cache'),
+        'DEVCREW_PROJECT_STORE': os.environ.get('DEVCREW_PROJECT_STORE', 'memory'),
+        'DEVCREW_EXECUTION_MODE': args.execution_mode or ('process' if shutil.which('docker') else 'thread'),
+        # No npm in the loop: the framework tool would otherwise dominate (and need the network)
+        'DEVCREW_SCAFFOLD_CACHE': '0',
+        'DEVCREW_LLM_RETRIES': '0',
+        'OTEL_SDK_DISABLED': 'true',
+        'CREWAI_DISABLE_TELEMETRY': 'true',
+        # litellm otherwise downloads its model price list at import
+        'LITELLM_LOCAL_MODEL_COST_MAP': 'True',
+        'no_proxy': '127.0.0.1,localhost',
+        'NO_PROXY': '127.0.0.1,localhost'
+    }
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode, '--workspace', workspace,
+               '--result', result_path, '--api-requests', str(args.api_requests)]
+    try:
+        completed = subprocess.run(command, env=env, cwd=root, timeout=args.timeout,
+                                   stdout=subprocess.DEVNULL if not args.verbose else None,
+                                   stderr=subprocess.PIPE if not args.verbose else None, text=True)
+        if completed.returncode != 0 or not os.path.exists(result_path):
+            raise RuntimeError(f"{mode} run failed (exit {completed.returncode}):\n{(completed.stderr or '')[-3000:]}")
+        with open(result_path, 'r') as f:
+            return json.load(f)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+def median_run(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return sorted(runs, key=lambda run: run['wall_seconds'])[len(runs) // 2]
+
+def print_result(mode: str, result: Dict[str, Any]) -> None:
+    print(f"\n[{mode}] wall {result['wall_seconds']:.2f}s  cpu {result['cpu_seconds']:.2f}s  "
+          f"import {result['import_seconds']:.2f}s  peak rss {result['peak_rss_mb']:.0f} MB  read {result['read_mb']:.1f} MB  "
+          f"write {result['write_mb']:.1f} MB  llm stub {result['llm_seconds']:.2f}s  "
+          f"overhead {result['overhead_seconds']:.2f}s" +
+          (f" (crew build {result['build_seconds']:.2f}s)" if 'build_seconds' in result else ''))
+    for task, seconds in result['tasks'].items():
+        print(f"  task {task:<36} {seconds:>8.3f}s")
+    for tool, seconds in sorted(result['tools'].items(), key=lambda item: -item[1]):
+        print(f"  tool {tool:<36} {seconds:>8.3f}s")
+    for kind, ms in result.get('latency_ms', {}).items():
+        print(f"  api  {kind:<36} {ms:>8.2f}ms avg")
+
+def compare(results: Dict[str, Any], baseline_path: str, threshold: float) -> List[str]:
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    regressions = []
+    print(f"\nCompared with {baseline_path}:")
+    for mode, result in results['modes'].items():
+        before = baseline.get('modes', {}).get(mode)
+        if not before:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = '  REGRESSION' if change > threshold else ''
+            print(f"  {mode:<5} {metric:<18} {old:>10.3f} -> {new:>10.3f}  ({change:+.1%}){flag}")
+            if flag:
+                regressions.append(f"{mode} {metric} {change:+.1%}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('crew', 'api', 'all'), default='all')
+    parser.add_argument('--runs', type=int, default=1, help='runs per mode (the median run is reported)')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='seconds per stub completion')
+    parser.add_argument('--search-latency', type=float, default=0.02, help='seconds per stub search')
+    parser.add_argument('--responses', help='JSONL of recorded {"match", "content"} responses')
+    parser.add_argument('--api-requests', type=int, default=2, help='concurrent projects submitted in api mode')
+    parser.add_argument('--execution-mode', choices=('process', 'thread'),
+                        help='how the API runs crews (default: process, or thread without Docker)')
+    parser.add_argument('--cache-dir', help='reuse a cache directory (default: a fresh one per run)')
+    parser.add_argument('--timeout', type=int, default=900, help='seconds per run')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/e2e-<timestamp>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative regression that fails --compare')
+    parser.add_argument('--keep', action='store_true', help='keep the temporary workspaces')
+    parser.add_argument('--verbose', action='store_true', help='show crew output')
+    parser.add_argument('--child', choices=('crew', 'api'), help=argparse.SUPPRESS)
+    parser.add_argument('--workspace', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = child_crew(args.workspace) if args.child == 'crew' else child_api(args.workspace, args.api_requests)
+        with open(args.result, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    stub = start_stub(args)
+    results: Dict[str, Any] = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'settings': {'runs': args.runs, 'execution_mode': args.execution_mode, 'llm_latency': args.llm_latency, 'search_latency': args.search_latency,
+                     'api_requests': args.api_requests, 'responses': args.responses},
+        'modes': {}
+    }
+    for mode in (('crew', 'api') if args.mode == 'all' else (args.mode,)):
+        before = dict(stub.stats)
+        runs = [run_child(mode, stub, args) for _ in range(args.runs)]
+        result = median_run(runs)
+        result['stub'] = {key: (stub.stats[key] - before[key]) // args.runs for key in stub.stats}
+        result['wall_seconds_runs'] = [run['wall_seconds'] for run in runs]
+        results['modes'][mode] = result
+        print_result(mode, result)
+    stub.shutdown()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"e2e-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults: {output}")
+
+    incomplete = [status for result in results['modes'].values() for status in result.get('statuses', ())
+                  if status != 'completed']
+    if incomplete:
+        print(f"FAIL: {len(incomplete)} API project(s) did not complete: {', '.join(incomplete)}")
+        return 1
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"FAIL: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Cold-import budget check for dev_crew entry points.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+fails (exit code 1) when an entry point's best-of-N cumulative import time
+exceeds its budget or when it pulls in a module it must not load eagerly.
+tests/test_import_time.py runs the same check under pytest.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 5 --budget dev_crew.api.main=800
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# module: (budget in ms, modules that must not be imported)
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    'dev_crew.main': (250, ('crewai', 'crewai_tools', 'litellm')),
+    'dev_crew.api.main': (1500, ('crewai', 'crewai_tools', 'litellm')),
+    'dev_crew.api.worker': (250, ('crewai', 'crewai_tools', 'litellm')),
+    'dev_crew.crew': (6000, ('crewai_tools',))
+}
+
+def measure(module: str) -> Tuple[float, List[Tuple[str, float, float]]]:
+    """Return the module's cumulative import time (ms) and every (name, self ms, cumulative ms)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    total = next((cumulative for name, _, cumulative in imports if name == module), 0.0)
+    return total, imports
+
+def heaviest_packages(imports: List[Tuple[str, float, float]], limit: int = 5) -> List[Tuple[str, float]]:
+    """Self time summed per top-level package"""
+    totals: Dict[str, float] = {}
+    for name, self_ms, _ in imports:
+        package = name.split('.')[0]
+        totals[package] = totals.get(package, 0.0) + self_ms
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3, help='fresh interpreters per module (best run counts)')
+    parser.add_argument('--budget', action='append', default=[], metavar='MODULE=MS',
+                        help='override or add a budget')
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS)
+    for override in args.budget:
+        module, ms = override.split('=', 1)
+        budgets[module] = (float(ms), budgets.get(module, (0, ()))[1])
+
+    failures = []
+    print(f"{'module':<24} {'best ms':>10} {'budget ms':>10}  heaviest packages (self ms)")
+    for module, (budget_ms, forbidden) in budgets.items():
+        runs = [measure(module) for _ in range(args.runs)]
+        best, imports = min(runs, key=lambda run: run[0])
+        heavy = ', '.join(f"{name} {ms:.0f}" for name, ms in heaviest_packages(imports))
+        print(f"{module:<24} {best:>10.1f} {budget_ms:>10.0f}  {heavy}")
+
+        if best > budget_ms:
+            failures.append(f"{module} took {best:.0f} ms (budget {budget_ms:.0f} ms)")
+        loaded = {name for name, _, _ in imports}
+        for name in forbidden:
+            if name in loaded:
+                failures.append(f"{module} imports {name} eagerly")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
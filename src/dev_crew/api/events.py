@@ -0,0 +1,69 @@
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from collections import deque
+import asyncio
+import json
+import os
+
+TERMINAL_STATUSES = {'completed', 'failed', 'timeout', 'cancelled', 'budget_exceeded'}
+
+class ProjectEventBus:
+    """Per-project bounded event buffers that SSE clients can follow and resume.
+
+    Event ids increase per project, so a reconnecting client sends the last id
+    it saw (Last-Event-ID) and receives whatever is still buffered after it.
+    Buffers live in the API process that runs the project.
+    """
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        self.buffer_size = buffer_size or int(os.getenv('DEVCREW_EVENT_BUFFER_SIZE', '500'))
+        self._buffers: Dict[str, deque] = {}
+        self._next_id: Dict[str, int] = {}
+        self._conditions: Dict[str, asyncio.Condition] = {}
+
+    def _condition(self, project_id: str) -> asyncio.Condition:
+        if project_id not in self._conditions:
+            self._conditions[project_id] = asyncio.Condition()
+        return self._conditions[project_id]
+
+    async def publish(self, project_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        event_id = self._next_id.get(project_id, 1)
+        self._next_id[project_id] = event_id + 1
+        buffer = self._buffers.setdefault(project_id, deque(maxlen=self.buffer_size))
+        buffer.append((event_id, event_type, data))
+        condition = self._condition(project_id)
+        async with condition:
+            condition.notify_all()
+        return event_id
+
+    def events_after(self, project_id: str, last_event_id: int) -> list:
+        return [event for event in self._buffers.get(project_id, ()) if event[0] > last_event_id]
+
+    async def subscribe(self, project_id: str, last_event_id: int = 0,
+                        heartbeat: float = 15.0) -> AsyncIterator[Optional[Tuple[int, str, Dict[str, Any]]]]:
+        """Yield buffered then live events; yields None when idle for a heartbeat interval"""
+        condition = self._condition(project_id)
+        while True:
+            # Check under the lock so a publish between the check and the wait isn't missed
+            async with condition:
+                pending = self.events_after(project_id, last_event_id)
+                if not pending:
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=heartbeat)
+                        continue
+                    except asyncio.TimeoutError:
+                        pass
+            if not pending:
+                yield None
+            for event in pending:
+                last_event_id = event[0]
+                yield event
+
+    def discard(self, project_id: str) -> None:
+        """Drop a finished project's buffer"""
+        self._buffers.pop(project_id, None)
+        self._next_id.pop(project_id, None)
+        self._conditions.pop(project_id, None)
+
+def format_sse(event_id: Optional[int], event_type: str, data: Dict[str, Any]) -> str:
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
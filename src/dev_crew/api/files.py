@@ -0,0 +1,131 @@
+from typing import Iterator, Optional
+from email.utils import formatdate
+import hashlib
+import mimetypes
+import os
+import zlib
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+
+# Files smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+# Types mimetypes gets wrong (or doesn't know) for generated projects; .ts would be video/mp2t
+MEDIA_TYPE_OVERRIDES = {
+    '.md': 'text/markdown',
+    '.ts': 'text/typescript',
+    '.tsx': 'text/typescript',
+    '.jsx': 'text/javascript',
+    '.mjs': 'text/javascript',
+    '.json': 'application/json',
+    '.lock': 'text/plain',
+    '.env': 'text/plain'
+}
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+def resolve_within(base_dir: str, relative_path: str) -> Optional[str]:
+    """Resolve a client-supplied path under base_dir; None if it escapes it or isn't a file"""
+    base = os.path.realpath(base_dir)
+    path = os.path.realpath(os.path.join(base, relative_path))
+    if os.path.commonpath([base, path]) != base or not os.path.isfile(path):
+        return None
+    return path
+
+def guess_media_type(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in MEDIA_TYPE_OVERRIDES:
+        return MEDIA_TYPE_OVERRIDES[ext]
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """Same validator FileResponse uses, so If-Range and If-None-Match agree with it"""
+    etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+    return f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], *etags: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in candidates or any(etag in candidates for etag in etags)
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick zstd (when zstandard is installed) or gzip from an Accept-Encoding header"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    if zstandard is not None and accepted.get('zstd', 0) > 0:
+        return 'zstd'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+def compressed_chunks(path: str, encoding: str) -> Iterator[bytes]:
+    """Read and compress a file chunk by chunk (iterated in the threadpool by StreamingResponse)"""
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.flush()
+
+def file_response(path: str, request: Request) -> Response:
+    """Serve a file without blocking the event loop.
+
+    Handles If-None-Match (304) and Range (206, via FileResponse). Whole-file
+    requests for text-like content are compressed on the fly when the client
+    accepts it; range requests are always served uncompressed.
+    """
+    stat_result = os.stat(path)
+    etag = file_etag(stat_result)
+    media_type = guess_media_type(path)
+    filename = os.path.basename(path)
+    compressible = media_type.startswith(COMPRESSIBLE_TYPES) and stat_result.st_size >= MIN_COMPRESS_SIZE
+    encoding = None
+    if compressible and 'range' not in request.headers:
+        encoding = choose_encoding(request.headers.get('accept-encoding'))
+    encoded_etag = f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+    headers = {
+        'etag': encoded_etag,
+        'last-modified': formatdate(stat_result.st_mtime, usegmt=True),
+        'cache-control': 'no-cache'
+    }
+    if compressible:
+        headers['vary'] = 'Accept-Encoding'
+
+    if etag_matches(request.headers.get('if-none-match'), etag, encoded_etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers['content-disposition'] = f'inline; filename="{filename}"'
+        headers['content-encoding'] = encoding
+        return StreamingResponse(compressed_chunks(path, encoding), media_type=media_type, headers=headers)
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type='inline',
+        stat_result=stat_result,
+        headers=headers
+    )
@@ -1,13 +1,26 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Literal
 import uuid
 import asyncio
 from datetime import datetime
+from functools import lru_cache
 import os
 import logging
-from ..crew import DevCrew
+from dotenv import load_dotenv
+from .worker import CrewWorkerPool, get_workspace_dir
+from .store import ProjectStore, create_project_store
+from .events import ProjectEventBus, TERMINAL_STATUSES, format_sse
+from .files import file_response, resolve_within
+from ..utils.manifest import ArtifactManifest
+from ..utils import metrics
+from ..utils.disk_cache import DiskCache, get_cache_dir
+from ..utils.usage import BudgetExceeded
+
+# Load environment variables (the crew module, which used to do this, is only imported in thread mode)
+load_dotenv()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,14 +41,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store project status and tasks
-projects = {}
+# This process's running tasks
 running_tasks = {}
 
+# "process" runs each crew in an isolated worker subprocess; "thread" runs it in-process.
+# A thread cannot be stopped: in thread mode a timed-out crew keeps running in the
+# background and projects cannot be cancelled.
+EXECUTION_MODE = os.getenv('DEVCREW_EXECUTION_MODE', 'process')
+worker_pool = CrewWorkerPool()
+
+# Progress events for SSE clients; buffers are kept this many seconds after a project ends
+event_bus = ProjectEventBus()
+EVENT_RETENTION_SECONDS = int(os.getenv('DEVCREW_EVENT_RETENTION', '300'))
+
+class Budget(BaseModel):
+    max_tokens: Optional[int] = Field(None, gt=0)
+    max_cost_usd: Optional[float] = Field(None, gt=0)
+    on_exceeded: Literal["abort", "degrade"] = "abort"
+
 class ProjectRequest(BaseModel):
     requirements: str
     project_name: Optional[str] = None
     timeout: Optional[int] = 3600  # Default 1 hour timeout
+    budget: Optional[Budget] = None
+
+class ResumeRequest(BaseModel):
+    timeout: Optional[int] = None  # Defaults to the original request's timeout
+    budget: Optional[Budget] = None  # Replaces the original budget, e.g. after budget_exceeded
 
 class ProjectStatus(BaseModel):
     project_id: str
@@ -45,44 +77,140 @@ class ProjectStatus(BaseModel):
     artifacts_path: Optional[str] = None
     error: Optional[str] = None
     tasks_completed: Optional[List[str]] = None
+    usage: Optional[Dict[str, Any]] = None
     created_at: str
     updated_at: str
 
+class BatchStatusRequest(BaseModel):
+    project_ids: List[str]
+
+@lru_cache(maxsize=1)
+def get_store() -> ProjectStore:
+    """Project status store (durable, see DEVCREW_PROJECT_STORE)"""
+    # Opened on first use so importing the app never creates a database
+    return create_project_store(get_workspace_dir())
+
 async def update_project_status(project_id: str, updates: Dict[str, Any]):
     """Update project status with timestamp"""
-    if project_id in projects:
-        projects[project_id].update({
-            **updates,
-            "updated_at": datetime.now().isoformat()
+    await asyncio.to_thread(get_store().update, project_id, updates)
+    if "status" in updates:
+        await event_bus.publish(project_id, "status", {
+            "status": updates["status"],
+            "error": updates.get("error")
+        })
+        if updates["status"] in TERMINAL_STATUSES:
+            metrics.PROJECTS.inc(status=updates["status"])
+            asyncio.get_running_loop().call_later(EVENT_RETENTION_SECONDS, discard_events, project_id)
+
+def discard_events(project_id: str):
+    # A resumed project keeps its event stream
+    if project_id not in running_tasks:
+        event_bus.discard(project_id)
+
+async def handle_crew_event(project_id: str, event: Dict[str, Any]):
+    """Publish a crew progress event and fold it into the project status"""
+    if event.get("type") == "metric":
+        metrics.REGISTRY.record(event["metric"], event["value"], event.get("labels"))
+        return
+    
+    event = dict(event)
+    event_type = event.pop("type", "progress")
+    await event_bus.publish(project_id, event_type, event)
+    
+    if event_type == "usage":
+        await update_project_status(project_id, {"usage": event.get("usage")})
+    elif event_type == "task_started":
+        await update_project_status(project_id, {"current_task": event.get("task")})
+    elif event_type == "task_finished":
+        project = await asyncio.to_thread(get_store().get, project_id) or {}
+        await update_project_status(project_id, {
+            "tasks_completed": (project.get("tasks_completed") or []) + [event.get("task")],
+            "progress": event.get("progress")
         })
 
-async def run_crew_task(project_id: str, requirements: str, project_name: Optional[str] = None, timeout: int = 3600):
+async def get_project_or_404(project_id: str) -> Dict[str, Any]:
+    project = await asyncio.to_thread(get_store().get, project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+@lru_cache(maxsize=256)
+def load_manifest(artifacts_path: str) -> ArtifactManifest:
+    # Cached per project; the manifest reloads itself when the worker saves a newer one
+    return ArtifactManifest(artifacts_path)
+
+def project_manifest(project: Dict[str, Any]) -> Optional[ArtifactManifest]:
+    """The project's artifact manifest, or None for projects generated without one"""
+    manifest = load_manifest(project["artifacts_path"])
+    return manifest if manifest.exists else None
+
+def serve_file(path: str, request: Request, not_found: str):
+    try:
+        return file_response(path, request)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=not_found)
+
+async def run_crew_in_thread(project_id: str, requirements: str, project_name: Optional[str], timeout: int,
+                             budget: Optional[Dict[str, Any]] = None, resume: bool = False) -> Dict[str, Any]:
+    """Run the crew in a thread of the API process (shares cwd and env with other projects)"""
+    loop = asyncio.get_running_loop()
+    crew = None
+    
+    def send_event(event: Dict[str, Any]):
+        asyncio.run_coroutine_threadsafe(handle_crew_event(project_id, event), loop)
+    
+    def kickoff():
+        nonlocal crew
+        # Imported on first use: crewAI takes seconds to import and process mode never needs it here.
+        # Importing and constructing the crew both block, so they run off the event loop too.
+        from ..crew import DevCrew
+        crew = DevCrew(requirements=requirements, project_name=project_name, event_sink=send_event,
+                       budget=budget, resume=resume)
+        return crew.crew().kickoff()
+    
+    try:
+        result = await asyncio.wait_for(asyncio.to_thread(kickoff), timeout=timeout)
+    except BudgetExceeded as e:
+        return {"status": "budget_exceeded", "error": f"Budget exceeded: {e}", "usage": crew.usage.snapshot()}
+    return {
+        "status": "completed",
+        "artifacts_path": os.path.join(crew.workspace_dir, crew.project_dir),
+        "result": str(result),
+        "usage": crew.usage.snapshot()
+    }
+
+async def run_crew_task(project_id: str, requirements: str, project_name: Optional[str] = None, timeout: int = 3600,
+                        budget: Optional[Dict[str, Any]] = None, resume: bool = False):
+    # Store task reference for potential cancellation
+    running_tasks[project_id] = asyncio.current_task()
+    
     try:
         await update_project_status(project_id, {
-            "status": "running",
+            "status": "queued",
+            "error": None,
             "tasks_completed": []
         })
         
-        # Initialize the crew
-        crew = DevCrew(requirements=requirements, project_name=project_name)
-        
-        # Store task reference for potential cancellation
-        running_tasks[project_id] = asyncio.current_task()
+        async def mark_running():
+            await update_project_status(project_id, {"status": "running"})
         
         try:
             # Run with timeout
-            result = await asyncio.wait_for(
-                asyncio.to_thread(crew.crew().kickoff),
-                timeout=timeout
-            )
+            if EXECUTION_MODE == "thread":
+                await mark_running()
+                outcome = await run_crew_in_thread(project_id, requirements, project_name, timeout, budget, resume)
+            else:
+                outcome = await worker_pool.run(
+                    project_id, requirements, project_name, timeout=timeout, on_start=mark_running,
+                    on_event=lambda event: handle_crew_event(project_id, event), budget=budget, resume=resume
+                )
             
             # Update project status with results
-            await update_project_status(project_id, {
-                "status": "completed",
-                "artifacts_path": crew.project_dir,
-                "result": result,
-                "progress": 100
-            })
+            if outcome["status"] == "completed":
+                outcome.update({"progress": 100, "current_task": None})
+            else:
+                logger.error(f"Error in project {project_id}: {outcome.get('error')}")
+            await update_project_status(project_id, outcome)
             
         except asyncio.TimeoutError:
             await update_project_status(project_id, {
@@ -91,6 +219,8 @@ async def run_crew_task(project_id: str, requirements: str, project_name: Option
             })
             logger.error(f"Project {project_id} timed out")
             
+    except asyncio.CancelledError:
+        logger.info(f"Project {project_id} cancelled")
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error in project {project_id}: {error_msg}", exc_info=True)
@@ -110,117 +240,175 @@ async def create_project(
     project_id = str(uuid.uuid4())
     timestamp = datetime.now().isoformat()
     
-    # Initialize project status
-    projects[project_id] = {
+    # Default project names include the id so concurrent projects never share a directory
+    run_request = {
+        "requirements": project_request.requirements,
+        "project_name": project_request.project_name or f"project_{project_id[:8]}",
+        "timeout": project_request.timeout,
+        "budget": project_request.budget.model_dump() if project_request.budget else None
+    }
+    
+    # Initialize project status; the run parameters are kept so the project can be resumed
+    project = {
         "status": "initialized",
         "created_at": timestamp,
         "updated_at": timestamp,
         "progress": 0,
-        "tasks_completed": []
+        "tasks_completed": [],
+        "request": run_request
     }
+    await asyncio.to_thread(get_store().create, project_id, project)
     
     # Start the crew in the background
-    background_tasks.add_task(
-        run_crew_task,
-        project_id,
-        project_request.requirements,
-        project_request.project_name,
-        project_request.timeout
-    )
+    background_tasks.add_task(run_crew_task, project_id, **run_request)
     
     return {
         "project_id": project_id,
-        **projects[project_id]
+        **project
     }
 
+@app.post("/projects/{project_id}/resume", response_model=ProjectStatus)
+async def resume_project(
+    project_id: str,
+    background_tasks: BackgroundTasks,
+    resume_request: Optional[ResumeRequest] = None
+):
+    """Continue a failed, timed out, cancelled or interrupted project after its last completed task.
+    
+    Tasks with a checkpoint are not run again; a project left "running" by an
+    API process that died can be resumed too.
+    """
+    project = await get_project_or_404(project_id)
+    if project_id in running_tasks:
+        raise HTTPException(status_code=409, detail="Project is already running")
+    if project["status"] == "completed":
+        raise HTTPException(status_code=409, detail="Project already completed")
+    run_request = dict(project.get("request") or {})
+    if not run_request.get("requirements"):
+        raise HTTPException(status_code=400, detail="Project was created without resumable run parameters")
+    
+    if resume_request and resume_request.timeout:
+        run_request["timeout"] = resume_request.timeout
+    if resume_request and resume_request.budget:
+        run_request["budget"] = resume_request.budget.model_dump()
+    await update_project_status(project_id, {"status": "initialized", "error": None, "request": run_request})
+    background_tasks.add_task(run_crew_task, project_id, resume=True, **run_request)
+    
+    return {"project_id": project_id, **await asyncio.to_thread(get_store().get, project_id)}
+
 @app.post("/projects/{project_id}/cancel")
 async def cancel_project(project_id: str):
-    if project_id not in projects:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await get_project_or_404(project_id)
     
     if project_id in running_tasks:
+        if EXECUTION_MODE == "thread":
+            raise HTTPException(status_code=409, detail="Projects cannot be cancelled in thread execution mode")
         task = running_tasks[project_id]
         task.cancel()
+        # Kill the worker process tree; cancelling the task alone leaves it running
+        await worker_pool.terminate(project_id)
         await update_project_status(project_id, {
             "status": "cancelled",
             "error": "Project cancelled by user"
         })
         return {"status": "cancelled"}
     
-    return {"status": projects[project_id]["status"]}
+    return {"status": project["status"]}
 
 @app.get("/projects/{project_id}", response_model=ProjectStatus)
 async def get_project_status(project_id: str):
-    if project_id not in projects:
-        raise HTTPException(status_code=404, detail="Project not found")
+    return await get_project_or_404(project_id)
+
+@app.get("/projects/{project_id}/events")
+async def stream_project_events(project_id: str, request: Request, last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events stream of task, tool and status events until the project ends.
     
-    return {
-        "project_id": project_id,
-        **projects[project_id]
-    }
+    Reconnecting clients send Last-Event-ID to resume from the buffered events.
+    """
+    project = await get_project_or_404(project_id)
+    try:
+        after_id = int(last_event_id or 0)
+    except ValueError:
+        after_id = 0
+    
+    async def stream():
+        if project["status"] in TERMINAL_STATUSES and not event_bus.events_after(project_id, after_id):
+            yield format_sse(None, "status", {"status": project["status"], "error": project.get("error")})
+            return
+        async for event in event_bus.subscribe(project_id, after_id):
+            if await request.is_disconnected():
+                return
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(*event)
+            event_id, event_type, data = event
+            if event_type == "status" and data.get("status") in TERMINAL_STATUSES:
+                return
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/projects/{project_id}/artifacts/{artifact_path:path}")
-async def get_project_artifact(project_id: str, artifact_path: str):
-    if project_id not in projects:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    project = projects[project_id]
+async def get_project_artifact(project_id: str, artifact_path: str, request: Request):
+    project = await get_project_or_404(project_id)
     if project["status"] != "completed":
         raise HTTPException(status_code=400, detail="Project artifacts not ready")
     
-    # Try project artifacts first
-    full_path = os.path.join(project["artifacts_path"], artifact_path)
-    if not os.path.exists(full_path):
-        # Try docs directory
-        docs_path = os.path.join('docs', project_id, artifact_path)
-        if os.path.exists(docs_path):
-            full_path = docs_path
-        else:
-            raise HTTPException(status_code=404, detail="Artifact not found")
-    
-    try:
-        with open(full_path, 'r') as f:
-            content = f.read()
-        return {"content": content}
-    except Exception as e:
-        logger.error(f"Error reading artifact {full_path}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error reading artifact")
+    # Indexed files are an O(1) manifest lookup; fall back to the filesystem for
+    # files the manifest doesn't track (dependencies, projects from older versions)
+    full_path = None
+    manifest = project_manifest(project)
+    entry = manifest.get(artifact_path) if manifest else None
+    if entry:
+        full_path = manifest.absolute_path(entry)
+    else:
+        full_path = (
+            resolve_within(project["artifacts_path"], artifact_path)
+            or resolve_within(os.path.join('docs', project_id), artifact_path)
+        )
+    if full_path is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return serve_file(full_path, request, "Artifact not found")
 
 @app.get("/projects/{project_id}/docs/{doc_path:path}")
-async def get_project_docs(project_id: str, doc_path: str):
-    if project_id not in projects:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    project = projects[project_id]
+async def get_project_docs(project_id: str, doc_path: str, request: Request):
+    project = await get_project_or_404(project_id)
     if project["status"] != "completed":
         raise HTTPException(status_code=400, detail="Project documentation not ready")
     
-    docs_path = os.path.join(project["artifacts_path"], 'docs', doc_path)
-    if not os.path.exists(docs_path):
+    # Like artifacts, docs the manifest doesn't track (written by shell commands) are served from disk
+    manifest = project_manifest(project)
+    entry = manifest.get(f"docs/{doc_path}") if manifest else None
+    if entry:
+        docs_path = manifest.absolute_path(entry)
+    else:
+        docs_path = resolve_within(os.path.join(project["artifacts_path"], 'docs'), doc_path)
+    if docs_path is None:
         raise HTTPException(status_code=404, detail="Documentation not found")
-    
-    try:
-        with open(docs_path, 'r') as f:
-            content = f.read()
-        return {"content": content}
-    except Exception as e:
-        logger.error(f"Error reading documentation {docs_path}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error reading documentation")
+    return serve_file(docs_path, request, "Documentation not found")
 
 @app.get("/projects/{project_id}/docs")
 async def list_project_docs(project_id: str):
-    if project_id not in projects:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    project = projects[project_id]
+    project = await get_project_or_404(project_id)
     if project["status"] != "completed":
         raise HTTPException(status_code=400, detail="Project documentation not ready")
     
+    manifest = project_manifest(project)
+    if manifest:
+        return {"docs": [
+            {"path": entry["path"][len("docs/"):], "type": entry["doc_type"]}
+            for entry in manifest.docs()
+        ]}
+    
     docs_dir = os.path.join(project["artifacts_path"], 'docs')
     if not os.path.exists(docs_dir):
         return {"docs": []}
     
-    try:
+    def walk_docs():
         docs = []
         for root, _, files in os.walk(docs_dir):
             for file in files:
@@ -230,25 +418,90 @@ async def list_project_docs(project_id: str):
                         "path": rel_path,
                         "type": os.path.basename(os.path.dirname(os.path.join(root, file)))
                     })
-        return {"docs": docs}
+        return docs
+    
+    try:
+        # Walk off the event loop; large doc trees would stall other requests
+        return {"docs": await asyncio.to_thread(walk_docs)}
     except Exception as e:
         logger.error(f"Error listing documentation for project {project_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error listing documentation")
 
+def project_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "status": data["status"],
+        "created_at": data["created_at"],
+        "updated_at": data["updated_at"],
+        "progress": data.get("progress", 0),
+        "current_task": data.get("current_task"),
+        "error": data.get("error")
+    }
+
 @app.get("/projects/")
-async def list_projects():
+async def list_projects(status: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None):
+    """List projects newest first, one page at a time; pass next_cursor back to continue"""
+    limit = max(1, min(limit, 500))
+    try:
+        page, next_cursor = await asyncio.to_thread(get_store().list, status=status, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {
-        project_id: {
-            "status": data["status"],
-            "created_at": data["created_at"],
-            "updated_at": data["updated_at"],
-            "progress": data.get("progress", 0),
-            "current_task": data.get("current_task"),
-            "error": data.get("error")
-        }
-        for project_id, data in projects.items()
+        "projects": {
+            data["project_id"]: project_summary(data)
+            for data in page
+        },
+        "next_cursor": next_cursor
     }
 
+@app.post("/projects/batch-status")
+async def batch_project_status(batch_request: BatchStatusRequest):
+    """Look up the status of many projects in one call; unknown ids are omitted"""
+    if len(batch_request.project_ids) > 1000:
+        raise HTTPException(status_code=400, detail="At most 1000 project ids per request")
+    records = await asyncio.to_thread(get_store().get_many, batch_request.project_ids)
+    return {
+        project_id: project_summary(data)
+        for project_id, data in records.items()
+    }
+
+# Shared on-disk caches reported on /metrics, opened on first scrape
+METRIC_CACHES = {
+    "llm": ("llm", "responses.sqlite"),
+    "search": ("search", "results.sqlite"),
+    "shell": ("shell", "memo.sqlite")
+}
+metric_caches: Dict[str, DiskCache] = {}
+
+def collect_runtime_metrics():
+    """Refresh gauges that are read on scrape rather than tracked continuously"""
+    if EXECUTION_MODE == "thread":
+        active = len(running_tasks)
+    else:
+        active = worker_pool.active
+    metrics.ACTIVE_CREWS.set(active)
+    metrics.QUEUE_DEPTH.set(max(len(running_tasks) - active, 0))
+    
+    for name, (cache_dir, filename) in METRIC_CACHES.items():
+        if name not in metric_caches:
+            path = os.path.join(get_cache_dir(cache_dir), filename)
+            if not os.path.exists(path):
+                continue
+            metric_caches[name] = DiskCache(path)
+        try:
+            stats = metric_caches[name].stats()
+        except Exception as e:
+            logger.warning(f"Could not read {name} cache stats: {e}")
+            continue
+        metrics.CACHE_HIT_RATIO.set(stats["hit_ratio"], cache=name)
+        metrics.CACHE_ENTRIES.set(stats["entries"], cache=name)
+
+metrics.REGISTRY.add_collector(collect_runtime_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus scrape endpoint (runs in the threadpool; cache stats hit SQLite)"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
@@ -0,0 +1,200 @@
+from typing import Any, Dict, List, Optional, Tuple
+from abc import ABC, abstractmethod
+import base64
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+def encode_cursor(created_at: str, project_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{project_id}".encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, project_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|', 1)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return created_at, project_id
+
+class ProjectStore(ABC):
+    """Storage for API project records, listed newest first"""
+
+    @abstractmethod
+    def create(self, project_id: str, record: Dict[str, Any]) -> None:
+        """Store a new record under project_id"""
+
+    @abstractmethod
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the record, or None if it does not exist"""
+
+    @abstractmethod
+    def get_many(self, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several records at once; unknown ids are omitted"""
+
+    @abstractmethod
+    def update(self, project_id: str, updates: Dict[str, Any]) -> bool:
+        """Atomically merge updates into a record and stamp updated_at"""
+
+    @abstractmethod
+    def list(self, status: Optional[str] = None, limit: int = 50,
+             cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one page of records and the cursor for the next page"""
+
+    def __contains__(self, project_id: str) -> bool:
+        return self.get(project_id) is not None
+
+class MemoryProjectStore(ProjectStore):
+    """Process-local store; state is lost on restart"""
+
+    def __init__(self):
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, project_id: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._projects[project_id] = {'project_id': project_id, **record}
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        record = self._projects.get(project_id)
+        return dict(record) if record else None
+
+    def get_many(self, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {pid: dict(self._projects[pid]) for pid in project_ids if pid in self._projects}
+
+    def update(self, project_id: str, updates: Dict[str, Any]) -> bool:
+        with self._lock:
+            if project_id not in self._projects:
+                return False
+            self._projects[project_id].update({**updates, 'updated_at': datetime.now().isoformat()})
+            return True
+
+    def list(self, status: Optional[str] = None, limit: int = 50,
+             cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        records = sorted(
+            (r for r in self._projects.values() if status is None or r['status'] == status),
+            key=lambda r: (r['created_at'], r['project_id']),
+            reverse=True
+        )
+        if cursor:
+            after = decode_cursor(cursor)
+            records = [r for r in records if (r['created_at'], r['project_id']) < after]
+        page = [dict(r) for r in records[:limit]]
+        next_cursor = None
+        if len(records) > limit:
+            next_cursor = encode_cursor(page[-1]['created_at'], page[-1]['project_id'])
+        return page, next_cursor
+
+class SQLiteProjectStore(ProjectStore):
+    """Durable store shared by all API workers on a host (SQLite in WAL mode).
+
+    status, created_at and updated_at are real columns so listing and
+    filtering are index scans; the rest of the record is a JSON document.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS projects ("
+            " project_id TEXT PRIMARY KEY, status TEXT NOT NULL,"
+            " created_at TEXT NOT NULL, updated_at TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS projects_created ON projects (created_at, project_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS projects_status_created ON projects (status, created_at, project_id)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _record(row) -> Dict[str, Any]:
+        project_id, status, created_at, updated_at, data = row
+        return {
+            **json.loads(data),
+            'project_id': project_id,
+            'status': status,
+            'created_at': created_at,
+            'updated_at': updated_at
+        }
+
+    def create(self, project_id: str, record: Dict[str, Any]) -> None:
+        self._conn().execute(
+            "INSERT INTO projects (project_id, status, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+            (project_id, record['status'], record['created_at'], record['updated_at'], json.dumps(record))
+        )
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT project_id, status, created_at, updated_at, data FROM projects WHERE project_id = ?",
+            (project_id,)
+        ).fetchone()
+        return self._record(row) if row else None
+
+    def get_many(self, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        records = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(project_ids), 500):
+            chunk = project_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn().execute(
+                "SELECT project_id, status, created_at, updated_at, data FROM projects "
+                f"WHERE project_id IN ({placeholders})",
+                chunk
+            ).fetchall()
+            records.update((row[0], self._record(row)) for row in rows)
+        return records
+
+    def update(self, project_id: str, updates: Dict[str, Any]) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM projects WHERE project_id = ?", (project_id,)).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return False
+            record = {**json.loads(row[0]), **updates, 'updated_at': datetime.now().isoformat()}
+            conn.execute(
+                "UPDATE projects SET status = ?, updated_at = ?, data = ? WHERE project_id = ?",
+                (record['status'], record['updated_at'], json.dumps(record), project_id)
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def list(self, status: Optional[str] = None, limit: int = 50,
+             cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if cursor:
+            clauses.append("(created_at, project_id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            "SELECT project_id, status, created_at, updated_at, data FROM projects "
+            f"{where} ORDER BY created_at DESC, project_id DESC LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+        page = [self._record(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1]['created_at'], page[-1]['project_id'])
+        return page, next_cursor
+
+def create_project_store(workspace_dir: str) -> ProjectStore:
+    """Create the store selected by DEVCREW_PROJECT_STORE ("sqlite" or "memory")"""
+    if os.getenv('DEVCREW_PROJECT_STORE', 'sqlite') == 'memory':
+        return MemoryProjectStore()
+    path = os.getenv('DEVCREW_PROJECT_DB') or os.path.join(workspace_dir, '.devcrew', 'projects.sqlite')
+    return SQLiteProjectStore(path)
@@ -0,0 +1,216 @@
+from typing import Any, Dict, Optional
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+from ..utils import child_processes
+from ..utils.usage import BudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE_PERIOD = 10
+
+def get_workspace_dir() -> str:
+    """Workspace used for all projects, matching DevCrew's default"""
+    workspace = os.getenv('DEVCREW_WORKSPACE')
+    if workspace:
+        return os.path.abspath(workspace)
+    return os.path.abspath(os.path.join(os.getcwd(), 'workspace'))
+
+class CrewWorkerPool:
+    """Run crews in isolated subprocesses with a concurrency cap.
+
+    Each worker gets a JSON spec file, runs one crew with its own cwd and env,
+    and writes a JSON result file next to the spec. Workers start in their own
+    session, so cancelling or timing out a project kills the whole process
+    tree: the worker's group gets SIGTERM, and the worker's handler kills the
+    separate process groups of the shell commands it started (npm, node, dev
+    servers) before exiting.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, workspace_dir: Optional[str] = None):
+        self.max_workers = max_workers or int(os.getenv('DEVCREW_MAX_WORKERS', str(os.cpu_count() or 2)))
+        self.workspace_dir = workspace_dir or get_workspace_dir()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
+
+    @property
+    def active(self) -> int:
+        return len(self.processes)
+
+    def run_dir(self, project_id: str) -> str:
+        return os.path.join(self.workspace_dir, '.devcrew', 'runs', project_id)
+
+    async def run(self, project_id: str, requirements: str, project_name: Optional[str] = None,
+                  timeout: Optional[int] = None, on_start=None, on_event=None,
+                  budget: Optional[Dict[str, Any]] = None, resume: bool = False,
+                  incremental: Optional[bool] = None) -> Dict[str, Any]:
+        """Run a crew to completion and return its result record.
+
+        Raises asyncio.TimeoutError after killing the worker if it runs longer
+        than timeout seconds. on_start is awaited once a worker slot is acquired,
+        and on_event is awaited with each progress event the crew reports.
+        """
+        run_dir = self.run_dir(project_id)
+        os.makedirs(run_dir, exist_ok=True)
+        spec_path = os.path.join(run_dir, 'spec.json')
+        result_path = os.path.join(run_dir, 'result.json')
+        if os.path.exists(result_path):
+            os.remove(result_path)
+        with open(spec_path, 'w') as f:
+            json.dump({
+                'project_id': project_id,
+                'requirements': requirements,
+                'project_name': project_name,
+                'budget': budget,
+                'resume': resume,
+                'incremental': incremental,
+                'workspace_dir': self.workspace_dir,
+                'result_path': result_path
+            }, f)
+
+        env = {**os.environ, 'DEVCREW_WORKSPACE': self.workspace_dir}
+
+        async with self._slots:
+            if on_start:
+                await on_start()
+            # The worker's stdout carries progress events; everything else goes to the log
+            with open(os.path.join(run_dir, 'worker.log'), 'ab') as log:
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, '-m', 'dev_crew.api.worker', spec_path,
+                    cwd=self.workspace_dir,
+                    env=env,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=log,
+                    start_new_session=True
+                )
+            self.processes[project_id] = process
+            reader = asyncio.create_task(self._read_events(process.stdout, on_event))
+            try:
+                await asyncio.wait_for(process.wait(), timeout=timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                await self.terminate(project_id)
+                raise
+            finally:
+                self.processes.pop(project_id, None)
+                # The pipe closes when the process exits; don't wait on orphaned children holding it
+                try:
+                    await asyncio.wait_for(asyncio.shield(reader), timeout=5)
+                except asyncio.TimeoutError:
+                    reader.cancel()
+
+        if os.path.exists(result_path):
+            with open(result_path, 'r') as f:
+                return json.load(f)
+        return {
+            'status': 'failed',
+            'error': f"Worker exited with code {process.returncode} without a result"
+        }
+
+    @staticmethod
+    async def _read_events(stream: asyncio.StreamReader, on_event) -> None:
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if on_event:
+                try:
+                    await on_event(event)
+                except Exception as e:
+                    logger.error(f"Error handling worker event: {e}", exc_info=True)
+
+    async def terminate(self, project_id: str) -> bool:
+        """Kill a project's worker process group; returns False if it isn't running"""
+        process = self.processes.get(project_id)
+        if process is None or process.returncode is not None:
+            return False
+
+        for sig, grace in ((signal.SIGTERM, TERMINATE_GRACE_PERIOD), (signal.SIGKILL, None)):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                return True
+            try:
+                await asyncio.wait_for(process.wait(), timeout=grace)
+                return True
+            except asyncio.TimeoutError:
+                logger.warning(f"Worker for project {project_id} ignored {sig.name}")
+        return True
+
+def install_termination_handler() -> None:
+    """On SIGTERM, kill the process groups of running shell commands, then exit"""
+    def terminate(signum, frame):
+        killed = child_processes.kill_all()
+        logger.warning(f"Worker terminated; killed {killed} running command(s)")
+        os._exit(128 + signum)
+
+    signal.signal(signal.SIGTERM, terminate)
+
+def main(spec_path: str) -> int:
+    """Worker entry point: run one crew described by a spec file"""
+    with open(spec_path, 'r') as f:
+        spec = json.load(f)
+    install_termination_handler()
+
+    # Keep the original stdout as the event channel and send all other output to stderr
+    sys.stdout.flush()
+    events = os.fdopen(os.dup(1), 'w', buffering=1)
+    os.dup2(2, 1)
+    events_lock = threading.Lock()
+
+    def send_event(event: Dict[str, Any]) -> None:
+        with events_lock:
+            events.write(json.dumps(event, default=str) + '\n')
+
+    # Imported here so the API can use CrewWorkerPool without loading crewAI
+    from ..crew import DevCrew
+    from ..utils import metrics
+    
+    # Metrics are served by the API process, so observations travel with the progress events
+    metrics.set_forwarder(send_event)
+
+    outcome: Dict[str, Any]
+    crew = None
+    try:
+        crew = DevCrew(
+            requirements=spec['requirements'],
+            project_name=spec.get('project_name'),
+            workspace_dir=spec['workspace_dir'],
+            event_sink=send_event,
+            budget=spec.get('budget'),
+            resume=spec.get('resume', False),
+            incremental=spec.get('incremental')
+        )
+        result = crew.crew().kickoff()
+        outcome = {
+            'status': 'completed',
+            'artifacts_path': os.path.join(crew.workspace_dir, crew.project_dir),
+            'result': str(result)
+        }
+    except BudgetExceeded as e:
+        logger.warning(f"Project {spec['project_id']} stopped: budget exceeded ({e})")
+        outcome = {'status': 'budget_exceeded', 'error': f"Budget exceeded: {e}"}
+    except Exception as e:
+        logger.error(f"Error in project {spec['project_id']}: {e}", exc_info=True)
+        outcome = {'status': 'failed', 'error': str(e)}
+    if crew is not None:
+        outcome['usage'] = crew.usage.snapshot()
+
+    tmp_path = f"{spec['result_path']}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(outcome, f)
+    os.replace(tmp_path, spec['result_path'])
+    return 0 if outcome['status'] == 'completed' else 1
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1]))
@@ -1,37 +1,96 @@
 # src/dev_crew/crew.py
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task, before_kickoff, after_kickoff
-from crewai_tools import (
-    SerperDevTool,
-    FileReadTool,
-    FileWriterTool
-)
 from crewai import Agent, LLM
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
 from datetime import datetime
 from .tools.shell_tool import ShellTool
 from .tools.framework_tool import FrameworkTool
-
-# Load environment variables
-load_dotenv()
-
-# Initialize LLM
-llm = LLM(api_key=os.getenv('OPENAI_API_KEY'), model='gpt-4o-mini')
-
-# Initialize tools - using them directly as they are already BaseTool instances
-serper_tool = SerperDevTool()
-file_read_tool = FileReadTool()
-file_writer_tool = FileWriterTool()
-shell_tool = ShellTool()
+from .tools.file_tools import BatchFileWriteTool, FileReadTool, FileWriteTool
+from .tools.context_tool import CompactContextTool
+from .tools.code_index_tool import ProjectIndexTool
+from .utils.task_scheduler import DependencyGate, TaskScheduler
+from .utils.llm_cache import create_llm
+from .utils.progress import ProgressReporter, TrackedTask
+from .utils.manifest import ArtifactManifest
+from .utils.usage import UsageLedger, bind_llm
+from .utils.incremental import BuildState
+from .utils.checkpoints import CheckpointStore
+from .utils.project_validator import ProjectValidator
+from .utils.context_compactor import ContextCompactor
+
+# The LLM and tools are shared by all crews in a process but created on first use,
+# so importing this module (API workers, CLI entry points) stays cheap
+
+@lru_cache(maxsize=None)
+def get_llm() -> LLM:
+    """Shared LLM (served from the on-disk response cache when DEVCREW_LLM_CACHE is set)"""
+    load_dotenv()
+    # OPENAI_API_BASE points the LLM at an OpenAI-compatible endpoint (e.g. the offline benchmark stub)
+    return create_llm(api_key=os.getenv('OPENAI_API_KEY'), model='gpt-4o-mini', base_url=os.getenv('OPENAI_API_BASE') or None)
+
+@lru_cache(maxsize=None)
+def get_serper_tool():
+    # crewai_tools takes seconds to import, so it is only loaded when a crew is built
+    from .tools.search_tool import CachedSerperDevTool
+    base_url = os.getenv('SERPER_BASE_URL')
+    return CachedSerperDevTool(base_url=base_url) if base_url else CachedSerperDevTool()
+
+@lru_cache(maxsize=None)
+def get_file_read_tool() -> FileReadTool:
+    return FileReadTool()
+
+@lru_cache(maxsize=None)
+def get_file_writer_tool() -> FileWriteTool:
+    return FileWriteTool()
+
+@lru_cache(maxsize=None)
+def get_batch_file_writer_tool() -> BatchFileWriteTool:
+    return BatchFileWriteTool()
+
+@lru_cache(maxsize=None)
+def get_compact_context_tool() -> CompactContextTool:
+    return CompactContextTool()
+
+@lru_cache(maxsize=None)
+def get_project_index_tool() -> ProjectIndexTool:
+    return ProjectIndexTool()
+
+@lru_cache(maxsize=None)
+def get_shell_tool() -> ShellTool:
+    return ShellTool()
+
+_LAZY_GLOBALS = {
+    'llm': get_llm,
+    'serper_tool': get_serper_tool,
+    'file_read_tool': get_file_read_tool,
+    'file_writer_tool': get_file_writer_tool,
+    'shell_tool': get_shell_tool
+}
+
+def __getattr__(name: str):
+    """Keep the old module-level llm and tool names working, created on first access"""
+    if name in _LAZY_GLOBALS:
+        return _LAZY_GLOBALS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @CrewBase
 class DevCrew():
     """Software Development Lifecycle Crew"""
     
-    def __init__(self, requirements: str, project_name: str = None, workspace_dir: str = None):
+    def __init__(self, requirements: str, project_name: str = None, workspace_dir: str = None,
+                 max_parallel_tasks: int = None, event_sink=None, budget: dict = None,
+                 incremental: bool = None, resume: bool = False):
         """Initialize the crew with requirements and optional project name"""
+        load_dotenv()
         self.requirements = requirements
+        # Progress events (task start/finish, tool use, usage) are sent to event_sink if given
+        self.progress = ProgressReporter(event_sink)
+        # Token/cost accounting; budget is {"max_tokens", "max_cost_usd", "on_exceeded": "abort" | "degrade"}
+        self.usage = UsageLedger.from_budget(budget, sink=self.progress.emit)
+        self.max_parallel_tasks = max_parallel_tasks or int(os.getenv('DEVCREW_MAX_PARALLEL_TASKS', '2'))
         self.project_name = project_name or f"project_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         # Set up workspace directory (always absolute)
@@ -59,6 +118,26 @@ class DevCrew():
         os.makedirs(os.path.join(self.workspace_dir, self.docs_dir), exist_ok=True)
         os.makedirs(os.path.join(self.workspace_dir, self.src_dir), exist_ok=True)
         
+        # Index of generated files, updated as tools and tasks write them
+        self.manifest = ArtifactManifest.for_project(os.path.join(self.workspace_dir, self.project_dir))
+        
+        # Incremental mode reuses results of tasks whose prompt and inputs are unchanged since the last run
+        if incremental is None:
+            incremental = os.getenv('DEVCREW_INCREMENTAL', '').lower() in ('1', 'true', 'yes')
+        self.build_state = BuildState(
+            os.path.join(self.workspace_dir, self.project_dir), self.workspace_dir
+        ) if incremental else None
+        
+        # Completed-task checkpoints; resume=True continues after the last task that finished
+        self.checkpoints = CheckpointStore(os.path.join(self.workspace_dir, self.project_dir))
+        self.resume = resume
+        if not resume:
+            self.checkpoints.clear()
+        
+        # Validation tasks run rule checks first and only call the LLM when a check fails or is inconclusive
+        self.rule_validation = os.getenv('DEVCREW_RULE_VALIDATION', 'true').lower() in ('1', 'true', 'yes')
+        self.validator = ProjectValidator(os.path.join(self.workspace_dir, self.project_dir))
+        
         # Change to workspace directory
         os.chdir(self.workspace_dir)
         
@@ -82,6 +161,20 @@ class DevCrew():
         """Convert an absolute path to workspace-relative path"""
         return os.path.relpath(absolute_path, self.workspace_dir)
 
+    @staticmethod
+    def context_instructions(documents: list, focus: str) -> str:
+        """Prompt text for a task whose upstream documents are compacted into its context"""
+        return f"""The sections of {documents} relevant to "{focus}" are already in your context,
+compacted to a token budget. Do not read these documents whole: when you need a section that
+is summarized or listed as not included, read just its line range (path:Lstart-Lend) with
+Read File start_line/end_line, or call Compact Context with a narrower focus."""
+
+    def compacted_context(self, documents: list, focus: str):
+        """prepare_context callback compacting upstream documents when the task starts, once they exist"""
+        def prepare(task: Task) -> str:
+            return ContextCompactor().compact(documents, focus, base_dir=self.workspace_dir)
+        return prepare
+
     @agent
     def project_manager(self) -> Agent:
         """Project manager agent focused on planning and coordination"""
@@ -90,8 +183,9 @@ class DevCrew():
             goal="Ensure project success through effective planning and coordination",
             backstory="Experienced technical project manager with strong background in Agile methodologies",
             verbose=True,
+            llm=get_llm(),
             allow_delegation=True,
-            tools=[serper_tool, file_read_tool]
+            tools=[get_serper_tool(), get_file_read_tool()]
         )
 
     @agent
@@ -102,8 +196,9 @@ class DevCrew():
             goal="Design scalable and maintainable system architecture with emphasis on simplicity",
             backstory="Senior architect with expertise in modern web architectures and best practices",
             verbose=True,
+            llm=get_llm(),
             allow_delegation=True,
-            tools=[serper_tool, file_read_tool]
+            tools=[get_serper_tool(), get_file_read_tool(), get_compact_context_tool(), get_project_index_tool()]
         )
 
     @agent
@@ -114,13 +209,17 @@ class DevCrew():
             goal="Implement high-quality, production-ready code following best practices",
             backstory="Experienced full stack developer with expertise in modern web development",
             verbose=True,
+            llm=get_llm(),
             allow_delegation=True,
             allow_code_execution=True,
             tools=[
-                serper_tool,
-                file_read_tool,
-                file_writer_tool,
-                shell_tool,
+                get_serper_tool(),
+                get_file_read_tool(),
+                get_file_writer_tool(),
+                get_batch_file_writer_tool(),
+                get_compact_context_tool(),
+                get_project_index_tool(),
+                get_shell_tool(),
                 FrameworkTool()
             ]
         )
@@ -133,9 +232,11 @@ class DevCrew():
             goal="Ensure code quality through comprehensive testing",
             backstory="Expert in testing methodologies with strong experience in Jest and Testing Library",
             verbose=True,
+            llm=get_llm(),
             allow_delegation=True,
             allow_code_execution=True,
-            tools=[file_read_tool, file_writer_tool]
+            tools=[get_file_read_tool(), get_file_writer_tool(), get_batch_file_writer_tool(),
+                   get_compact_context_tool(), get_project_index_tool()]
         )
 
     @agent
@@ -146,15 +247,16 @@ class DevCrew():
             goal="Create clear and comprehensive documentation",
             backstory="Experienced technical writer with strong background in software documentation",
             verbose=True,
+            llm=get_llm(),
             allow_delegation=False,
-            tools=[file_read_tool, file_writer_tool, serper_tool]
+            tools=[get_file_read_tool(), get_file_writer_tool(), get_serper_tool(), get_compact_context_tool()]
         )
 
     @task
     def analyze_requirements(self) -> Task:
         output_file = 'project_plan.md'
         output_path = os.path.join(self.get_docs_dir('requirements'), output_file)
-        return Task(
+        return TrackedTask(
             description=f"Analyze the following requirements and create a project plan: {self.requirements}",
             expected_output="A detailed project plan with task breakdown and estimates",
             agent=self.project_manager(),
@@ -172,7 +274,7 @@ class DevCrew():
         output_file = 'architecture.md'
         input_file = os.path.join(self.project_name, 'docs/requirements/project_plan.md')
         output_path = os.path.join(self.get_docs_dir('architecture'), output_file)
-        return Task(
+        return TrackedTask(
             description=f"""First, read and analyze the project plan from: {input_file}
 
 Then, based on the project plan requirements, create a comprehensive system architecture that includes:
@@ -241,7 +343,7 @@ Save the architecture document to: {os.path.join(self.project_name, 'docs/archit
         output_file = 'technical_design.md'
         input_file = os.path.join(self.project_name, 'docs/architecture/architecture.md')
         output_path = os.path.join(self.get_docs_dir('technical_design'), output_file)
-        return Task(
+        return TrackedTask(
             description=f"""First, read and analyze the architecture document from: {input_file}
 
 Then, create a detailed technical design that specifies:
@@ -288,7 +390,7 @@ Save the technical design document to: {os.path.join(self.project_name, 'docs/te
         best_practices_file = os.path.join(self.project_name, 'best_practices.yaml')
         project_dir = os.path.join(self.workspace_dir, self.project_name)
         
-        return Task(
+        return TrackedTask(
             description=f"""Set up the base framework environment:
 
 1. Initialize Framework
@@ -337,7 +439,9 @@ Save the technical design document to: {os.path.join(self.project_name, 'docs/te
         output_path = os.path.join(self.get_docs_dir('implementation'), output_file)
         project_dir = os.path.join(self.workspace_dir, self.project_name)
         
-        return Task(
+        documents = [project_plan, tech_design, architecture]
+        focus = "features, components, API and data model to implement"
+        return TrackedTask(
             description=f"""Implement the project requirements based on the provided documentation:
 
 1. Review Requirements and Design
@@ -345,6 +449,8 @@ Save the technical design document to: {os.path.join(self.project_name, 'docs/te
    - Technical Design: {tech_design}
    - Architecture: {architecture}
 
+{self.context_instructions(documents, focus)}
+
 2. Implementation Steps
    a. For each feature in the project plan:
       - Review the technical design for implementation details
@@ -383,6 +489,8 @@ Save the technical design document to: {os.path.join(self.project_name, 'docs/te
    - Include usage examples
    - Document any deviations from design
 
+Use the Write Files tool to create related files (a component, its styles and tests) in a single call.
+
 Save the implementation summary to: {output_path}
 
 The implementation should match exactly what was specified in the project plan and follow the patterns in the technical design.""",
@@ -406,7 +514,8 @@ The implementation should match exactly what was specified in the project plan a
                 "lib_dir": os.path.join(project_dir, 'src/lib'),
                 "styles_dir": os.path.join(project_dir, 'src/styles')
             }],
-            output_file=output_path
+            output_file=output_path,
+            prepare_context=self.compacted_context(documents, focus)
         )
 
     @task
@@ -416,8 +525,11 @@ The implementation should match exactly what was specified in the project plan a
         input_docs = os.path.join(self.project_name, 'docs/implementation/implementation_summary.md')
         output_path = os.path.join(self.get_docs_dir('testing'), output_file)
         
-        return Task(
+        documents = [input_docs]
+        focus = "implemented features, components, API endpoints and test setup"
+        return TrackedTask(
             description=f"""First, review the implementation details from: {input_docs}
+{self.context_instructions(documents, focus)}
 Then, test the implemented application in: {input_dir}
 
 Create and execute the following test suites:
@@ -458,7 +570,8 @@ Generate test coverage reports and save all test results in: {os.path.join(self.
                 "src_dir": input_dir,
                 "implementation_docs": input_docs
             }],
-            output_file=output_path
+            output_file=output_path,
+            prepare_context=self.compacted_context(documents, focus)
         )
 
     @task
@@ -472,7 +585,9 @@ Generate test coverage reports and save all test results in: {os.path.join(self.
             "implementation": os.path.join(self.project_name, 'docs/implementation/implementation_summary.md'),
             "test_results": os.path.join(self.project_name, 'docs/testing/test_results.md')
         }
-        return Task(
+        documents = list(input_files.values())
+        focus = "features, architecture overview, setup, configuration, API and testing"
+        return TrackedTask(
             description=f"""Create comprehensive documentation by reviewing and synthesizing:
 
 1. Project Overview
@@ -486,6 +601,8 @@ Generate test coverage reports and save all test results in: {os.path.join(self.
    - Implementation Notes: {input_files['implementation']}
    - Test Results and Coverage: {input_files['test_results']}
 
+{self.context_instructions(documents, focus)}
+
 3. User Documentation
    - Installation Instructions
    - Configuration Guide
@@ -518,7 +635,8 @@ Save the complete documentation to: {os.path.join(self.project_name, 'docs/docum
                 "expected_output": "Complete README documentation",
                 "files": input_files
             }],
-            output_file=output_path
+            output_file=output_path,
+            prepare_context=self.compacted_context(documents, focus)
         )
 
     def validate_file_exists(self, file_path: str, description: str) -> bool:
@@ -591,9 +709,10 @@ Save the complete documentation to: {os.path.join(self.project_name, 'docs/docum
         return all(validations)
 
     @task
-    def validate_implementation(self) -> Task:
-        """Task to validate the implementation"""
-        return Task(
+    def validate_implementation(self, phase: str = "setup") -> Task:
+        """Task to validate the implementation after the given pipeline phase"""
+        return TrackedTask(
+            name=f"validate_implementation_{phase}",
             description=f"""Validate the project implementation in {self.project_name}:
 
 1. Check Project Structure
@@ -616,6 +735,9 @@ Save the complete documentation to: {os.path.join(self.project_name, 'docs/docum
    - Check for required diagrams
    - Validate API documentation
 
+Rule-based checks already ran; their report is in {self.project_dir}/.devcrew/validation_{phase}.json.
+Start with the checks that failed or were inconclusive there.
+
 Report any missing or incorrect items.""",
             expected_output="Validation report detailing any issues found",
             agent=self.qa_engineer(),
@@ -631,10 +753,17 @@ Report any missing or incorrect items.""",
         """Task to review and provide feedback on implementation"""
         output_file = 'implementation_review.md'
         output_path = os.path.join(self.get_docs_dir('reviews'), output_file)
+        documents = [
+            os.path.join(self.project_name, 'docs/architecture/architecture.md'),
+            os.path.join(self.project_name, 'docs/implementation/implementation_summary.md')
+        ]
         
-        return Task(
+        focus = "architectural decisions, patterns and implemented components"
+        return TrackedTask(
             description=f"""Review the current implementation and provide feedback:
 
+{self.context_instructions(documents, focus)}
+
 1. Architecture Review
    - Verify alignment with architectural decisions
    - Check component interactions
@@ -668,27 +797,107 @@ Save the review feedback to: {output_path}""",
                 "expected_output": "Review feedback",
                 "project_dir": self.project_name
             }],
-            output_file=output_path
+            output_file=output_path,
+            prepare_context=self.compacted_context(documents, focus)
         )
 
+    def task_graph(self) -> list:
+        """Declare each pipeline task with the workspace artifacts it reads and writes"""
+        docs = os.path.join(self.project_name, 'docs')
+        project_plan = os.path.join(docs, 'requirements/project_plan.md')
+        architecture = os.path.join(docs, 'architecture/architecture.md')
+        tech_design = os.path.join(docs, 'technical_design/technical_design.md')
+        implementation = os.path.join(docs, 'implementation/implementation_summary.md')
+        test_results = os.path.join(docs, 'testing/test_results.md')
+        review = os.path.join(docs, 'reviews/implementation_review.md')
+        readme = os.path.join(docs, 'documentation/README.md')
+        source = os.path.join(self.project_name, 'src')
+
+        return [
+            (self.analyze_requirements(), [], [project_plan]),
+            (self.design_architecture(), [project_plan], [architecture]),
+            (self.create_technical_design(), [architecture], [tech_design]),
+            (self.setup_framework(), [], [source]),             # Phase 1: Framework Setup
+            (self.validate_implementation(), [source], []),
+            (self.implement_requirements(),                     # Phase 2: Requirements Implementation
+             [project_plan, architecture, tech_design, source], [implementation, source]),
+            (self.review_implementation(), [architecture, implementation, source], [review]),
+            (self.test_solution(), [implementation, source], [test_results]),
+            (self.validate_implementation(phase="final"), [source, implementation, test_results], []),
+            (self.create_documentation(),
+             [project_plan, architecture, tech_design, implementation, test_results], [readme])
+        ]
+
+    def schedule_tasks(self) -> list:
+        """Order tasks by dependency and let independent ones run concurrently.
+
+        crewAI joins asynchronous tasks only at the next synchronous task, so
+        every task but the last is started asynchronously and waits on a
+        DependencyGate for its dependencies and one of max_parallel_tasks slots.
+        crewAI requires the crew to end with a synchronous task, which starts
+        once all others have finished.
+        """
+        scheduler = TaskScheduler(max_parallel=self.max_parallel_tasks)
+        graph = self.task_graph()
+        for task_instance, inputs, outputs in graph:
+            scheduler.add_task(task_instance.name, inputs=inputs, outputs=outputs, payload=task_instance)
+        if self.build_state:
+            self.build_state.set_graph((t.name, inputs, outputs) for t, inputs, outputs in graph)
+
+        gate = DependencyGate(scheduler.dependencies(), max_parallel=self.max_parallel_tasks)
+        ordered = [node.payload for wave in scheduler.waves() for node in wave]
+        for index, task_instance in enumerate(ordered):
+            task_instance.async_execution = index < len(ordered) - 1
+            task_instance.gate = gate
+            task_instance.on_start = self.progress.task_started
+            task_instance.on_saved = self.manifest.record
+            task_instance.skip_if = self.skip_reason
+            task_instance.on_finished = self.task_finished
+        self.progress.set_tasks([t.name for t in ordered])
+        return ordered
+
+    def skip_reason(self, task: Task):
+        """Skip a task when the budget is used up, when resuming past it, or in incremental mode when it is up to date"""
+        reason = self.usage.should_skip(task)
+        if reason is None and self.resume:
+            checkpoint = self.checkpoints.resumable(task)
+            # The saved output stands in for the task's result in later tasks' context
+            reason = checkpoint['raw'] if checkpoint else None
+        if reason is None and self.build_state:
+            reason = self.build_state.up_to_date_reason(task)
+        if reason is None and self.rule_validation and task.name.startswith('validate_implementation_'):
+            reason = self.rule_validation_report(task.name[len('validate_implementation_'):])
+        return reason
+
+    def rule_validation_report(self, phase: str):
+        """Run the rule checks for a validation phase; returns the report when all of them pass"""
+        report = self.validator.validate(phase)
+        self.validator.save(report)
+        self.progress.emit('validation', phase=phase, passed=report.passed,
+                           failures=[check.name for check in report.failures()], duration=report.duration)
+        return report.to_markdown() if report.passed else None
+
+    def task_finished(self, task: Task, output) -> None:
+        """Checkpoint a task that ran (and record it for incremental runs)"""
+        # Files the task wrote are visible to the API once it finishes
+        self.manifest.flush()
+        self.checkpoints.save(task, output)
+        if self.build_state:
+            self.build_state.task_finished(task, output)
+
     @crew
     def crew(self) -> Crew:
         """Creates the SDLC crew with validation and feedback steps"""
+        for crew_agent in self.agents:
+            crew_agent.step_callback = self.progress.step_callback_for(crew_agent.role)
+            # Each agent gets its own view of the shared LLM so usage is charged per agent
+            crew_agent.llm = bind_llm(crew_agent.llm, self.usage, crew_agent.role)
+        
         return Crew(
             agents=self.agents,
-            tasks=[
-                self.analyze_requirements(),
-                self.design_architecture(),
-                self.create_technical_design(),
-                self.setup_framework(),      # Phase 1: Framework Setup
-                self.validate_implementation(),
-                self.implement_requirements(),# Phase 2: Requirements Implementation
-                self.review_implementation(), # New: Implementation Review
-                self.test_solution(),
-                self.validate_implementation(),
-                self.create_documentation()
-            ],
+            tasks=self.schedule_tasks(),
             process=Process.sequential,
+            task_callback=self.progress.task_finished,
             verbose=True
         )
 
@@ -697,6 +906,7 @@ Save the review feedback to: {output_path}""",
         """Prepare the project environment before starting the crew"""
         print("Starting SDLC process for project: " + str(self.project_name))
         print("Requirements: " + str(self.requirements))
+        self.progress.run_started()
         
         # Create project and docs directory structure
         os.makedirs(self.project_dir, exist_ok=True)
@@ -780,6 +990,7 @@ deployment:
         # Write best practices file
         with open(os.path.join(self.project_dir, 'best_practices.yaml'), 'w') as f:
             f.write(best_practices)
+        self.manifest.record('best_practices.yaml', save=False)
         
         # Create a project metadata file
         metadata = {
@@ -794,6 +1005,7 @@ deployment:
                 title = key.replace('_', ' ').title()
                 f.write("## " + title + "\n")
                 f.write(str(value) + "\n\n")
+        self.manifest.record('docs/metadata.md')
 
     @after_kickoff
     def after_kickoff(self, crew) -> None:
@@ -808,16 +1020,9 @@ deployment:
         print("Project: " + str(self.project_name))
         print("Location: " + str(self.project_dir))
         
-        # List all generated artifacts (excluding node_modules and other build directories)
-        ignore_dirs = {'node_modules', '.next', '.git', '__pycache__', '.vscode'}
-        print("\nGenerated Artifacts:")
-        for root, dirs, files in os.walk(os.path.join(self.workspace_dir, self.project_name)):
-            # Remove ignored directories from dirs list to prevent walking into them
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
-            
-            level = root.replace(os.path.join(self.workspace_dir, self.project_name), '').count(os.sep)
-            indent = ' ' * 4 * level
-            print(f"{indent}{os.path.basename(root)}/")
-            subindent = ' ' * 4 * (level + 1)
-            for f in files:
-                print(f"{subindent}{f}")
\ No newline at end of file
+        # Pick up files created by shell commands and scaffolding (only new or changed files are hashed)
+        counts = self.manifest.rebuild()
+        print(f"\nGenerated Artifacts ({len(self.manifest.entries)} files, "
+              f"{counts['added']} added and {counts['updated']} updated outside the file tools):")
+        for line in self.manifest.tree():
+            print(line)
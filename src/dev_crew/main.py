@@ -2,16 +2,20 @@
 import sys
 import warnings
 import os
-from dev_crew.crew import DevCrew
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+# Entry points import what they need when they run, so commands that don't build
+# a crew (scaffold, manifest) don't pay for importing crewAI
+
 # This main file is intended to be a way for you to run your
 # crew locally, so refrain from adding unnecessary logic into this file.
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
 
 def main():
+    from dev_crew.crew import DevCrew
+
     # Get requirements from command line argument or use default web app requirements
     requirements = (sys.argv[1] if len(sys.argv) > 1 else
                   """Create a modern web application with the following features:
@@ -47,7 +51,16 @@ def main():
 def run():
     """
     Run the SDLC crew with default requirements.
+    Pass --incremental to re-run only tasks whose inputs changed since the last run,
+    or --resume to continue an interrupted run after its last completed task.
+    `dev_crew batch specs.jsonl --concurrency N` runs many projects instead (see batch).
     """
+    if sys.argv[1:2] == ["batch"]:
+        del sys.argv[1]
+        return batch()
+
+    from dev_crew.crew import DevCrew
+
     # Default requirements for a web application project
     requirements = """Create a modern web application with the following features:
     - Next.js 15 with App Router using server-first approach
@@ -66,7 +79,9 @@ def run():
     dev_crew = DevCrew(
         requirements=requirements,
         project_name="web_app_project",
-        workspace_dir=os.getenv('DEVCREW_WORKSPACE')
+        workspace_dir=os.getenv('DEVCREW_WORKSPACE'),
+        incremental=True if '--incremental' in sys.argv[1:] else None,
+        resume='--resume' in sys.argv[1:]
     )
     
     # Start the SDLC process
@@ -84,6 +99,8 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
+    from dev_crew.crew import DevCrew
+
     requirements = "Training run for web application development"
     try:
         DevCrew(
@@ -101,6 +118,8 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
+    from dev_crew.crew import DevCrew
+
     requirements = "Replay run for web application development"
     try:
         DevCrew(
@@ -115,6 +134,8 @@ def test():
     """
     Test the crew execution and returns the results.
     """
+    from dev_crew.crew import DevCrew
+
     requirements = "Test run for web application development"
     try:
         DevCrew(
@@ -128,5 +149,114 @@ def test():
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
 
+def scaffold():
+    """
+    Manage the framework scaffold cache: `scaffold warm`, `scaffold list` or `scaffold clear [key]`.
+    """
+    from dev_crew.tools.framework_tool import NEXTJS_INIT_COMMAND
+    from dev_crew.utils.scaffold_cache import ScaffoldCache
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    cache = ScaffoldCache()
+
+    if command == "warm":
+        key = cache.build(NEXTJS_INIT_COMMAND)
+        print(f"Scaffold template ready: {key} ({cache.template_path(key)})")
+    elif command == "list":
+        for template in cache.list():
+            print(f"{template['key']}  node {template['versions']['node']}  npm {template['versions']['npm']}  "
+                  f"built in {template['build_seconds']}s")
+    elif command == "clear":
+        removed = cache.invalidate(sys.argv[2] if len(sys.argv) > 2 else None)
+        print(f"Removed {removed} scaffold template(s)")
+    else:
+        raise Exception(f"Unknown scaffold command: {command}. Use warm, list or clear.")
+
+def manifest():
+    """
+    Inspect or repair a project's artifact manifest: `manifest show <project_dir>` or `manifest rebuild <project_dir>`.
+    """
+    from dev_crew.utils.manifest import ArtifactManifest
+
+    if len(sys.argv) < 3:
+        raise Exception("Usage: manifest show|rebuild <project_dir>")
+    command, project_dir = sys.argv[1], sys.argv[2]
+    project_manifest = ArtifactManifest(project_dir)
+
+    if command == "rebuild":
+        counts = project_manifest.rebuild()
+        print(f"Manifest rebuilt: {len(project_manifest.entries)} files "
+              f"({counts['added']} added, {counts['updated']} updated, {counts['removed']} removed)")
+    elif command == "show":
+        if not project_manifest.exists:
+            print(f"No manifest at {project_manifest.path}; run `manifest rebuild {project_dir}`")
+            return
+        for line in project_manifest.tree():
+            print(line)
+    else:
+        raise Exception(f"Unknown manifest command: {command}. Use show or rebuild.")
+
+def memo():
+    """
+    Inspect the ShellTool command memo: `memo stats`, `memo list [limit]` or `memo clear`.
+    """
+    from dev_crew.utils.command_memo import CommandMemo
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    command_memo = CommandMemo()
+
+    if command == "stats":
+        stats = command_memo.stats()
+        print(f"{stats['entries']} results ({stats['bytes']} bytes) in {stats['path']}")
+        print(f"hits {stats['hits']}  misses {stats['misses']}  hit ratio {stats['hit_ratio']:.1%}")
+    elif command == "list":
+        for entry in command_memo.entries(int(sys.argv[2]) if len(sys.argv) > 2 else 50):
+            print(f"{entry['status']:<6} exit {entry['exit_code']}  {entry['duration']:.1f}s saved  "
+                  f"{entry['command']}  ({entry['cwd']})")
+    elif command == "clear":
+        command_memo.clear()
+        print("Command memo cleared")
+    else:
+        raise Exception(f"Unknown memo command: {command}. Use stats, list or clear.")
+
+def batch():
+    """
+    Run every spec of a JSONL file in its own worker process:
+    `batch specs.jsonl [--concurrency N] [--timeout SECONDS] [--incremental] [--llm-cache]`.
+    """
+    import argparse
+    from dotenv import load_dotenv
+    from dev_crew.utils.batch_runner import BatchRunner, format_report, load_specs
+
+    parser = argparse.ArgumentParser(prog="batch", description="Run many requirement specs concurrently")
+    parser.add_argument("specs", help="JSONL file with one {\"requirements\", \"project_name\"?, ...} object per line")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv('DEVCREW_MAX_WORKERS', '2')))
+    parser.add_argument("--timeout", type=int, default=None, help="per-project timeout in seconds")
+    parser.add_argument("--incremental", action="store_true", help="re-run only tasks whose inputs changed")
+    parser.add_argument("--llm-cache", action="store_true",
+                        help="replay cached LLM responses (up to DEVCREW_LLM_CACHE_TTL old) instead of regenerating")
+    args = parser.parse_args(sys.argv[1:])
+
+    load_dotenv()
+    # Workers inherit the environment; the search and scaffold caches are on by default,
+    # the LLM cache only when asked for, since it replays earlier completions
+    if args.llm_cache:
+        os.environ['DEVCREW_LLM_CACHE'] = 'true'
+
+    runner = BatchRunner(load_specs(args.specs), concurrency=args.concurrency,
+                         workspace_dir=os.getenv('DEVCREW_WORKSPACE'), timeout=args.timeout,
+                         incremental=True if args.incremental else None)
+    print(f"Running {len(runner.specs)} projects with concurrency {runner.concurrency} ({runner.batch_id})")
+    if runner.llm_cache:
+        print("LLM response cache is ON: identical prompts replay cached completions instead of regenerating")
+    report = runner.run()
+
+    print()
+    for line in format_report(report):
+        print(line)
+    print(f"Report: {os.path.join(runner.report_dir, 'report.json')}")
+    if any(project['status'] != 'completed' for project in report['projects']):
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,83 @@
+from crewai.tools import BaseTool
+from typing import List, Literal, Optional, Type
+from pydantic import BaseModel, Field
+import os
+from .file_tools import FileTools
+from ..utils.code_index import CodeIndex
+from ..utils.metrics import timed_tool
+
+# Most result lines returned by one query
+MAX_RESULTS = 200
+
+class ProjectIndexInput(BaseModel):
+    """Input schema for ProjectIndexTool."""
+    project_dir: str = Field(..., description="Project directory relative to workspace")
+    query: Literal['find', 'importers', 'imports', 'routes', 'components', 'files', 'summary'] = Field(
+        ..., description=(
+            "find: where a symbol is defined; importers: files importing a file or package; "
+            "imports: what a file imports; routes: App Router pages/API routes; components: React components; "
+            "files: files matching a glob; summary: counts"
+        )
+    )
+    target: Optional[str] = Field(
+        None, description="Symbol name (find), project-relative path or package (importers/imports) or glob (files)"
+    )
+
+@timed_tool
+class ProjectIndexTool(BaseTool):
+    name: str = "Query Project Index"
+    description: str = (
+        "Answer questions about the generated project's code without reading files: where a symbol or "
+        "component is defined, what imports a file or package, what a file imports, the App Router routes, "
+        "the React components and which files exist (node_modules and .next excluded)."
+    )
+    args_schema: Type[BaseModel] = ProjectIndexInput
+
+    def _run(self, project_dir: str, query: str, target: Optional[str] = None) -> str:
+        try:
+            project_root = os.path.join(FileTools.get_workspace_dir(), FileTools.normalize_path(project_dir))
+            if not os.path.isdir(project_root):
+                return f"Error: Project directory not found: {project_dir}"
+            if query in ('find', 'importers', 'imports') and not target:
+                return f"Error: '{query}' needs a target"
+            index = CodeIndex.for_project(project_root)
+            refreshed = index.refresh_if_stale()
+            lines = self._query(index, query, target)
+            if not lines and not refreshed:
+                # A miss may be a file a shell command created since the last scan
+                index.refresh()
+                lines = self._query(index, query, target)
+
+            if lines is None:
+                return f"Error: {target} is not in the index"
+            if not lines:
+                return f"No results for {query}" + (f" '{target}'" if target else '')
+            more = f"\n... {len(lines) - MAX_RESULTS} more" if len(lines) > MAX_RESULTS else ''
+            return '\n'.join(lines[:MAX_RESULTS]) + more
+        except Exception as e:
+            return f"Error querying project index: {str(e)}"
+
+    @staticmethod
+    def _query(index: CodeIndex, query: str, target: Optional[str]) -> Optional[List[str]]:
+        """Result lines of a query; None when the file asked about isn't indexed"""
+        if query == 'find':
+            return [f"{m['file']}:{m.get('line', '?')} {m['kind']} {m['name']}" + (' (default)' if m.get('default') else '')
+                    for m in index.find_symbol(target)]
+        if query == 'importers':
+            return index.importers_of(target)
+        if query == 'imports':
+            return index.imports_of(target) if index.exists(target) else None
+        if query == 'routes':
+            return [f"{r['path']} [{r['kind']}{' ' + ','.join(r['methods']) if r.get('methods') else ''}] {r['file']}"
+                    for r in index.routes()]
+        if query == 'components':
+            return [f"{name} {rel_path}" for name, rel_path in index.components()]
+        if query == 'files':
+            return index.list_files(target)
+        files = index.list_files()
+        return [
+            f"files: {len(files)}",
+            f"source modules: {sum(1 for f in files if 'exports' in index.files[f])}",
+            f"components: {len(index.components())}",
+            f"routes: {len(index.routes())}"
+        ]
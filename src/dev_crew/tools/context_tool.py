@@ -0,0 +1,35 @@
+from crewai.tools import BaseTool
+from typing import List, Optional, Type
+from pydantic import BaseModel, Field
+from .file_tools import FileTools
+from ..utils.context_compactor import DEFAULT_MAX_TOKENS, ContextCompactor
+from ..utils.metrics import timed_tool
+
+class CompactContextInput(BaseModel):
+    """Input schema for CompactContextTool."""
+    file_paths: List[str] = Field(..., description="Markdown documents relative to workspace")
+    focus: str = Field(..., description="What the context is needed for, e.g. the feature or component being built")
+    max_tokens: Optional[int] = Field(None, description=f"Token budget for the result (default {DEFAULT_MAX_TOKENS})")
+
+@timed_tool
+class CompactContextTool(BaseTool):
+    name: str = "Compact Context"
+    description: str = (
+        "Get the sections of several project documents that are relevant to a focus, within a token budget. "
+        "The most relevant sections are returned in full, others as short summaries, and the rest are listed "
+        "by heading with their line range (path:L10-L42). Use this instead of reading whole planning and design "
+        "documents; use Read File with that start_line/end_line when a section is needed in full."
+    )
+    args_schema: Type[BaseModel] = CompactContextInput
+    _compactor: Optional[ContextCompactor] = None
+
+    def _run(self, file_paths: List[str], focus: str, max_tokens: Optional[int] = None) -> str:
+        try:
+            if self._compactor is None:
+                self._compactor = ContextCompactor()
+            paths = [FileTools.normalize_path(path) for path in file_paths]
+            return self._compactor.compact(
+                paths, focus, max_tokens or DEFAULT_MAX_TOKENS, base_dir=FileTools.get_workspace_dir()
+            )
+        except Exception as e:
+            return f"Error compacting context: {str(e)}"
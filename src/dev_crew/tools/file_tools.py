@@ -1,17 +1,36 @@
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 from pydantic import BaseModel, Field
 import os
+import threading
+from ..utils.file_cache import READ_CACHE, READ_MAX_BYTES, read_window
+from ..utils.code_index import index_workspace_writes
+from ..utils.manifest import record_workspace_write, record_workspace_writes
+from ..utils.metrics import timed_tool
 
 class FileReadInput(BaseModel):
     """Input schema for FileReadTool."""
     file_path: str = Field(..., description="Path to the file relative to workspace")
+    start_line: Optional[int] = Field(None, description="First line to read (1-based)")
+    end_line: Optional[int] = Field(None, description="Last line to read (inclusive)")
+    offset: Optional[int] = Field(None, description="Byte offset to start reading at")
+    length: Optional[int] = Field(None, description="Number of bytes to read from offset")
 
 class FileWriteInput(BaseModel):
     """Input schema for FileWriteTool."""
     file_path: str = Field(..., description="Path to the file relative to workspace")
     content: str = Field(..., description="Content to write to the file")
 
+class BatchFileEntry(BaseModel):
+    """One file for BatchFileWriteTool"""
+    path: str = Field(..., description="Path to the file relative to workspace")
+    content: str = Field(..., description="Content to write to the file")
+
+class BatchFileWriteInput(BaseModel):
+    """Input schema for BatchFileWriteTool."""
+    files: List[BatchFileEntry] = Field(..., description="Files to write, as {path, content} entries")
+    fsync: bool = Field(False, description="Flush files and directories to disk before returning")
+
 class FileTools:
     @staticmethod
     def get_workspace_dir() -> str:
@@ -31,12 +50,47 @@ class FileTools:
             file_path = file_path[2:] if file_path.startswith('./') else file_path[3:]
         return file_path
 
+    @staticmethod
+    def write_atomic(full_path: str, data: bytes, fsync: bool = False) -> None:
+        """Write via a temporary file in the same directory and rename it into place"""
+        tmp_path = os.path.join(
+            os.path.dirname(full_path),
+            f".{os.path.basename(full_path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        READ_CACHE.invalidate(full_path)
+
+    @staticmethod
+    def fsync_dir(dir_path: str) -> None:
+        """Persist renames in a directory"""
+        fd = os.open(dir_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+@timed_tool
 class FileReadTool(BaseTool):
     name: str = "Read File"
-    description: str = "Read content from a file relative to workspace"
+    description: str = (
+        "Read content from a file relative to workspace. Optionally pass start_line/end_line "
+        f"or offset/length to read part of it; files over {READ_MAX_BYTES} bytes are returned as "
+        "head, outline and tail."
+    )
     args_schema: Type[BaseModel] = FileReadInput
 
-    def _run(self, file_path: str) -> str:
+    def _run(self, file_path: str, start_line: Optional[int] = None, end_line: Optional[int] = None,
+             offset: Optional[int] = None, length: Optional[int] = None) -> str:
         try:
             # Normalize the path to be relative to workspace
             file_path = FileTools.normalize_path(file_path)
@@ -46,11 +100,12 @@ class FileReadTool(BaseTool):
             if not os.path.exists(full_path):
                 return f"Error: File not found at path: {file_path}"
                 
-            with open(full_path, 'r') as f:
-                return f.read()
+            # Repeated reads of unchanged files (plans, designs) are served from memory
+            return read_window(full_path, start_line, end_line, offset, length)
         except Exception as e:
             return f"Error reading file {file_path}: {str(e)}"
 
+@timed_tool
 class FileWriteTool(BaseTool):
     name: str = "Write File"
     description: str = "Write content to a file relative to workspace"
@@ -66,8 +121,86 @@ class FileWriteTool(BaseTool):
             # Create directories if they don't exist
             os.makedirs(os.path.dirname(full_path), exist_ok=True)
             
-            with open(full_path, 'w') as f:
-                f.write(content)
+            data = content.encode('utf-8')
+            FileTools.write_atomic(full_path, data)
+            
+            # Keep the project's artifact manifest current without re-walking the tree
+            try:
+                record_workspace_write(FileTools.get_workspace_dir(), file_path, data)
+                index_workspace_writes(FileTools.get_workspace_dir(), [(file_path, data)])
+            except Exception as e:
+                print(f"Warning: could not update artifact manifest for {file_path}: {str(e)}")
             return f"Successfully wrote to {file_path}"
         except Exception as e:
-            return f"Error writing to file {file_path}: {str(e)}" 
\ No newline at end of file
+            return f"Error writing to file {file_path}: {str(e)}"
+
+
+@timed_tool
+class BatchFileWriteTool(BaseTool):
+    name: str = "Write Files"
+    description: str = (
+        "Write many files relative to workspace in one call. Pass `files` as a list of "
+        "{path, content}; each file is written atomically and a per-file summary is returned. "
+        "Prefer this over repeated Write File calls when creating several files."
+    )
+    args_schema: Type[BaseModel] = BatchFileWriteInput
+
+    def _run(self, files: List[Union[BatchFileEntry, Dict[str, Any]]], fsync: bool = False) -> str:
+        entries = [f if isinstance(f, BatchFileEntry) else BatchFileEntry.model_validate(f) for f in files or []]
+        if not entries:
+            return "No files given"
+        workspace_dir = FileTools.get_workspace_dir()
+
+        # The last entry for a path wins, like sequential writes would
+        pending: Dict[str, bytes] = {}
+        for entry in entries:
+            file_path = FileTools.normalize_path(entry.path)
+            pending.pop(file_path, None)
+            pending[file_path] = entry.content.encode('utf-8')
+
+        results: Dict[str, str] = {}
+        dir_errors: Dict[str, str] = {}
+        for dir_path in sorted({os.path.dirname(os.path.join(workspace_dir, p)) for p in pending}):
+            try:
+                os.makedirs(dir_path, exist_ok=True)
+            except OSError as e:
+                dir_errors[dir_path] = str(e)
+
+        written: List[Tuple[str, bytes]] = []
+        for file_path, data in pending.items():
+            full_path = os.path.join(workspace_dir, file_path)
+            dir_path = os.path.dirname(full_path)
+            if not file_path or file_path.endswith('/'):
+                results[file_path] = "error: not a file path"
+                continue
+            if dir_path in dir_errors:
+                results[file_path] = f"error: {dir_errors[dir_path]}"
+                continue
+            try:
+                FileTools.write_atomic(full_path, data, fsync)
+                written.append((file_path, data))
+                results[file_path] = f"ok ({len(data)} bytes)"
+            except Exception as e:
+                results[file_path] = f"error: {str(e)}"
+
+        if fsync:
+            for dir_path in {os.path.dirname(os.path.join(workspace_dir, p)) for p, _ in written}:
+                try:
+                    FileTools.fsync_dir(dir_path)
+                except OSError as e:
+                    # The files are written; only their directory entries may not be durable yet
+                    for file_path, _ in written:
+                        if os.path.dirname(os.path.join(workspace_dir, file_path)) == dir_path:
+                            results[file_path] += f"; directory fsync failed: {str(e)}"
+
+        # One manifest and code index save per project instead of one per file
+        try:
+            record_workspace_writes(workspace_dir, written)
+            index_workspace_writes(workspace_dir, written)
+        except Exception as e:
+            print(f"Warning: could not update artifact manifest: {str(e)}")
+
+        total = sum(len(data) for _, data in written)
+        lines = [f"Wrote {len(written)} of {len(pending)} files ({total} bytes)"]
+        lines.extend(f"- {file_path}: {result}" for file_path, result in results.items())
+        return "\n".join(lines)
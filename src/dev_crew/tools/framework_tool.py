@@ -5,12 +5,48 @@ import yaml
 import os
 import subprocess
 from pathlib import Path
+from ..utils.scaffold_cache import ScaffoldCache
+from ..utils.metrics import timed_tool
+
+# Initialize Next.js project with all flags to prevent prompts
+NEXTJS_INIT_COMMAND = (
+    "npx create-next-app@latest . "
+    "--yes "  # Must be first to skip all prompts
+    "--typescript "
+    "--tailwind "
+    "--eslint "
+    "--app "
+    "--src-dir "
+    "--import-alias '@/*' "
+    "--no-git "
+    "--use-npm "
+    "--js false "
+    "--ts true "
+    "--tailwind true "
+    "--eslint true "
+    "--app true "
+    "--src-dir true "
+    "--import-alias '@/*' "
+    "--use-npm true "
+    "--no-git true "
+    "--experimental-app=false "
+    "--template=default "
+    "--no-tailwind=false "
+    "--customize=false"
+)
+
+# Kept when the project directory is reset for the framework: planning docs, and
+# .devcrew state (checkpoints, manifest, build state and indexes) that concurrent
+# tasks and --resume/--incremental rely on
+PRESERVED_ENTRIES = ['docs', '.gitignore', '.devcrew']
+
 
 class FrameworkSetupInput(BaseModel):
     """Input schema for FrameworkSetup tool."""
     project_dir: str = Field(..., description="Directory where the project should be set up")
     config_path: str = Field(..., description="Path to the best practices config file")
 
+@timed_tool
 class FrameworkTool(BaseTool):
     name: str = "Framework Setup Tool"
     description: str = (
@@ -43,6 +79,27 @@ class FrameworkTool(BaseTool):
                 'command': command
             }
 
+    def _init_nextjs(self, abs_project_dir: str) -> None:
+        """Run create-next-app and npm install directly in the project directory"""
+        # Execute in project directory without touching the process-wide cwd,
+        # other tasks may be running concurrently
+        print("Initializing Next.js project...")
+        result = subprocess.run(NEXTJS_INIT_COMMAND, shell=True, check=True, capture_output=True, text=True, cwd=abs_project_dir)
+        print(result.stdout)
+        
+        # Wait for npm install to complete
+        print("Installing dependencies...")
+        subprocess.run("npm install", shell=True, check=True, cwd=abs_project_dir)
+
+    def _clone_nextjs(self, abs_project_dir: str) -> None:
+        """Clone a pre-built, pre-installed Next.js template into the project directory"""
+        cache = ScaffoldCache()
+        key = cache.build(NEXTJS_INIT_COMMAND)
+        print(f"Cloning Next.js scaffold {key}...")
+        strategy = cache.materialize(key, abs_project_dir, preserve=PRESERVED_ENTRIES)
+        cache.set_package_name(abs_project_dir)
+        print(f"Scaffold cloned using {strategy}")
+
     def _setup_nextjs(self, project_dir: str) -> bool:
         """Set up Next.js project with best practices"""
         try:
@@ -89,11 +146,11 @@ next-env.d.ts
             with open(os.path.join(abs_project_dir, '.gitignore'), 'w') as f:
                 f.write(gitignore_content.strip())
 
-            # Clean up existing files but preserve docs
+            # Clean up existing files but preserve docs and crew state
             if os.path.exists(abs_project_dir):
                 print("Cleaning up existing directory...")
                 for item in os.listdir(abs_project_dir):
-                    if item not in ['docs', '.gitignore']:
+                    if item not in PRESERVED_ENTRIES:
                         item_path = os.path.join(abs_project_dir, item)
                         if os.path.isfile(item_path):
                             os.remove(item_path)
@@ -101,42 +158,12 @@ next-env.d.ts
                             import shutil
                             shutil.rmtree(item_path)
 
-            # Initialize Next.js project with all flags to prevent prompts
-            init_cmd = (
-                "npx create-next-app@latest . "
-                "--yes "  # Must be first to skip all prompts
-                "--typescript "
-                "--tailwind "
-                "--eslint "
-                "--app "
-                "--src-dir "
-                "--import-alias '@/*' "
-                "--no-git "
-                "--use-npm "
-                "--js false "
-                "--ts true "
-                "--tailwind true "
-                "--eslint true "
-                "--app true "
-                "--src-dir true "
-                "--import-alias '@/*' "
-                "--use-npm true "
-                "--no-git true "
-                "--experimental-app=false "
-                "--template=default "
-                "--no-tailwind=false "
-                "--customize=false"
-            )
-            
-            # Execute in project directory
-            os.chdir(abs_project_dir)
-            print("Initializing Next.js project...")
-            result = subprocess.run(init_cmd, shell=True, check=True, capture_output=True, text=True)
-            print(result.stdout)
-            
-            # Wait for npm install to complete
-            print("Installing dependencies...")
-            subprocess.run("npm install", shell=True, check=True, cwd=abs_project_dir)
+            # Materialize the Next.js project from the scaffold cache when enabled,
+            # otherwise initialize it from scratch
+            if os.getenv('DEVCREW_SCAFFOLD_CACHE', '1').lower() in ('0', 'false', 'no'):
+                self._init_nextjs(abs_project_dir)
+            else:
+                self._clone_nextjs(abs_project_dir)
             
             # Create required directories
             print("Creating project structure...")
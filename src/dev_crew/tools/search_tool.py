@@ -0,0 +1,22 @@
+from crewai_tools import SerperDevTool
+import os
+from ..utils.search_cache import get_search_cache
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool backed by the process-wide, disk-persisted search cache.
+
+    Identical (normalized) queries from any agent or project are answered from
+    the cache, and concurrent identical queries share a single API request.
+    Set DEVCREW_SEARCH_CACHE=0 to always hit the API.
+    """
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        if os.getenv('DEVCREW_SEARCH_CACHE', '1').lower() in ('0', 'false', 'no'):
+            return super()._make_api_request(search_query, search_type)
+
+        return get_search_cache().get_or_fetch(
+            search_query,
+            lambda: super(CachedSerperDevTool, self)._make_api_request(search_query, search_type),
+            search_type=search_type,
+            n_results=self.n_results
+        )
@@ -1,76 +1,259 @@
 from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
 import subprocess
 import os
-from typing import Optional
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Type, Union
+from .file_tools import FileTools
+from ..utils.metrics import timed_tool
+from ..utils.command_memo import get_command_memo
+from ..utils import child_processes
+from ..utils.child_processes import KILL_GRACE_PERIOD
 
+# Seconds a command may run before its process group is killed (dev servers never exit)
+DEFAULT_TIMEOUT = float(os.getenv('DEVCREW_SHELL_TIMEOUT', '600'))
+# Lines of each command's output kept in memory and returned to the agent; the rest is in the log file
+TAIL_LINES = int(os.getenv('DEVCREW_SHELL_TAIL_LINES', '50'))
+TAIL_BYTES = 8 * 1024
+# Bytes read from a command's output pipe at a time
+READ_CHUNK = 64 * 1024
+
+class ShellCommand(BaseModel):
+    """One command for ShellTool"""
+    command: str = Field(..., description="Shell command to run")
+    cwd: str = Field(".", description="Working directory relative to the workspace (created if missing)")
+    env: Dict[str, str] = Field(default_factory=dict, description="Extra environment variables")
+    timeout: Optional[float] = Field(None, description="Seconds before the command is killed")
+    group: int = Field(0, description="Commands in the same group run concurrently; groups run in ascending order")
+    inputs: List[str] = Field(
+        default_factory=list,
+        description="Files/globs (relative to cwd) the result depends on; unchanged inputs reuse the previous result"
+    )
+    memoize: bool = Field(True, description="Set to false to always run the command")
+
+class ShellToolInput(BaseModel):
+    """Input schema for ShellTool."""
+    commands: Optional[List[ShellCommand]] = Field(
+        None, description="Commands to run; a failure stops later groups"
+    )
+    task_description: Optional[str] = Field(
+        None, description="Legacy format: 'execute_command: <command>' / 'working_directory: <dir>' pairs, run in order"
+    )
+
+@dataclass
+class CommandResult:
+    command: str
+    cwd: str
+    status: str = 'skipped'  # ok, failed, timeout, error or skipped
+    exit_code: Optional[int] = None
+    duration: float = 0.0
+    log_path: Optional[str] = None
+    tail: Deque[str] = field(default_factory=lambda: deque(maxlen=TAIL_LINES))
+    error: Optional[str] = None
+    memoized: bool = False
+    # The output pump may outlive run_command when an orphan keeps the pipe open
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def append_output(self, line: str) -> None:
+        with self._lock:
+            self.tail.append(line)
+
+    def tail_lines(self) -> List[str]:
+        with self._lock:
+            return list(self.tail)
+
+    def tail_text(self) -> str:
+        text = ''.join(self.tail_lines())
+        return text[-TAIL_BYTES:] if len(text) > TAIL_BYTES else text
+
+def parse_legacy_commands(task_description: str) -> List[ShellCommand]:
+    """Turn execute_command/working_directory pairs into sequential commands"""
+    command_pattern = r'execute_command:\s*(.*?)[\n\r]+working_directory:\s*(.*?)(?=[\n\r]+|$)'
+    pairs = re.findall(command_pattern, task_description, re.MULTILINE | re.DOTALL)
+    return [
+        ShellCommand(command=cmd.strip(), cwd=working_dir.strip(), group=index)
+        for index, (cmd, working_dir) in enumerate(pairs)
+    ]
+
+def _last_frame(line: bytes) -> bytes:
+    """What a terminal would show for a line redrawn with carriage returns (progress bars)"""
+    return line.rstrip(b'\r').rsplit(b'\r', 1)[-1]
+
+def run_command(spec: ShellCommand, workspace_dir: str, log_path: str) -> CommandResult:
+    """Run one command in its own process group, streaming output to a log file and a bounded tail"""
+    cwd = os.path.join(workspace_dir, spec.cwd)
+    result = CommandResult(command=spec.command, cwd=spec.cwd, log_path=log_path)
+    timeout = spec.timeout or DEFAULT_TIMEOUT
+    start = time.monotonic()
+    try:
+        os.makedirs(cwd, exist_ok=True)
+        log = open(log_path, 'wb')
+    except Exception as e:
+        result.status, result.error = 'error', str(e)
+        return result
+    try:
+        process = subprocess.Popen(
+            spec.command,
+            shell=True,
+            cwd=cwd,
+            env={**os.environ, **spec.env},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+    except Exception as e:
+        log.close()
+        result.status, result.error = 'error', str(e)
+        return result
+
+    def pump() -> None:
+        # Fixed-size reads keep memory bounded even when a command never prints a newline
+        pending = b''
+        try:
+            while True:
+                chunk = process.stdout.read1(READ_CHUNK)
+                if not chunk:
+                    break
+                log.write(chunk)
+                log.flush()
+                lines = (pending + chunk).split(b'\n')
+                pending = lines.pop()[-TAIL_BYTES:]
+                for line in lines:
+                    result.append_output(_last_frame(line).decode('utf-8', errors='replace') + '\n')
+            if _last_frame(pending):
+                result.append_output(_last_frame(pending).decode('utf-8', errors='replace'))
+        finally:
+            process.stdout.close()
+            log.close()
+
+    # Commands get their own process group, outside the worker's; registering them
+    # lets a terminated worker take its npm/node children down too
+    child_processes.register(process)
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+    try:
+        process.wait(timeout=timeout)
+        result.status = 'ok' if process.returncode == 0 else 'failed'
+    except subprocess.TimeoutExpired:
+        child_processes.kill_group(process)
+        result.status = 'timeout'
+        result.error = f"Killed after {timeout:g}s"
+    finally:
+        child_processes.unregister(process)
+    # Output is complete once the pipe closes; don't hang on orphans that kept it open
+    reader.join(timeout=KILL_GRACE_PERIOD)
+    result.exit_code = process.returncode
+    result.duration = time.monotonic() - start
+    return result
+
+def execute_command(spec: ShellCommand, workspace_dir: str, log_path: str) -> CommandResult:
+    """Run a command, or reuse its memoized result when DEVCREW_SHELL_MEMO is on and its inputs are unchanged"""
+    memo = get_command_memo()
+    rule = memo.plan(spec.command, spec.inputs) if memo and spec.memoize else None
+    if rule is None:
+        return run_command(spec, workspace_dir, log_path)
+
+    cwd = os.path.join(workspace_dir, spec.cwd)
+    try:
+        cached = memo.lookup(spec.command, cwd, spec.env, rule)
+    except OSError:
+        cached = None
+    if cached:
+        result = CommandResult(
+            command=spec.command, cwd=spec.cwd, status=cached['status'],
+            exit_code=cached['exit_code'], memoized=True
+        )
+        result.tail.extend(cached['output'].splitlines(keepends=True))
+        return result
+
+    result = run_command(spec, workspace_dir, log_path)
+    try:
+        memo.store(spec.command, cwd, spec.env, rule, result.status, result.exit_code,
+                   result.tail_text(), result.duration)
+    except OSError as e:
+        print(f"Warning: could not memoize '{spec.command}': {str(e)}")
+    return result
+
+def _slug(command: str) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '-', command)[:40].strip('-') or 'command'
+
+@timed_tool
 class ShellTool(BaseTool):
     name: str = "Shell Command Executor"
-    description: str = """Execute shell commands in the specified directory.
-    Commands should be specified in the task description with:
-    execute_command: <command>
-    working_directory: <directory>
+    description: str = """Execute shell commands in the workspace.
+    Pass `commands`: a list of {command, cwd, env, timeout, group}. Commands in the
+    same group run concurrently and groups run in ascending order; a failed group
+    stops the rest. Each command is killed after its timeout (long-running dev
+    servers should be given a short one). Declare `inputs` (files/globs) for
+    idempotent commands so an unchanged result can be reused. The legacy format
+    (task_description with execute_command: / working_directory: pairs) is still
+    accepted.
     """
+    args_schema: Type[BaseModel] = ShellToolInput
+
+    def _run(self, commands: Optional[List[Union[ShellCommand, Dict[str, Any]]]] = None,
+             task_description: Optional[str] = None) -> str:
+        """Execute the commands group by group
 
-    def _run(self, task_description: str) -> str:
-        """Execute commands specified in the task description
-        
         Args:
-            task_description: Task description containing commands to execute
-        
+            commands: Structured commands
+            task_description: Legacy text containing execute_command/working_directory pairs
+
         Returns:
-            Combined output from all commands
+            Status, duration, log file and output tail of every command
         """
-        # Parse commands from task description using a more robust pattern
-        command_pattern = r'execute_command:\s*(.*?)[\n\r]+working_directory:\s*(.*?)(?=[\n\r]+|$)'
-        commands = re.findall(command_pattern, task_description, re.MULTILINE | re.DOTALL)
-        
-        if not commands:
-            return f"No commands found in task description. Task description received:\n{task_description}"
-            
-        outputs = []
-        for cmd, working_dir in commands:
-            try:
-                # Clean up command and working directory
-                cmd = cmd.strip()
-                working_dir = working_dir.strip()
-                
-                print(f"Executing command: {cmd}")
-                print(f"In directory: {working_dir}")
-                
-                # Create directory if it doesn't exist
-                os.makedirs(working_dir, exist_ok=True)
-                
-                # Store current directory
-                original_dir = os.getcwd()
-                
-                try:
-                    # Change to working directory
-                    os.chdir(working_dir)
-                    
-                    # Execute command
-                    result = subprocess.run(
-                        cmd,
-                        shell=True,
-                        check=True,
-                        capture_output=True,
-                        text=True
-                    )
-                    
-                    outputs.append(f"Command '{cmd}' executed successfully in {working_dir}:\n{result.stdout}")
-                    
-                finally:
-                    # Always change back to original directory
-                    os.chdir(original_dir)
-                    
-            except subprocess.CalledProcessError as e:
-                error_msg = f"Command '{cmd}' failed in {working_dir}:\n{e.stderr}"
-                outputs.append(error_msg)
-                return "\n\n".join(outputs)  # Stop on first error
-                
-            except Exception as e:
-                error_msg = f"Error executing '{cmd}' in {working_dir}: {str(e)}"
-                outputs.append(error_msg)
-                return "\n\n".join(outputs)  # Stop on first error
-                
-        return "\n\n".join(outputs) 
\ No newline at end of file
+        specs = [c if isinstance(c, ShellCommand) else ShellCommand.model_validate(c) for c in commands or []]
+        if not specs and task_description:
+            specs = parse_legacy_commands(task_description)
+        if not specs:
+            return f"No commands found. Task description received:\n{task_description}"
+
+        workspace_dir = FileTools.get_workspace_dir()
+        log_dir = os.path.join(workspace_dir, '.devcrew', 'shell_logs')
+        os.makedirs(log_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+
+        results: List[CommandResult] = []
+        failed = False
+        for group in sorted({spec.group for spec in specs}):
+            members = [(index, spec) for index, spec in enumerate(specs) if spec.group == group]
+            if failed:
+                results.extend(CommandResult(command=spec.command, cwd=spec.cwd) for _, spec in members)
+                continue
+            for _, spec in members:
+                print(f"Executing command: {spec.command}")
+                print(f"In directory: {spec.cwd}")
+            with ThreadPoolExecutor(max_workers=len(members)) as pool:
+                group_results = list(pool.map(
+                    lambda item: execute_command(
+                        item[1], workspace_dir, os.path.join(log_dir, f"{stamp}_{item[0]}_{_slug(item[1].command)}.log")
+                    ),
+                    members
+                ))
+            results.extend(group_results)
+            failed = any(result.status != 'ok' for result in group_results)
+
+        return "\n\n".join(self._format(result) for result in results)
+
+    @staticmethod
+    def _format(result: CommandResult) -> str:
+        if result.status == 'skipped':
+            return f"Command '{result.command}' skipped (an earlier command failed)"
+        if result.status == 'error':
+            return f"Error executing '{result.command}' in {result.cwd}: {result.error}"
+        headline = {
+            'ok': f"Command '{result.command}' executed successfully in {result.cwd}",
+            'failed': f"Command '{result.command}' failed in {result.cwd} (exit code {result.exit_code})",
+            'timeout': f"Command '{result.command}' timed out in {result.cwd} and was killed"
+        }[result.status]
+        if result.memoized:
+            return f"{headline} (cached result: its inputs are unchanged since the last run):\n{result.tail_text()}"
+        dropped = '' if len(result.tail_lines()) < TAIL_LINES else f" (last {TAIL_LINES} lines; full output in {result.log_path})"
+        return f"{headline} after {result.duration:.1f}s{dropped}:\n{result.tail_text()}"
@@ -1,15 +1,25 @@
 from typing import Dict, List, Optional
+import os
 from crewai.tools import BaseTool
 from ..utils.task_context import ProjectContext, TaskContext
+from ..utils.research_index import ResearchIndex
 from ..utils.task_decomposer import TaskDecomposer, SubTask
 
 class TaskManagementTool(BaseTool):
     """Tool for managing and decomposing tasks"""
     
-    def __init__(self, project_context: ProjectContext):
+    def __init__(self, project_context: ProjectContext, project_dir: Optional[str] = None,
+                 index_path: Optional[str] = None):
         self.project_context = project_context
         self.decomposer = TaskDecomposer()
         
+        # Persist the research index with the project so later runs reuse it
+        if index_path is None and project_dir:
+            index_path = ResearchIndex.default_path(project_dir)
+        self.index_path = index_path
+        if index_path and os.path.exists(index_path):
+            self.project_context.research_index = ResearchIndex.load(index_path)
+        
     def name(self) -> str:
         return "Task Management Tool"
         
@@ -37,18 +47,19 @@ class TaskManagementTool(BaseTool):
         """Get relevant context for a task"""
         return self.project_context.get_relevant_context(task_id)
         
-    def check_existing_research(self, query: str) -> Optional[Dict]:
-        """Check if research has already been done"""
-        for task in self.project_context.tasks.values():
-            if result := task.get_research_result(query):
-                return result
-        return None
+    def check_existing_research(self, query: str, threshold: Optional[float] = None) -> Optional[Dict]:
+        """Check if the same or a near-duplicate query has already been researched"""
+        match = self.project_context.research_index.lookup(query, threshold)
+        return match["result"] if match else None
         
     def track_research_result(self, query: str, result: Dict, task_id: str) -> None:
         """Track research results for future reference"""
         task = self.project_context.get_task(task_id)
         if task:
             task.add_research_query(query, result)
+        self.project_context.research_index.add(query, result, task_id)
+        if self.index_path:
+            self.project_context.research_index.save(self.index_path)
             
     def add_artifact(self, task_id: str, name: str, path: str) -> None:
         """Track task artifacts"""
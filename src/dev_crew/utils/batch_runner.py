@@ -0,0 +1,187 @@
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from ..api.worker import CrewWorkerPool, get_workspace_dir
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BatchSpec:
+    """One project of a batch: a line of the specs file"""
+    id: str
+    requirements: str
+    project_name: str
+    budget: Optional[Dict[str, Any]] = None
+    timeout: Optional[int] = None
+    incremental: Optional[bool] = None
+
+def load_specs(path: str) -> List[BatchSpec]:
+    """Read a JSONL specs file: {"requirements", "project_name"?, "id"?, "budget"?, "timeout"?, "incremental"?} per line.
+
+    Blank lines and lines starting with # are skipped. Project names must be
+    unique, since two workers writing the same project directory would clash.
+    """
+    specs: List[BatchSpec] = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e}")
+            if not isinstance(data, dict) or not str(data.get('requirements') or '').strip():
+                raise ValueError(f"{path}:{number}: a spec needs non-empty \"requirements\"")
+            project_name = data.get('project_name') or data.get('id') or f"batch_project_{len(specs) + 1}"
+            specs.append(BatchSpec(
+                id=str(data.get('id') or project_name),
+                requirements=data['requirements'],
+                project_name=project_name,
+                budget=data.get('budget'),
+                timeout=data.get('timeout'),
+                incremental=data.get('incremental')
+            ))
+    names = [spec.project_name for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"{path}: duplicate project names: {', '.join(duplicates)}")
+    return specs
+
+class BatchRunner:
+    """Run many crews concurrently in isolated worker processes.
+
+    Workers come from CrewWorkerPool, so each project gets its own process
+    (and process group) and at most `concurrency` run at once. The search,
+    LLM and scaffold caches are disk caches under DEVCREW_CACHE_DIR, shared
+    by every worker (the LLM cache only if DEVCREW_LLM_CACHE is on, which the
+    report records); the scaffold template is built once up front so workers
+    don't all build it at the same time. The consolidated report, with each
+    project's status, queue/run time, per-task durations and usage, is
+    written to <workspace>/.devcrew/batches/<batch_id>/report.json.
+    """
+
+    def __init__(self, specs: List[BatchSpec], concurrency: int = 2, workspace_dir: Optional[str] = None,
+                 timeout: Optional[int] = None, incremental: Optional[bool] = None):
+        self.specs = specs
+        self.concurrency = max(1, concurrency)
+        self.workspace_dir = os.path.abspath(workspace_dir) if workspace_dir else get_workspace_dir()
+        self.timeout = timeout
+        self.incremental = incremental
+        self.batch_id = datetime.now().strftime('batch_%Y%m%d_%H%M%S')
+        self.report_dir = os.path.join(self.workspace_dir, '.devcrew', 'batches', self.batch_id)
+        self.llm_cache = os.getenv('DEVCREW_LLM_CACHE', '').lower() in ('1', 'true', 'yes')
+
+    @staticmethod
+    def warm_scaffold() -> None:
+        """Build the framework scaffold template before workers need it"""
+        if os.getenv('DEVCREW_SCAFFOLD_CACHE', '1').lower() in ('0', 'false', 'no'):
+            return
+        from ..tools.framework_tool import NEXTJS_INIT_COMMAND
+        from .scaffold_cache import ScaffoldCache
+        try:
+            ScaffoldCache().build(NEXTJS_INIT_COMMAND)
+        except Exception as e:
+            # Workers fall back to scaffolding themselves
+            logger.warning(f"Could not build the scaffold template: {e}")
+
+    async def _run_one(self, pool: CrewWorkerPool, spec: BatchSpec) -> Dict[str, Any]:
+        record: Dict[str, Any] = {'id': spec.id, 'project_name': spec.project_name}
+        task_durations: Dict[str, float] = {}
+        queued = time.time()
+        started: List[float] = []
+
+        async def on_start() -> None:
+            started.append(time.time())
+            print(f"[{self.batch_id}] started {spec.id}")
+
+        async def on_event(event: Dict[str, Any]) -> None:
+            if event.get('type') == 'task_finished' and event.get('duration') is not None:
+                task_durations[event['task']] = event['duration']
+
+        timeout = spec.timeout or self.timeout
+        incremental = spec.incremental if spec.incremental is not None else self.incremental
+        run_id = f"{self.batch_id}_{re.sub(r'[^A-Za-z0-9_.-]', '_', spec.id)}"
+        try:
+            outcome = await pool.run(run_id, spec.requirements, spec.project_name, timeout=timeout,
+                                     on_start=on_start, on_event=on_event, budget=spec.budget,
+                                     incremental=incremental)
+        except asyncio.TimeoutError:
+            outcome = {'status': 'timeout', 'error': f"Project exceeded timeout of {timeout} seconds"}
+        except Exception as e:
+            logger.error(f"Error running {spec.id}: {e}", exc_info=True)
+            outcome = {'status': 'failed', 'error': str(e)}
+        finished = time.time()
+
+        run_started = started[0] if started else finished
+        usage = outcome.get('usage') or {}
+        record.update({
+            'status': outcome.get('status', 'failed'),
+            'error': outcome.get('error'),
+            'artifacts_path': outcome.get('artifacts_path'),
+            'queued_seconds': round(run_started - queued, 3),
+            'run_seconds': round(finished - run_started, 3),
+            'tasks': task_durations,
+            'usage': {key: usage.get(key, 0) for key in ('total_tokens', 'cost_usd', 'requests')},
+            'log': os.path.join(pool.run_dir(run_id), 'worker.log')
+        })
+        print(f"[{self.batch_id}] {record['status']} {spec.id} in {record['run_seconds']:.1f}s")
+        return record
+
+    async def run_async(self) -> Dict[str, Any]:
+        started = time.time()
+        await asyncio.to_thread(self.warm_scaffold)
+        pool = CrewWorkerPool(max_workers=self.concurrency, workspace_dir=self.workspace_dir)
+        projects = await asyncio.gather(*(self._run_one(pool, spec) for spec in self.specs))
+
+        wall_seconds = time.time() - started
+        serial_seconds = sum(project['run_seconds'] for project in projects)
+        counts: Dict[str, int] = {}
+        for project in projects:
+            counts[project['status']] = counts.get(project['status'], 0) + 1
+        report = {
+            'batch_id': self.batch_id,
+            'workspace_dir': self.workspace_dir,
+            'concurrency': self.concurrency,
+            'llm_cache': self.llm_cache,
+            'started_at': datetime.fromtimestamp(started).isoformat(),
+            'wall_seconds': round(wall_seconds, 3),
+            'serial_seconds': round(serial_seconds, 3),
+            'speedup': round(serial_seconds / wall_seconds, 2) if wall_seconds else None,
+            'counts': counts,
+            'usage': {
+                'total_tokens': sum(p['usage']['total_tokens'] for p in projects),
+                'cost_usd': round(sum(p['usage']['cost_usd'] for p in projects), 6),
+                'requests': sum(p['usage']['requests'] for p in projects)
+            },
+            'projects': projects
+        }
+        os.makedirs(self.report_dir, exist_ok=True)
+        with open(os.path.join(self.report_dir, 'report.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def run(self) -> Dict[str, Any]:
+        return asyncio.run(self.run_async())
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """Summary table of a batch report for the terminal"""
+    lines = [f"{'project':<32} {'status':<16} {'queued':>8} {'run':>9} {'tokens':>9} {'cost':>9}"]
+    for p in report['projects']:
+        lines.append(f"{p['id'][:32]:<32} {p['status']:<16} {p['queued_seconds']:>7.1f}s {p['run_seconds']:>8.1f}s "
+                     f"{p['usage']['total_tokens']:>9} ${p['usage']['cost_usd']:>8.4f}")
+        if p['error']:
+            lines.append(f"    {p['error'][:200]}")
+    counts = ', '.join(f"{n} {status}" for status, n in sorted(report['counts'].items()))
+    lines.append(f"{len(report['projects'])} projects ({counts}) in {report['wall_seconds']:.1f}s wall, "
+                 f"{report['serial_seconds']:.1f}s serial ({report['speedup']}x) with concurrency {report['concurrency']}; "
+                 f"{report['usage']['total_tokens']} tokens, ${report['usage']['cost_usd']:.4f}")
+    if report.get('llm_cache'):
+        lines.append("LLM response cache was on: some completions may have been replayed from earlier runs")
+    return lines
@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+def _prompt_digest(task: Any) -> str:
+    return hashlib.sha256(f"{task.description}\0{task.expected_output}".encode('utf-8')).hexdigest()
+
+class CheckpointStore:
+    """Completed-task checkpoints of a project run, for resuming after a crash.
+
+    Each task that finishes writes <project>/.devcrew/checkpoints/<task>.json
+    with its output and context. A resumed run skips every task with a
+    checkpoint whose prompt is unchanged and hands the saved output to the
+    tasks after it, so only the failed task and the ones after it run again.
+    A fresh run clears the checkpoints.
+    """
+
+    def __init__(self, project_root: str):
+        self.project_root = os.path.abspath(project_root)
+        self.path = os.path.join(self.project_root, '.devcrew', 'checkpoints')
+        self._lock = threading.Lock()
+
+    def _file(self, task_name: str) -> str:
+        return os.path.join(self.path, re.sub(r'[^A-Za-z0-9_.-]+', '_', task_name) + '.json')
+
+    def save(self, task: Any, output: Any) -> None:
+        """on_finished hook: persist a task's output, output file and context"""
+        agent = getattr(output, 'agent', None) or getattr(getattr(task, 'agent', None), 'role', None)
+        checkpoint = {
+            'task': task.name,
+            'agent': agent,
+            'raw': getattr(output, 'raw', None) or str(output),
+            'output_file': task.output_file,
+            'prompt_sha256': _prompt_digest(task),
+            'context': task.context if isinstance(task.context, list) else None,
+            'finished_at': time.time()
+        }
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            target = self._file(task.name)
+            tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(checkpoint, f, default=str)
+            os.replace(tmp_path, target)
+
+    def load(self, task_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._file(task_name), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def completed(self) -> List[Dict[str, Any]]:
+        """Checkpoints in the order the tasks finished"""
+        if not os.path.isdir(self.path):
+            return []
+        checkpoints = [self.load(name[:-len('.json')]) for name in os.listdir(self.path) if name.endswith('.json')]
+        return sorted((c for c in checkpoints if c), key=lambda c: c.get('finished_at', 0))
+
+    def resumable(self, task: Any) -> Optional[Dict[str, Any]]:
+        """The task's checkpoint if it is still valid for this run"""
+        checkpoint = self.load(task.name)
+        if checkpoint is None or checkpoint.get('prompt_sha256') != _prompt_digest(task):
+            return None
+        output_file = checkpoint.get('output_file')
+        if output_file and not os.path.exists(output_file):
+            return None
+        return checkpoint
+
+    def clear(self) -> None:
+        with self._lock:
+            if not os.path.isdir(self.path):
+                return
+            for name in os.listdir(self.path):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.path, name))
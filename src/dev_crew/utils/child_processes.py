@@ -0,0 +1,50 @@
+from typing import Optional, Set
+import os
+import signal
+import subprocess
+import threading
+
+# Seconds between SIGTERM and SIGKILL when a process group is stopped
+KILL_GRACE_PERIOD = 5
+
+_running: Set[subprocess.Popen] = set()
+_lock = threading.Lock()
+
+def register(process: subprocess.Popen) -> None:
+    """Track a child started in its own process group so it can be killed on shutdown"""
+    with _lock:
+        _running.add(process)
+
+def unregister(process: subprocess.Popen) -> None:
+    with _lock:
+        _running.discard(process)
+
+def kill_group(process: subprocess.Popen, grace: Optional[float] = KILL_GRACE_PERIOD) -> None:
+    """SIGTERM a child's process group, then SIGKILL it if it outlives the grace period"""
+    for sig, wait in ((signal.SIGTERM, grace), (signal.SIGKILL, None)):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            process.wait(timeout=wait)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+def kill_all(grace: float = KILL_GRACE_PERIOD) -> int:
+    """Kill the process groups of all registered children; returns how many were running.
+
+    Every group gets SIGTERM first, so the grace period is shared rather than
+    spent once per child.
+    """
+    with _lock:
+        processes = [p for p in _running if p.poll() is None]
+    for process in processes:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for process in processes:
+        kill_group(process, grace)
+    return len(processes)
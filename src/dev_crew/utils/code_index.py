@@ -0,0 +1,261 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import fnmatch
+import json
+import os
+import posixpath
+import re
+import threading
+import time
+from .manifest import IGNORED_DIRS, normalize_artifact_path
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+COMPONENT_EXTENSIONS = ('.tsx', '.jsx')
+# Bump when the parser changes so indexed files are re-parsed
+INDEX_VERSION = 1
+MAX_PARSE_BYTES = 1024 * 1024
+# Seconds a refresh is trusted before queries walk the project again (misses always re-walk)
+REFRESH_INTERVAL = float(os.getenv('DEVCREW_INDEX_REFRESH_INTERVAL', '5'))
+
+EXPORT_DECLARATION = re.compile(
+    r'^\s*export\s+(?:declare\s+)?(default\s+)?(?:async\s+)?'
+    r'(function\*?|class|const|let|var|interface|type|enum|abstract\s+class)\s+([A-Za-z_$][\w$]*)',
+    re.MULTILINE
+)
+EXPORT_DEFAULT_NAME = re.compile(r'^\s*export\s+default\s+([A-Za-z_$][\w$]*)\s*;?\s*$', re.MULTILINE)
+EXPORT_LIST = re.compile(r'^\s*export\s+(?:type\s+)?\{([^}]*)\}', re.MULTILINE)
+COMPONENT_DECLARATION = re.compile(
+    r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?'
+    r'(?:function\s+([A-Z][\w$]*)\s*[(<]|(?:const|let)\s+([A-Z][\w$]*)\s*(?::[^=]+)?=\s*(?:async\s*)?(?:\(|[a-z_$][\w$]*\s*=>|(?:React\.)?(?:memo|forwardRef)\b))',
+    re.MULTILINE
+)
+IMPORT_SPECIFIER = re.compile(
+    r'''(?:^\s*import\s+(?:[^'";]*?\s+from\s+)?|^\s*export\s+[^'";]*?\s+from\s+|\bimport\s*\(\s*|\brequire\s*\(\s*)['"]([^'"]+)['"]''',
+    re.MULTILINE
+)
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+ROUTE_FILES = {'page': 'page', 'route': 'api', 'layout': 'layout'}
+
+def parse_source(rel_path: str, text: str) -> Dict[str, Any]:
+    """Exports, components and raw import specifiers of a JS/TS module"""
+    exports = []
+    for match in EXPORT_DECLARATION.finditer(text):
+        exports.append({'name': match.group(3), 'kind': match.group(2).split()[-1].rstrip('*'),
+                        'default': bool(match.group(1)), 'line': text.count('\n', 0, match.start()) + 1})
+    for match in EXPORT_DEFAULT_NAME.finditer(text):
+        exports.append({'name': match.group(1), 'kind': 'default', 'default': True,
+                        'line': text.count('\n', 0, match.start()) + 1})
+    for match in EXPORT_LIST.finditer(text):
+        line = text.count('\n', 0, match.start()) + 1
+        for item in match.group(1).split(','):
+            name = item.strip().split(' as ')[-1].strip().removeprefix('type ').strip()
+            if name:
+                exports.append({'name': name, 'kind': 'reexport', 'default': name == 'default', 'line': line})
+
+    components = []
+    if rel_path.endswith(COMPONENT_EXTENSIONS):
+        for match in COMPONENT_DECLARATION.finditer(text):
+            name = match.group(1) or match.group(2)
+            if name not in components:
+                components.append(name)
+
+    imports = sorted({match.group(1) for match in IMPORT_SPECIFIER.finditer(text)})
+    return {'exports': exports, 'components': components, 'imports': imports}
+
+def route_for(rel_path: str, exports: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Next.js App Router route of page/route/layout files under app/ or src/app/"""
+    parts = rel_path.split('/')
+    if parts[0] == 'src':
+        parts = parts[1:]
+    if len(parts) < 2 or parts[0] != 'app':
+        return None
+    stem, extension = posixpath.splitext(parts[-1])
+    if stem not in ROUTE_FILES or extension not in SOURCE_EXTENSIONS:
+        return None
+    # Route groups "(marketing)" and parallel slots "@modal" don't appear in the URL
+    segments = [s for s in parts[1:-1] if not (s.startswith('(') and s.endswith(')')) and not s.startswith('@')]
+    route = {'path': '/' + '/'.join(segments), 'kind': ROUTE_FILES[stem]}
+    if stem == 'route':
+        route['methods'] = sorted({e['name'] for e in exports if e['name'] in HTTP_METHODS})
+    return route
+
+class CodeIndex:
+    """Symbol and file index of a generated project for agent queries.
+
+    Holds every file outside node_modules/.next with, for JS/TS modules, its
+    exports, React components, import edges (resolved to project files where
+    possible, including the "@/" alias for src/) and App Router route. Files
+    written through the file tools are re-parsed immediately; refresh()
+    re-parses only files whose size or mtime changed, to pick up files
+    created by shell commands, and refresh_if_stale() skips the walk when the
+    last one was under REFRESH_INTERVAL ago. Saved to
+    <project>/.devcrew/code_index.json.
+    """
+
+    _instances: Dict[str, 'CodeIndex'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, project_root: str):
+        self.project_root = os.path.abspath(project_root)
+        self.path = os.path.join(self.project_root, '.devcrew', 'code_index.json')
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.refreshed_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._load()
+
+    @classmethod
+    def for_project(cls, project_root: str) -> 'CodeIndex':
+        key = os.path.abspath(project_root)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(key)
+            return cls._instances[key]
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.files = data.get('files', {})
+
+    def save(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'files': self.files}, f)
+            os.replace(tmp_path, self.path)
+
+    def _entry(self, rel_path: str, stat_result: os.stat_result, content: Optional[bytes]) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {'size': stat_result.st_size, 'mtime_ns': stat_result.st_mtime_ns}
+        if rel_path.endswith(SOURCE_EXTENSIONS) and stat_result.st_size <= MAX_PARSE_BYTES:
+            if content is None:
+                with open(os.path.join(self.project_root, rel_path), 'rb') as f:
+                    content = f.read()
+            entry.update(parse_source(rel_path, content.decode('utf-8', errors='replace')))
+            entry['route'] = route_for(rel_path, entry['exports'])
+        return entry
+
+    def update(self, rel_path: str, content: Optional[bytes] = None, save: bool = True) -> None:
+        """Re-index one project-relative file that was just written (or removed)"""
+        rel_path = normalize_artifact_path(rel_path)
+        if rel_path is None or IGNORED_DIRS.intersection(rel_path.split('/')[:-1]):
+            return
+        with self._lock:
+            try:
+                self.files[rel_path] = self._entry(rel_path, os.stat(os.path.join(self.project_root, rel_path)), content)
+            except FileNotFoundError:
+                self.files.pop(rel_path, None)
+            if save:
+                self.save()
+
+    def refresh(self) -> Dict[str, int]:
+        """Sync with the files on disk, re-parsing only changed files"""
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        with self._lock:
+            seen = set()
+            for root, dirs, names in os.walk(self.project_root):
+                dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+                for name in names:
+                    rel_path = normalize_artifact_path(os.path.relpath(os.path.join(root, name), self.project_root))
+                    try:
+                        stat_result = os.stat(os.path.join(root, name))
+                    except FileNotFoundError:
+                        continue
+                    seen.add(rel_path)
+                    old = self.files.get(rel_path)
+                    if old and (old['size'], old['mtime_ns']) == (stat_result.st_size, stat_result.st_mtime_ns):
+                        counts['unchanged'] += 1
+                        continue
+                    self.files[rel_path] = self._entry(rel_path, stat_result, None)
+                    counts['updated' if old else 'added'] += 1
+            for rel_path in set(self.files) - seen:
+                del self.files[rel_path]
+                counts['removed'] += 1
+            if counts['added'] or counts['updated'] or counts['removed']:
+                self.save()
+            self.refreshed_at = time.monotonic()
+        return counts
+
+    def refresh_if_stale(self, max_age: float = REFRESH_INTERVAL) -> bool:
+        """Refresh unless the last refresh was less than max_age seconds ago; returns whether it ran"""
+        with self._lock:
+            if self.refreshed_at is not None and time.monotonic() - self.refreshed_at < max_age:
+                return False
+            self.refresh()
+            return True
+
+    def resolve_import(self, importer: str, specifier: str) -> str:
+        """Project file an import refers to, or the specifier itself for packages and unresolved paths"""
+        if specifier.startswith('@/'):
+            base = posixpath.join('src', specifier[2:])
+        elif specifier.startswith('.'):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))
+        else:
+            return specifier
+        candidates = [base] + [base + ext for ext in SOURCE_EXTENSIONS] + \
+                     [posixpath.join(base, 'index' + ext) for ext in SOURCE_EXTENSIONS]
+        if specifier.startswith('@/'):
+            # Projects without src/ map "@/*" to the root
+            candidates += [c[len('src/'):] for c in candidates]
+        return next((c for c in candidates if c in self.files), specifier)
+
+    # Queries
+
+    def find_symbol(self, name: str) -> List[Dict[str, Any]]:
+        """Where a symbol (export or component) is defined"""
+        matches = []
+        for rel_path, entry in sorted(self.files.items()):
+            for export in entry.get('exports', ()):
+                if export['name'] == name:
+                    matches.append({'file': rel_path, **export})
+            if name in entry.get('components', ()) and not any(m['file'] == rel_path for m in matches):
+                matches.append({'file': rel_path, 'name': name, 'kind': 'component'})
+        return matches
+
+    def imports_of(self, rel_path: str) -> List[str]:
+        entry = self.files.get(normalize_artifact_path(rel_path) or '', {})
+        return [self.resolve_import(rel_path, spec) for spec in entry.get('imports', ())]
+
+    def importers_of(self, target: str) -> List[str]:
+        """Files importing a project file (path, with or without extension) or a package"""
+        target = (normalize_artifact_path(target) or target).rstrip('/')
+        stems = {target, posixpath.splitext(target)[0], posixpath.join(target, 'index')}
+        importers = []
+        for rel_path, entry in sorted(self.files.items()):
+            for spec in entry.get('imports', ()):
+                resolved = self.resolve_import(rel_path, spec)
+                if spec == target or resolved == target or posixpath.splitext(resolved)[0] in stems:
+                    importers.append(rel_path)
+                    break
+        return importers
+
+    def routes(self) -> List[Dict[str, Any]]:
+        return sorted(
+            ({'file': rel_path, **entry['route']} for rel_path, entry in self.files.items() if entry.get('route')),
+            key=lambda route: (route['path'], route['kind'])
+        )
+
+    def components(self) -> List[Tuple[str, str]]:
+        return sorted((name, rel_path) for rel_path, entry in self.files.items() for name in entry.get('components', ()))
+
+    def list_files(self, pattern: Optional[str] = None) -> List[str]:
+        return sorted(p for p in self.files if not pattern or fnmatch.fnmatch(p, pattern))
+
+    def exists(self, rel_path: str) -> bool:
+        return (normalize_artifact_path(rel_path) or '') in self.files
+
+def index_workspace_writes(workspace_dir: str, writes: Iterable[Tuple[str, Optional[bytes]]]) -> None:
+    """Re-index workspace-relative writes (<project>/...), saving each touched project's index once"""
+    touched: Dict[str, CodeIndex] = {}
+    for relative_path, content in writes:
+        parts = normalize_artifact_path(relative_path)
+        if parts is None or '/' not in parts:
+            continue
+        project, rel_path = parts.split('/', 1)
+        index = CodeIndex.for_project(os.path.join(workspace_dir, project))
+        index.update(rel_path, content, save=False)
+        touched[index.project_root] = index
+    for index in touched.values():
+        index.save()
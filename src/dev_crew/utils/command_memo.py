@@ -0,0 +1,139 @@
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from .disk_cache import DiskCache, get_cache_dir
+
+# Never hashed as command inputs (dependency and build trees)
+IGNORED_DIRS = {'node_modules', '.next', '.git', '.devcrew'}
+
+@dataclass
+class MemoRule:
+    """Default inputs for a well-known idempotent command"""
+    pattern: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...] = ()
+    cache_failures: bool = True
+
+# Commands agents re-issue across tasks; matched against the whole command line
+DEFAULT_RULES = (
+    MemoRule(r'npm (install|i|ci)( --?[\w-]+)*', ('package.json', 'package-lock.json'), ('node_modules',), False),
+    MemoRule(r'npx tsc --noEmit( .*)?', ('package-lock.json', 'tsconfig*.json', 'src/**/*', 'app/**/*', '*.d.ts')),
+    MemoRule(r'npm run (lint|type-check|typecheck)( .*)?',
+             ('package.json', 'package-lock.json', '.eslintrc*', 'eslint.config.*', 'tsconfig*.json', 'src/**/*', 'app/**/*')),
+    MemoRule(r'(npm (run )?test|npx jest)( .*)?',
+             ('package.json', 'package-lock.json', 'jest.config.*', 'tsconfig*.json', 'src/**/*', 'app/**/*', '__tests__/**/*'))
+)
+
+class CommandMemo:
+    """Remembers results of idempotent shell commands keyed on their input files.
+
+    A command is memoized when it declares inputs (files or globs relative to
+    its cwd) or matches a default rule. The key covers the command, cwd, extra
+    env and the content hash of every input file, so a hit means nothing the
+    command reads has changed. Results are stored after the run, hashing the
+    inputs as the command left them (npm install rewrites package-lock.json).
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        ttl = ttl if ttl is not None else float(os.getenv('DEVCREW_SHELL_MEMO_TTL', str(7 * 24 * 3600)))
+        self.cache = DiskCache(path or os.path.join(get_cache_dir('shell'), 'memo.sqlite'), default_ttl=ttl)
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def rule_for(command: str) -> Optional[MemoRule]:
+        for rule in DEFAULT_RULES:
+            if re.fullmatch(rule.pattern, command.strip()):
+                return rule
+        return None
+
+    def plan(self, command: str, inputs: Optional[List[str]] = None) -> Optional[MemoRule]:
+        """The inputs/outputs to memoize a command on, or None if it isn't memoizable"""
+        if inputs:
+            return MemoRule(pattern='', inputs=tuple(inputs))
+        return self.rule_for(command)
+
+    def _file_hash(self, path: str) -> str:
+        """Content hash, reused while size and mtime are unchanged"""
+        stat_result = os.stat(path)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached and cached[:2] == (stat_result.st_size, stat_result.st_mtime_ns):
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        with self._lock:
+            self._hashes[path] = (stat_result.st_size, stat_result.st_mtime_ns, digest.hexdigest())
+        return digest.hexdigest()
+
+    def input_files(self, cwd: str, patterns: Tuple[str, ...]) -> List[str]:
+        files = set()
+        for pattern in patterns:
+            for path in glob.glob(os.path.join(cwd, pattern), recursive=True):
+                rel_path = os.path.relpath(path, cwd)
+                if os.path.isfile(path) and not IGNORED_DIRS.intersection(rel_path.split(os.sep)):
+                    files.add(rel_path)
+        return sorted(files)
+
+    def make_key(self, command: str, cwd: str, env: Dict[str, str], rule: MemoRule) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps([command.strip(), os.path.abspath(cwd), sorted(env.items())]).encode('utf-8'))
+        for rel_path in self.input_files(cwd, rule.inputs):
+            digest.update(f"{rel_path}\0{self._file_hash(os.path.join(cwd, rel_path))}\0".encode('utf-8'))
+        return digest.hexdigest()
+
+    def lookup(self, command: str, cwd: str, env: Dict[str, str], rule: MemoRule) -> Optional[Dict[str, Any]]:
+        """Cached result if the inputs are unchanged and the declared outputs still exist"""
+        if any(not os.path.exists(os.path.join(cwd, output)) for output in rule.outputs):
+            return None
+        return self.cache.get(self.make_key(command, cwd, env, rule))
+
+    def store(self, command: str, cwd: str, env: Dict[str, str], rule: MemoRule,
+              status: str, exit_code: Optional[int], output: str, duration: float) -> bool:
+        """Remember a finished run; timeouts and (for installers) failures are never cached"""
+        if status not in ('ok', 'failed') or (status == 'failed' and not rule.cache_failures):
+            return False
+        self.cache.set(self.make_key(command, cwd, env, rule), {
+            'command': command,
+            'cwd': os.path.abspath(cwd),
+            'status': status,
+            'exit_code': exit_code,
+            'output': output,
+            'duration': duration,
+            'stored_at': time.time()
+        })
+        return True
+
+    def entries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recently used results first"""
+        return [
+            {**value, 'last_used_at': accessed_at}
+            for _, value, _, accessed_at in self.cache.items(limit)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+_memo: Optional[CommandMemo] = None
+_memo_lock = threading.Lock()
+
+def get_command_memo() -> Optional[CommandMemo]:
+    """The process-wide memo, or None unless DEVCREW_SHELL_MEMO is enabled"""
+    global _memo
+    if os.getenv('DEVCREW_SHELL_MEMO', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    with _memo_lock:
+        if _memo is None:
+            _memo = CommandMemo()
+        return _memo
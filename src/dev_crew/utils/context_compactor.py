@@ -0,0 +1,177 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import Counter
+from dataclasses import dataclass
+import math
+import os
+import re
+from .file_cache import READ_CACHE, decode
+from .search_cache import STOPWORDS
+
+# Rough prompt tokens per character of English/markdown text
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_TOKENS = int(os.getenv('DEVCREW_CONTEXT_MAX_TOKENS', '3000'))
+SUMMARY_CHARS = 400
+
+HEADING_PATTERN = re.compile(r'^(#{1,4})\s+(.+?)\s*#*\s*$')
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def terms(text: str) -> List[str]:
+    """Lowercased words without stopwords and plural/verb suffixes, so "components" matches "component" """
+    words = re.findall(r'[a-z0-9]+', re.sub(r"[.'_-]", '', text.lower()))
+    return [re.sub(r'(ing|(?<!s)s)$', '', w) if len(w) > 4 else w for w in words if w not in STOPWORDS]
+
+@dataclass
+class Chunk:
+    """One heading section of a document, spanning 1-based inclusive lines start_line..end_line"""
+    source: str
+    path: Tuple[str, ...]
+    text: str
+    index: int
+    start_line: int = 1
+    end_line: int = 1
+
+    @property
+    def title(self) -> str:
+        return ' > '.join(self.path) or '(preamble)'
+
+    @property
+    def location(self) -> str:
+        return f"{self.source}:L{self.start_line}-L{self.end_line}"
+
+def chunk_markdown(text: str, source: str = '') -> List[Chunk]:
+    """Split a markdown document at headings (levels 1-4), keeping each section's heading path.
+
+    Headings inside fenced code blocks are ignored.
+    """
+    chunks: List[Chunk] = []
+    path: List[Tuple[int, str]] = []
+    lines: List[str] = []
+    first_line = 1
+    in_fence = False
+
+    def flush() -> None:
+        numbered = [n for n, line in enumerate(lines, first_line) if line.strip()]
+        if numbered:
+            body = '\n'.join(lines).strip()
+            chunks.append(Chunk(source, tuple(title for _, title in path), body, len(chunks),
+                                numbered[0], numbered[-1]))
+
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match:
+            flush()
+            lines = [line]
+            first_line = number
+            level = len(match.group(1))
+            path = [(lvl, title) for lvl, title in path if lvl < level] + [(level, match.group(2))]
+        else:
+            lines.append(line)
+    flush()
+    return chunks
+
+def summarize_chunk(text: str, max_chars: int = SUMMARY_CHARS) -> str:
+    """Extractive summary: the heading, then leading sentences and list items up to max_chars"""
+    kept: List[str] = []
+    size = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith(('```', '~~~', '|---', '<!--')):
+            continue
+        if not line.startswith('#') and not re.match(r'^([-*+]|\d+\.)\s', line):
+            # First sentence of a paragraph
+            line = re.split(r'(?<=[.!?])\s', line, maxsplit=1)[0]
+        if size + len(line) > max_chars and kept:
+            kept.append('...')
+            break
+        kept.append(line[:max_chars])
+        size += len(line)
+    return '\n'.join(kept)
+
+class ContextCompactor:
+    """Assemble a token-budgeted context from upstream documents for one task.
+
+    Documents are chunked by heading; every chunk is scored for relevance to
+    the task's focus with BM25. The most relevant chunks are included in
+    full, the rest as extractive summaries while the budget allows, and
+    anything left over is listed by heading. Summaries and omitted sections
+    carry their source line range so the agent can read a specific section
+    when it needs it.
+    """
+
+    def summary(self, chunk: Chunk) -> str:
+        return summarize_chunk(chunk.text)
+
+    @staticmethod
+    def load_chunks(paths: Sequence[str], base_dir: Optional[str] = None) -> Tuple[List[Chunk], List[str]]:
+        chunks, missing = [], []
+        for path in paths:
+            full_path = os.path.join(base_dir, path) if base_dir else path
+            try:
+                text = decode(READ_CACHE.get(full_path))
+            except OSError:
+                missing.append(path)
+                continue
+            chunks.extend(chunk_markdown(text, path))
+        return chunks, missing
+
+    @staticmethod
+    def score(chunks: List[Chunk], focus: str, k1: float = 1.5, b: float = 0.75) -> List[float]:
+        """BM25 of each chunk (heading terms counted twice) against the focus terms"""
+        query = set(terms(focus))
+        if not chunks or not query:
+            return [0.0] * len(chunks)
+        docs = [Counter(terms(' '.join(c.path)) * 2 + terms(c.text)) for c in chunks]
+        lengths = [sum(doc.values()) for doc in docs]
+        average = sum(lengths) / len(lengths) or 1.0
+        document_frequency = Counter(term for doc in docs for term in query if term in doc)
+        scores = []
+        for doc, length in zip(docs, lengths):
+            score = 0.0
+            for term in query:
+                frequency = doc.get(term, 0)
+                if not frequency:
+                    continue
+                idf = math.log(1 + (len(docs) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                score += idf * frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * length / average))
+            scores.append(score)
+        return scores
+
+    def compact(self, paths: Sequence[str], focus: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+                base_dir: Optional[str] = None) -> str:
+        chunks, missing = self.load_chunks(paths, base_dir)
+        scores = self.score(chunks, focus)
+        ranked = sorted(range(len(chunks)), key=lambda i: (-scores[i], chunks[i].source, chunks[i].index))
+
+        remaining = max_tokens
+        rendered: Dict[int, str] = {}
+        for i in ranked:
+            if scores[i] <= 0 and rendered:
+                break
+            full = chunks[i].text
+            if estimate_tokens(full) <= remaining:
+                rendered[i] = full
+            else:
+                summary = self.summary(chunks[i])
+                if estimate_tokens(summary) > remaining:
+                    continue
+                rendered[i] = f"{summary}\n[summary; full section at {chunks[i].location}]"
+            remaining -= estimate_tokens(rendered[i])
+
+        sections = []
+        for source in dict.fromkeys(c.source for c in chunks):
+            body = [rendered[i] for i, c in enumerate(chunks) if c.source == source and i in rendered]
+            omitted = [f"- {c.title} ({c.location})" for i, c in enumerate(chunks)
+                       if c.source == source and i not in rendered]
+            part = [f"## From {source}"] + body
+            if omitted:
+                part.append("Other sections (not included):\n" + '\n'.join(omitted))
+            sections.append('\n\n'.join(part))
+        if missing:
+            sections.append("Not found: " + ', '.join(missing))
+        used = max_tokens - remaining
+        header = f"[Context for: {focus[:200]} | ~{used} of {max_tokens} tokens from {len(paths)} documents]"
+        return '\n\n'.join([header] + sections)
@@ -0,0 +1,141 @@
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+def get_cache_dir(name: str) -> str:
+    """Get (and create) a named cache directory shared by all projects and processes"""
+    root = os.getenv('DEVCREW_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'dev_crew')
+    cache_dir = os.path.join(os.path.abspath(root), name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+class DiskCache:
+    """SQLite-backed JSON key/value cache with TTL, LRU eviction and hit/miss counters.
+
+    Safe to share between threads of one process and between processes using
+    the same file (WAL mode). Counters are persisted so hit rates can be
+    inspected across runs.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, default_ttl: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._bump('misses')
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._bump('hits')
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value; ttl falls back to the cache default"""
+        payload = json.dumps(value)
+        now = time.time()
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now, expires_at)
+            )
+            self._evict(now)
+
+    def items(self, limit: int = 100) -> List[Tuple[str, Any, float, float]]:
+        """(key, value, created_at, accessed_at) of live entries, most recently used first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, created_at, accessed_at FROM entries "
+                "WHERE expires_at IS NULL OR expires_at > ? ORDER BY accessed_at DESC LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+        return [(key, json.loads(value), created_at, accessed_at) for key, value, created_at, accessed_at in rows]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM counters")
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until within bounds"""
+        self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        evicted = 0
+        if self.max_entries is not None and count > self.max_entries:
+            excess = count - self.max_entries
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                (excess,)
+            )
+            evicted += excess
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if self.max_bytes is not None and total > self.max_bytes:
+            for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+        if evicted:
+            self._bump('evictions', evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry counts, size and persisted hit/miss counters"""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        return {
+            'path': self.path,
+            'entries': count,
+            'bytes': total,
+            'hits': hits,
+            'misses': misses,
+            'evictions': counters.get('evictions', 0),
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,168 @@
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from collections import OrderedDict
+from contextlib import contextmanager
+import mmap
+import os
+import re
+import threading
+
+# Bytes of file content kept in memory across reads (shared by all agents in a process)
+READ_CACHE_BYTES = int(os.getenv('DEVCREW_READ_CACHE_MB', '32')) * 1024 * 1024
+# Larger files are never cached whole; they are memory-mapped and only the requested window is copied
+MAX_ENTRY_BYTES = 4 * 1024 * 1024
+# Most bytes returned by one read; larger files come back as head, outline and tail
+READ_MAX_BYTES = int(os.getenv('DEVCREW_READ_MAX_BYTES', str(100 * 1024)))
+OUTLINE_MAX_ENTRIES = 200
+
+# Markdown headings and top-level declarations in the languages the crew generates
+OUTLINE_PATTERN = re.compile(
+    rb'^(#{1,6} .+|(export )?(default )?(async )?(function|class|interface|type|enum|const) \w+.*|(async )?def \w+.*)$',
+    re.MULTILINE
+)
+
+Buffer = Union[bytes, mmap.mmap]
+
+class ReadCache:
+    """LRU of file contents keyed on absolute path, validated by mtime and size on every read"""
+
+    def __init__(self, max_bytes: int = READ_CACHE_BYTES, max_entry_bytes: int = MAX_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.entries: 'OrderedDict[str, Tuple[int, int, bytes]]' = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat_result: Optional[os.stat_result] = None) -> bytes:
+        stat_result = stat_result or os.stat(path)
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[:2] == version:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) <= self.max_entry_bytes:
+            with self._lock:
+                self._discard(path)
+                self.entries[path] = (*version, data)
+                self.size += len(data)
+                while self.size > self.max_bytes:
+                    self._discard(next(iter(self.entries)))
+        return data
+
+    def _discard(self, path: str) -> None:
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.size -= len(entry[2])
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._discard(path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self.entries), 'bytes': self.size, 'hits': self.hits, 'misses': self.misses}
+
+READ_CACHE = ReadCache()
+
+@contextmanager
+def open_buffer(path: str) -> Iterator[Buffer]:
+    """Cached bytes for small files, a read-only memory map for large ones"""
+    stat_result = os.stat(path)
+    if stat_result.st_size <= READ_CACHE.max_entry_bytes:
+        yield READ_CACHE.get(path, stat_result)
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+def count_lines(buffer: Buffer, start: int = 0, end: Optional[int] = None) -> int:
+    end = len(buffer) if end is None else end
+    if isinstance(buffer, bytes):
+        return buffer.count(b'\n', start, end)
+    count = 0
+    for offset in range(start, end, 1024 * 1024):
+        count += buffer[offset:min(offset + 1024 * 1024, end)].count(b'\n')
+    return count
+
+def line_span(buffer: Buffer, start_line: int, end_line: Optional[int] = None) -> Tuple[int, int]:
+    """Byte offsets of 1-based, inclusive lines start_line..end_line"""
+    position, line = 0, 1
+    while line < start_line:
+        newline = buffer.find(b'\n', position)
+        if newline == -1:
+            return len(buffer), len(buffer)
+        position, line = newline + 1, line + 1
+    begin = position
+    if end_line is None:
+        return begin, len(buffer)
+    while line <= end_line:
+        newline = buffer.find(b'\n', position)
+        if newline == -1:
+            return begin, len(buffer)
+        position, line = newline + 1, line + 1
+    return begin, position
+
+def outline(buffer: Buffer, limit: int = OUTLINE_MAX_ENTRIES) -> List[Tuple[int, str]]:
+    """(line number, text) of headings and top-level declarations"""
+    entries, line, position = [], 1, 0
+    for match in OUTLINE_PATTERN.finditer(buffer):
+        line += count_lines(buffer, position, match.start())
+        position = match.start()
+        entries.append((line, decode(match.group(0)).strip()[:160]))
+        if len(entries) >= limit:
+            break
+    return entries
+
+def decode(data: bytes) -> str:
+    return data.decode('utf-8', errors='replace').replace('\r\n', '\n')
+
+def summarize(buffer: Buffer, max_bytes: int = READ_MAX_BYTES) -> str:
+    """Head, outline and tail of a file too large to return whole"""
+    head_end = buffer.rfind(b'\n', 0, max_bytes // 2) + 1 or max_bytes // 2
+    tail_start = buffer.find(b'\n', len(buffer) - max_bytes // 4) + 1 or len(buffer) - max_bytes // 4
+    total_lines = count_lines(buffer) + (0 if buffer[-1:] == b'\n' else 1)
+    head_lines = count_lines(buffer, 0, head_end)
+    tail_first_line = count_lines(buffer, 0, tail_start) + 1
+    sections = [
+        f"[File is {len(buffer)} bytes / {total_lines} lines, over the {max_bytes} byte read limit. "
+        f"Showing lines 1-{head_lines}, an outline and lines {tail_first_line}-{total_lines}; "
+        f"pass start_line/end_line to read a specific part.]",
+        decode(buffer[:head_end]),
+    ]
+    entries = outline(buffer)
+    if entries:
+        sections.append("[Outline]\n" + "\n".join(f"{line}: {text}" for line, text in entries))
+    sections.append(f"[Lines {tail_first_line}-{total_lines}]\n" + decode(buffer[tail_start:]))
+    return "\n".join(sections)
+
+def read_window(path: str, start_line: Optional[int] = None, end_line: Optional[int] = None,
+                offset: Optional[int] = None, length: Optional[int] = None,
+                max_bytes: int = READ_MAX_BYTES) -> str:
+    """Read a whole file, a line range or a byte range, capped at max_bytes"""
+    with open_buffer(path) as buffer:
+        if start_line is None and end_line is None and offset is None and length is None:
+            if len(buffer) > max_bytes:
+                return summarize(buffer, max_bytes)
+            return decode(buffer[:])
+
+        if start_line is not None or end_line is not None:
+            begin, end = line_span(buffer, max(start_line or 1, 1), end_line)
+        else:
+            begin = min(max(offset or 0, 0), len(buffer))
+            end = len(buffer) if length is None else min(begin + max(length, 0), len(buffer))
+
+        if end - begin <= max_bytes:
+            return decode(buffer[begin:end])
+        cut = buffer.rfind(b'\n', begin, begin + max_bytes) + 1 or begin + max_bytes
+        if start_line is not None or end_line is not None:
+            next_line = max(start_line or 1, 1) + count_lines(buffer, begin, cut)
+            note = f"continue with start_line={next_line}"
+        else:
+            note = f"continue with offset={cut}"
+        return decode(buffer[begin:cut]) + f"\n[Truncated at the {max_bytes} byte read limit; {note}]"
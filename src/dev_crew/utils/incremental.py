@@ -0,0 +1,147 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+from .manifest import IGNORED_DIRS
+
+class ArtifactHasher:
+    """Content digests of files and directory trees, reusing file hashes while size and mtime match"""
+
+    def __init__(self):
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def file_digest(self, path: str) -> str:
+        stat_result = os.stat(path)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached and cached[:2] == (stat_result.st_size, stat_result.st_mtime_ns):
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        with self._lock:
+            self._hashes[path] = (stat_result.st_size, stat_result.st_mtime_ns, digest.hexdigest())
+        return digest.hexdigest()
+
+    def digest(self, path: str) -> Optional[str]:
+        """sha256 of a file, or of every (relative path, file hash) under a directory; None if missing"""
+        if os.path.isfile(path):
+            return self.file_digest(path)
+        if not os.path.isdir(path):
+            return None
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                rel_path = os.path.relpath(file_path, path).replace(os.sep, '/')
+                digest.update(f"{rel_path}\0{self.file_digest(file_path)}\0".encode('utf-8'))
+        return digest.hexdigest()
+
+class BuildState:
+    """Make-style record of each task's last successful run, for incremental re-execution.
+
+    A task's fingerprint covers its prompt (description, which embeds the
+    requirements where a task uses them, expected output and agent role) and
+    the content of every artifact it reads. Artifacts a task also writes
+    (implement_requirements reads and extends src/) are taken from the digest
+    the upstream writer recorded, so the task's own edits don't make it stale
+    but an upstream re-run does. A task is up to date when its fingerprint
+    matches the recorded one and its outputs still exist; tasks downstream of
+    a re-run are checked again when they start, so they only re-run if the
+    artifacts they read actually changed.
+
+    Stored in <project>/.devcrew/build_state.json.
+    """
+
+    def __init__(self, project_root: str, workspace_dir: str):
+        self.project_root = os.path.abspath(project_root)
+        self.workspace_dir = os.path.abspath(workspace_dir)
+        self.path = os.path.join(self.project_root, '.devcrew', 'build_state.json')
+        self.hasher = ArtifactHasher()
+        self.graph: Dict[str, Tuple[List[str], List[str]]] = {}
+        self.writers: Dict[str, Dict[str, Optional[str]]] = {}
+        self._lock = threading.RLock()
+        self.tasks: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get('tasks', {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': 1, 'tasks': self.tasks}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def set_graph(self, graph: Iterable[Tuple[str, List[str], List[str]]]) -> None:
+        """Declare (task name, inputs, outputs) in pipeline order, with workspace-relative artifact paths"""
+        self.graph = {}
+        self.writers = {}
+        last_writer: Dict[str, str] = {}
+        for name, inputs, outputs in graph:
+            self.graph[name] = (list(inputs), list(outputs))
+            # Which earlier task produced each artifact this task both reads and writes
+            self.writers[name] = {
+                artifact: last_writer.get(artifact) for artifact in inputs if artifact in outputs
+            }
+            for artifact in outputs:
+                last_writer[artifact] = name
+
+    def _artifact_digest(self, artifact: str) -> Optional[str]:
+        return self.hasher.digest(os.path.join(self.workspace_dir, artifact))
+
+    def fingerprint(self, task: Any) -> str:
+        inputs, outputs = self.graph.get(task.name, ([], []))
+        role = getattr(getattr(task, 'agent', None), 'role', None)
+        parts: List[Any] = [task.name, task.description, task.expected_output, role]
+        for artifact in inputs:
+            if artifact in outputs:
+                writer = self.writers.get(task.name, {}).get(artifact)
+                recorded = self.tasks.get(writer, {}).get('outputs', {}) if writer else {}
+                parts.append([artifact, 'upstream', recorded.get(artifact)])
+            else:
+                parts.append([artifact, self._artifact_digest(artifact)])
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def up_to_date_reason(self, task: Any) -> Optional[str]:
+        """skip_if hook: reason to reuse the previous result, or None if the task must run"""
+        with self._lock:
+            record = self.tasks.get(task.name)
+            if record is None or task.name not in self.graph:
+                return None
+            outputs = self.graph[task.name][1]
+            if any(not os.path.exists(os.path.join(self.workspace_dir, artifact)) for artifact in outputs):
+                return None
+            if record.get('fingerprint') != self.fingerprint(task):
+                return None
+        reused = ', '.join(outputs) or 'previous result'
+        finished = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.get('finished_at', 0)))
+        return f"Up to date: inputs unchanged since {finished}; reusing {reused}"
+
+    def task_finished(self, task: Any, output: Any = None) -> None:
+        """on_finished hook: remember the fingerprint and output digests of a task that ran"""
+        if task.name not in self.graph:
+            return
+        with self._lock:
+            self.tasks[task.name] = {
+                'fingerprint': self.fingerprint(task),
+                'outputs': {artifact: self._artifact_digest(artifact) for artifact in self.graph[task.name][1]},
+                'finished_at': time.time()
+            }
+            self.save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.tasks = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
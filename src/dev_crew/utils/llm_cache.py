@@ -0,0 +1,179 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import random
+import time
+from crewai import LLM
+from litellm import exceptions as litellm_errors
+from litellm.integrations.custom_logger import CustomLogger
+from .disk_cache import DiskCache, get_cache_dir
+from .metrics import LLM_REQUEST_DURATION, LLM_RETRIES, LLM_TOKENS, observe
+
+# Retries of one LLM request after a transient error (rate limit, 5xx, timeout), with exponential backoff
+LLM_MAX_RETRIES = max(0, int(os.getenv('DEVCREW_LLM_RETRIES', '4')))
+LLM_RETRY_BASE_DELAY = float(os.getenv('DEVCREW_LLM_RETRY_DELAY', '2'))
+LLM_RETRY_MAX_DELAY = 60.0
+
+TRANSIENT_ERRORS = (
+    litellm_errors.RateLimitError,
+    litellm_errors.APIConnectionError,
+    litellm_errors.ServiceUnavailableError,
+    litellm_errors.InternalServerError,
+    litellm_errors.Timeout
+)
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+def is_transient(error: Exception) -> bool:
+    """Whether retrying the same request may succeed"""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    return getattr(error, 'status_code', None) in TRANSIENT_STATUS_CODES
+
+def _normalize_content(content: Any) -> Any:
+    """Normalize line endings and trailing whitespace so cosmetic diffs still hit.
+
+    Leading whitespace is kept: prompts that differ in code indentation are different prompts.
+    """
+    if isinstance(content, str):
+        lines = content.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        return '\n'.join(line.rstrip() for line in lines).rstrip()
+    return content
+
+class LLMResponseCache:
+    """Content-addressed store of completions keyed on model, messages and tool schema"""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        self.cache = DiskCache(
+            path or os.path.join(get_cache_dir('llm'), 'responses.sqlite'),
+            max_bytes=max_bytes,
+            default_ttl=ttl
+        )
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], tools: Optional[List[dict]] = None,
+                 params: Optional[Dict[str, Any]] = None) -> str:
+        """Hash the request fields that determine the completion"""
+        normalized = [
+            {k: _normalize_content(v) for k, v in sorted(message.items())}
+            for message in messages
+        ]
+        payload = json.dumps(
+            {'model': model, 'messages': normalized, 'tools': tools or [], 'params': params or {}},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    def set(self, key: str, response: str) -> None:
+        self.cache.set(key, response)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+class _UsageProbe(CustomLogger):
+    """Captures the usage of one completion (crewAI and litellm may both report it)"""
+
+    def __init__(self):
+        super().__init__()
+        self.usage = None
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        usage = response_obj.get('usage') if isinstance(response_obj, dict) else getattr(response_obj, 'usage', None)
+        if usage:
+            self.usage = usage
+
+class InstrumentedLLM(LLM):
+    """LLM that records completion latency and token usage metrics.
+
+    Copies made with usage.bind_llm also charge a project's UsageLedger and
+    stop calling the model once its budget is exceeded.
+    """
+    usage_ledger = None
+    agent_role = None
+
+    def call(self, messages: List[Dict[str, str]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None,
+             available_functions: Optional[Dict[str, Any]] = None) -> str:
+        """Complete, retrying transient provider errors so one 502 doesn't fail the task"""
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                return self._call_once(messages, tools, callbacks, available_functions)
+            except Exception as e:
+                if attempt >= LLM_MAX_RETRIES or not is_transient(e):
+                    raise
+                delay = min(LLM_RETRY_BASE_DELAY * 2 ** attempt, LLM_RETRY_MAX_DELAY) * random.uniform(0.8, 1.2)
+                observe(LLM_RETRIES.name, 1, model=self.model, error=type(e).__name__)
+                print(f"Transient LLM error ({type(e).__name__}: {str(e)[:200]}); "
+                      f"retry {attempt + 1}/{LLM_MAX_RETRIES} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _call_once(self, messages: List[Dict[str, str]], tools: Optional[List[dict]] = None,
+                   callbacks: Optional[List[Any]] = None,
+                   available_functions: Optional[Dict[str, Any]] = None) -> str:
+        if self.usage_ledger is not None:
+            self.usage_ledger.check()
+        probe = _UsageProbe()
+        start = time.perf_counter()
+        try:
+            return super().call(messages, tools, [*(callbacks or []), probe], available_functions)
+        finally:
+            observe(LLM_REQUEST_DURATION.name, time.perf_counter() - start, model=self.model)
+            if probe.usage:
+                prompt_tokens = getattr(probe.usage, 'prompt_tokens', 0) or 0
+                completion_tokens = getattr(probe.usage, 'completion_tokens', 0) or 0
+                observe(LLM_TOKENS.name, prompt_tokens, model=self.model, kind='prompt')
+                observe(LLM_TOKENS.name, completion_tokens, model=self.model, kind='completion')
+                if self.usage_ledger is not None:
+                    self.usage_ledger.record(self.model, prompt_tokens, completion_tokens, agent=self.agent_role)
+
+class CachedLLM(InstrumentedLLM):
+    """LLM that serves repeated completions from an LLMResponseCache.
+
+    Calls that may execute tools (available_functions) bypass the cache, since
+    replaying them would skip the tool's side effects.
+    """
+
+    def __init__(self, *args, response_cache: Optional[LLMResponseCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache or LLMResponseCache()
+
+    def _cache_params(self) -> Dict[str, Any]:
+        """Sampling parameters that change the completion for identical messages"""
+        return {
+            'temperature': self.temperature,
+            'top_p': self.top_p,
+            'stop': self.stop,
+            'max_tokens': self.max_tokens or self.max_completion_tokens,
+            'response_format': self.response_format,
+            'seed': self.seed
+        }
+
+    def call(self, messages: List[Dict[str, str]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None,
+             available_functions: Optional[Dict[str, Any]] = None) -> str:
+        if available_functions:
+            return super().call(messages, tools, callbacks, available_functions)
+
+        key = self.response_cache.make_key(self.model, messages, tools, self._cache_params())
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = super().call(messages, tools, callbacks, available_functions)
+        if isinstance(response, str) and response:
+            self.response_cache.set(key, response)
+        return response
+
+def create_llm(**kwargs) -> LLM:
+    """Create the shared (instrumented) LLM, wrapped in the response cache when DEVCREW_LLM_CACHE is enabled"""
+    if os.getenv('DEVCREW_LLM_CACHE', '').lower() not in ('1', 'true', 'yes'):
+        return InstrumentedLLM(**kwargs)
+
+    ttl = float(os.getenv('DEVCREW_LLM_CACHE_TTL', str(7 * 24 * 3600)))
+    max_bytes = int(float(os.getenv('DEVCREW_LLM_CACHE_MAX_MB', '512')) * 1024 * 1024)
+    return CachedLLM(response_cache=LLMResponseCache(ttl=ttl, max_bytes=max_bytes), **kwargs)
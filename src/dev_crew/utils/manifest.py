@@ -0,0 +1,231 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import posixpath
+import threading
+import time
+
+# Directories never indexed (dependencies, build output, VCS, our own state)
+IGNORED_DIRS = {'node_modules', '.next', '.git', '__pycache__', '.vscode', '.devcrew'}
+# Minimum seconds between saves triggered by record(); flush() writes whatever is left
+SAVE_INTERVAL = float(os.getenv('DEVCREW_MANIFEST_SAVE_INTERVAL', '2'))
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def normalize_artifact_path(path: str) -> Optional[str]:
+    """Project-relative posix path, or None if it points outside the project"""
+    path = posixpath.normpath(path.replace(os.sep, '/').lstrip('/'))
+    if path == '.' or path == '..' or path.startswith('../'):
+        return None
+    return path
+
+def doc_type_for(path: str) -> Optional[str]:
+    """Docs are typed by their directory (docs/architecture/x.md -> architecture)"""
+    if not path.startswith('docs/'):
+        return None
+    return posixpath.basename(posixpath.dirname(path))
+
+class ArtifactManifest:
+    """Index of a project's generated files, kept up to date as they are written.
+
+    Entries map a project-relative path to its size, mtime, sha256 and doc
+    type. The manifest is saved atomically to <project>/.devcrew/manifest.json,
+    so other processes (the API) can read it without walking the project
+    tree. Writing the whole file per recorded file would be quadratic over a
+    run, so record() saves at most every SAVE_INTERVAL seconds and the crew
+    calls flush() when a task finishes. Files created outside the file tools
+    (shell commands, scaffolding) are picked up by rebuild().
+    """
+
+    _instances: Dict[str, 'ArtifactManifest'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, project_root: str):
+        self.project_root = os.path.abspath(project_root)
+        self.path = os.path.join(self.project_root, '.devcrew', 'manifest.json')
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.updated_at: Optional[float] = None
+        self._loaded_mtime: Optional[int] = None
+        # Entries recorded since the last save, kept across reloads of the file
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._saved_at = 0.0
+        self._lock = threading.RLock()
+        self.refresh()
+
+    @classmethod
+    def for_project(cls, project_root: str) -> 'ArtifactManifest':
+        """Shared instance per project, so concurrent writers in a process agree"""
+        key = os.path.abspath(project_root)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(key)
+            return cls._instances[key]
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def refresh(self) -> None:
+        """Reload from disk if another process saved a newer manifest"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        with self._lock:
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return
+            self.entries = {**data.get('entries', {}), **self._pending}
+            self.updated_at = data.get('updated_at')
+            self._loaded_mtime = mtime
+
+    def save(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.updated_at = time.time()
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': 1, 'updated_at': self.updated_at, 'entries': self.entries}, f)
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = os.stat(self.path).st_mtime_ns
+            self._pending.clear()
+            self._saved_at = time.monotonic()
+
+    def save_if_due(self) -> None:
+        """Save pending entries unless the manifest was saved less than SAVE_INTERVAL ago"""
+        with self._lock:
+            if self._pending and time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+                self.save()
+
+    def flush(self) -> None:
+        """Save entries recorded since the last save"""
+        with self._lock:
+            if self._pending:
+                self.save()
+
+    def _entry(self, rel_path: str, stat_result: os.stat_result, sha256: str) -> Dict[str, Any]:
+        return {
+            'path': rel_path,
+            'size': stat_result.st_size,
+            'mtime': stat_result.st_mtime,
+            'sha256': sha256,
+            'doc_type': doc_type_for(rel_path)
+        }
+
+    def record(self, path: str, content: Optional[bytes] = None, save: bool = True) -> Optional[Dict[str, Any]]:
+        """Index a file that was just written (absolute or project-relative path).
+
+        Pass the written content to avoid reading the file back for the hash.
+        With save, the manifest is saved if SAVE_INTERVAL has passed since the
+        last save; otherwise the entry waits for flush().
+        """
+        abs_path = path if os.path.isabs(path) else os.path.join(self.project_root, path)
+        rel_path = normalize_artifact_path(os.path.relpath(abs_path, self.project_root))
+        if rel_path is None or IGNORED_DIRS.intersection(rel_path.split('/')[:-1]):
+            return None
+        stat_result = os.stat(abs_path)
+        sha256 = hashlib.sha256(content).hexdigest() if content is not None else hash_file(abs_path)
+        with self._lock:
+            self.refresh()
+            entry = self.entries[rel_path] = self._pending[rel_path] = self._entry(rel_path, stat_result, sha256)
+            if save:
+                self.save_if_due()
+        return entry
+
+    def remove(self, rel_path: str) -> None:
+        with self._lock:
+            self._pending.pop(rel_path, None)
+            if self.entries.pop(rel_path, None) is not None:
+                self.save()
+
+    def get(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        rel_path = normalize_artifact_path(rel_path)
+        if rel_path is None:
+            return None
+        self.refresh()
+        return self.entries.get(rel_path)
+
+    def absolute_path(self, entry: Dict[str, Any]) -> str:
+        return os.path.join(self.project_root, entry['path'])
+
+    def docs(self, extension: str = '.md') -> List[Dict[str, Any]]:
+        self.refresh()
+        return sorted(
+            (entry for entry in self.entries.values()
+             if entry['doc_type'] is not None and entry['path'].endswith(extension)),
+            key=lambda entry: entry['path']
+        )
+
+    def rebuild(self) -> Dict[str, int]:
+        """Re-sync with the files on disk; unchanged files (same size and mtime) aren't re-hashed"""
+        with self._lock:
+            self.refresh()
+            previous = self.entries
+            entries = {}
+            counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+            for root, dirs, files in os.walk(self.project_root):
+                dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+                for name in files:
+                    abs_path = os.path.join(root, name)
+                    rel_path = normalize_artifact_path(os.path.relpath(abs_path, self.project_root))
+                    try:
+                        stat_result = os.stat(abs_path)
+                    except FileNotFoundError:
+                        continue
+                    old = previous.get(rel_path)
+                    if old and old['size'] == stat_result.st_size and old['mtime'] == stat_result.st_mtime:
+                        entries[rel_path] = old
+                        counts['unchanged'] += 1
+                        continue
+                    entries[rel_path] = self._entry(rel_path, stat_result, hash_file(abs_path))
+                    counts['updated' if old else 'added'] += 1
+            counts['removed'] = len(set(previous) - set(entries))
+            self.entries = entries
+            self.save()
+        return counts
+
+    def tree(self) -> List[str]:
+        """Indented listing of the indexed files, grouped by directory"""
+        lines = [f"{os.path.basename(self.project_root)}/"]
+        printed = set()
+        for rel_path in sorted(self.entries, key=lambda p: (p.split('/')[:-1], p)):
+            parts = rel_path.split('/')
+            for depth in range(1, len(parts)):
+                directory = '/'.join(parts[:depth])
+                if directory not in printed:
+                    printed.add(directory)
+                    lines.append(f"{'    ' * depth}{parts[depth - 1]}/")
+            lines.append(f"{'    ' * len(parts)}{parts[-1]}")
+        return lines
+
+def record_workspace_write(workspace_dir: str, relative_path: str, content: Optional[bytes] = None) -> None:
+    """Index a workspace-relative write (<project>/...) in that project's manifest"""
+    parts = normalize_artifact_path(relative_path)
+    if parts is None or '/' not in parts:
+        return
+    project, rel_path = parts.split('/', 1)
+    ArtifactManifest.for_project(os.path.join(workspace_dir, project)).record(rel_path, content)
+
+def record_workspace_writes(workspace_dir: str, writes: Iterable[Tuple[str, Optional[bytes]]]) -> None:
+    """Index many workspace-relative writes, saving each touched project's manifest at most once"""
+    touched: Dict[str, ArtifactManifest] = {}
+    for relative_path, content in writes:
+        parts = normalize_artifact_path(relative_path)
+        if parts is None or '/' not in parts:
+            continue
+        project, rel_path = parts.split('/', 1)
+        manifest = ArtifactManifest.for_project(os.path.join(workspace_dir, project))
+        if manifest.record(rel_path, content, save=False) is not None:
+            touched[manifest.project_root] = manifest
+    for manifest in touched.values():
+        manifest.save_if_due()
@@ -0,0 +1,224 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import functools
+import math
+import threading
+import time
+
+# Latency buckets in seconds, from fast tool calls to whole pipeline phases
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Metric(ABC):
+    """A named metric with a fixed set of label names"""
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    @abstractmethod
+    def record(self, value: float, **labels) -> None:
+        """Record one observation for the given labels"""
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every label set"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return '\n'.join(lines + self.samples())
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    record = inc
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    record = set
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][index] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    record = observe
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, {**state, 'counts': list(state['counts'])}) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+class MetricsRegistry:
+    """Dependency-free metrics registry rendered in the Prometheus text format.
+
+    Collectors are called before each render to refresh gauges that are
+    cheaper to read on scrape than to keep up to date (queue depth, caches).
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self.collectors.append(collector)
+
+    def record(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        metric = self.metrics.get(name)
+        if metric is not None:
+            metric.record(value, **(labels or {}))
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            collector()
+        return '\n'.join(metric.render() for metric in self.metrics.values()) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+TASK_DURATION = REGISTRY.histogram(
+    'devcrew_task_duration_seconds', 'Pipeline task execution time', ['task', 'agent']
+)
+LLM_REQUEST_DURATION = REGISTRY.histogram(
+    'devcrew_llm_request_duration_seconds', 'LLM completion latency (cache misses only)', ['model']
+)
+LLM_TOKENS = REGISTRY.counter(
+    'devcrew_llm_tokens_total', 'LLM tokens used', ['model', 'kind']
+)
+LLM_RETRIES = REGISTRY.counter(
+    'devcrew_llm_retries_total', 'LLM requests retried after a transient error', ['model', 'error']
+)
+TOOL_DURATION = REGISTRY.histogram(
+    'devcrew_tool_duration_seconds', 'Tool call execution time', ['tool']
+)
+PROJECTS = REGISTRY.counter(
+    'devcrew_projects_total', 'Projects that reached a final status', ['status']
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    'devcrew_queue_depth', 'Projects waiting for a worker slot'
+)
+ACTIVE_CREWS = REGISTRY.gauge(
+    'devcrew_active_crews', 'Crews currently running'
+)
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    'devcrew_cache_hit_ratio', 'Lifetime hit ratio of the shared on-disk caches', ['cache']
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    'devcrew_cache_entries', 'Entries in the shared on-disk caches', ['cache']
+)
+
+# Crew worker processes forward observations to the API process instead of recording them
+_forwarder: Optional[Callable[[Dict[str, Any]], None]] = None
+
+def set_forwarder(forwarder: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+    global _forwarder
+    _forwarder = forwarder
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record a value for a registered metric, here or in the process that serves /metrics"""
+    if _forwarder is not None:
+        _forwarder({'type': 'metric', 'metric': name, 'value': value, 'labels': labels})
+    else:
+        REGISTRY.record(name, value, labels)
+
+@contextmanager
+def timed(name: str, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def timed_tool(cls):
+    """Class decorator recording every _run call of a tool in devcrew_tool_duration_seconds"""
+    run = cls._run
+
+    @functools.wraps(run)
+    def _run(self, *args, **kwargs):
+        with timed(TOOL_DURATION.name, tool=self.name):
+            return run(self, *args, **kwargs)
+
+    cls._run = _run
+    return cls
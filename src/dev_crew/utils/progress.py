@@ -0,0 +1,163 @@
+from typing import Any, Callable, Dict, List, Optional
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+import threading
+import time
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+from pydantic import Field
+from .metrics import TASK_DURATION, observe
+from .usage import task_scope
+
+class TrackedTask(Task):
+    """Task that reports when it actually starts executing and when its output file is saved.
+
+    crewAI only calls back when a task finishes (and before output_file is
+    written); with concurrent tasks the start can't be inferred from the
+    previous task's completion. skip_if lets the crew skip a task without
+    involving the LLM, prepare_context adds material assembled at run time
+    (such as compacted upstream documents) to the agent's context, and gate
+    holds an asynchronously started task back until its dependencies have
+    finished.
+    """
+    on_start: Optional[Any] = Field(
+        default=None,
+        description="Called with the task right before it executes",
+        exclude=True
+    )
+
+    on_saved: Optional[Any] = Field(
+        default=None,
+        description="Called with the absolute path after output_file is written",
+        exclude=True
+    )
+
+    skip_if: Optional[Any] = Field(
+        default=None,
+        description="Called with the task before it runs; returned text skips the task and becomes its output",
+        exclude=True
+    )
+
+    prepare_context: Optional[Any] = Field(
+        default=None,
+        description="Called with the task right before the agent runs; returned text is prepended to its context",
+        exclude=True
+    )
+
+    on_finished: Optional[Any] = Field(
+        default=None,
+        description="Called with the task and its output after it ran (not when skipped)",
+        exclude=True
+    )
+
+    gate: Optional[Any] = Field(
+        default=None,
+        description="DependencyGate the task waits on before it executes",
+        exclude=True
+    )
+
+    def _execute_core(self, agent, context, tools):
+        with self.gate.slot(self.name) if self.gate else nullcontext():
+            if self.on_start:
+                self.on_start(self, agent)
+            reason = self.skip_if(self) if self.skip_if else None
+            if reason:
+                return self._skip(agent, reason)
+            extra = self.prepare_context(self) if self.prepare_context else None
+            if extra:
+                context = f"{extra}\n\n{context}" if context else extra
+            with task_scope(self.name):
+                output = super()._execute_core(agent, context, tools)
+            if self.on_finished:
+                self.on_finished(self, output)
+            return output
+
+    def _execute_task_async(self, agent, context, tools, future) -> None:
+        # crewAI leaves the future unresolved when an async task raises, which hangs the crew at the join
+        try:
+            future.set_result(self._execute_core(agent, context, tools))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _skip(self, agent, reason: str) -> TaskOutput:
+        """Finish without calling the agent; the output file is left untouched"""
+        self.agent = agent or self.agent
+        self.start_time = self.end_time = datetime.now()
+        self.output = TaskOutput(
+            name=self.name,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=reason,
+            agent=self.agent.role,
+            output_format=self._get_output_format()
+        )
+        if self.callback:
+            self.callback(self.output)
+        return self.output
+
+    def _save_file(self, result: Any) -> None:
+        super()._save_file(result)
+        if self.on_saved:
+            self.on_saved(str(Path(self.output_file).expanduser().resolve()))
+
+class ProgressReporter:
+    """Turn crew task and step callbacks into progress events for an event sink"""
+
+    def __init__(self, sink: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.sink = sink
+        self.tasks: List[str] = []
+        self.completed: List[str] = []
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event_type: str, **data) -> None:
+        if self.sink:
+            self.sink({'type': event_type, 'timestamp': time.time(), **data})
+
+    def set_tasks(self, task_names: List[str]) -> None:
+        self.tasks = list(task_names)
+
+    def run_started(self) -> None:
+        self.emit('run_started', tasks=self.tasks, total_tasks=len(self.tasks))
+
+    def task_started(self, task: Task, agent: Any = None) -> None:
+        with self._lock:
+            self._started[task.name] = time.time()
+        role = getattr(agent or task.agent, 'role', None)
+        self.emit('task_started', task=task.name, agent=role)
+
+    def task_finished(self, output: Any) -> None:
+        """crewAI task_callback: receives the TaskOutput"""
+        name = getattr(output, 'name', None)
+        with self._lock:
+            started = self._started.pop(name, None)
+            self.completed.append(name)
+            completed = len(self.completed)
+        total = len(self.tasks) or completed
+        duration = round(time.time() - started, 3) if started else None
+        agent = getattr(output, 'agent', None)
+        if duration is not None:
+            observe(TASK_DURATION.name, duration, task=name, agent=agent)
+        self.emit(
+            'task_finished',
+            task=name,
+            agent=agent,
+            duration=duration,
+            completed=completed,
+            total=total,
+            progress=round(100 * completed / total, 1)
+        )
+
+    def step_callback_for(self, role: str) -> Callable[[Any], None]:
+        """Per-agent step_callback, so steps of concurrent tasks are attributed correctly"""
+        def on_step(step: Any) -> None:
+            tool = getattr(step, 'tool', None)
+            if tool:
+                self.emit(
+                    'tool',
+                    agent=role,
+                    tool=tool,
+                    input=str(getattr(step, 'tool_input', ''))[:200]
+                )
+        return on_step
@@ -0,0 +1,298 @@
+from typing import Any, Dict, List, Optional, Sequence
+from dataclasses import asdict, dataclass, field
+import json
+import os
+import re
+import time
+from .code_index import CodeIndex
+from .context_compactor import chunk_markdown
+from .manifest import IGNORED_DIRS
+
+PASS, FAIL, INCONCLUSIVE = 'pass', 'fail', 'inconclusive'
+
+# Each requirement is satisfied by any one of the listed paths (Next.js, ESLint and Tailwind versions differ)
+CONFIG_FILES = {
+    'package.json': ('package.json',),
+    'tsconfig': ('tsconfig.json',),
+    'Next.js config': ('next.config.js', 'next.config.mjs', 'next.config.ts'),
+    'ESLint config': ('.eslintrc.json', '.eslintrc.js', '.eslintrc.cjs', 'eslint.config.mjs', 'eslint.config.js'),
+    'PostCSS/Tailwind config': ('postcss.config.js', 'postcss.config.mjs', 'tailwind.config.js', 'tailwind.config.ts'),
+    'app directory': ('src/app', 'app')
+}
+REQUIRED_DEPENDENCIES = ('next', 'react', 'react-dom')
+REQUIRED_DEV_DEPENDENCIES = ('typescript',)
+JEST_CONFIG_FILES = ('jest.config.js', 'jest.config.ts', 'jest.config.mjs', 'jest.config.cjs')
+TEST_DEPENDENCIES = ('jest', '@testing-library/react')
+PROJECT_DOCS = {
+    'project plan': 'docs/requirements/project_plan.md',
+    'architecture': 'docs/architecture/architecture.md',
+    'technical design': 'docs/technical_design/technical_design.md',
+    'implementation summary': 'docs/implementation/implementation_summary.md',
+    'test results': 'docs/testing/test_results.md'
+}
+TEST_FILE_PATTERN = re.compile(r'(\.(test|spec)\.[jt]sx?$)|(^|/)__tests__/')
+PRETTIER_CONFIG_FILES = ('.prettierrc', '.prettierrc.json', '.prettierrc.js', '.prettierrc.cjs', '.prettierrc.mjs',
+                         '.prettierrc.yaml', '.prettierrc.yml', 'prettier.config.js', 'prettier.config.mjs',
+                         'prettier.config.cjs')
+COVERAGE_SETTINGS = re.compile(r'\b(coverageThreshold|collectCoverageFrom|collectCoverage)\b|--coverage\b')
+# Each document needs a heading matching every pattern (from the sections its task asks for)
+REQUIRED_SECTIONS = {
+    'project plan': (r'task|breakdown|milestone|phase', r'estimat|timeline|schedule'),
+    'architecture': (r'overview', r'technology|tech stack', r'component', r'data flow',
+                     r'non-functional|security|scalab', r'infrastructure|deployment'),
+    'technical design': (r'component', r'standard|convention', r'requirement|setup|configuration'),
+    'test results': (r'unit', r'integration', r'e2e|end-to-end', r'coverage')
+}
+DIAGRAM_PATTERN = re.compile(r'^\s*(```|~~~)\s*(mermaid|plantuml)\b|!\[[^\]]*\]\([^)]+\)', re.MULTILINE | re.IGNORECASE)
+DESIGN_COMPONENT = re.compile(r'`<?([A-Z][A-Za-z0-9]+)\s*/?>?`|<([A-Z][A-Za-z0-9]+)[\s/>]')
+DESIGN_PATH = re.compile(r'`((?:src/)?(?:app|components|lib|utils|hooks)/[\w./\[\]()@-]+\.[jt]sx?)`')
+
+@dataclass
+class CheckResult:
+    name: str
+    status: str
+    detail: str = ''
+
+@dataclass
+class ValidationReport:
+    phase: str
+    checks: List[CheckResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return all(check.status == PASS for check in self.checks)
+
+    def failures(self) -> List[CheckResult]:
+        return [check for check in self.checks if check.status != PASS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'phase': self.phase, 'passed': self.passed, 'duration': self.duration,
+                'checks': [asdict(check) for check in self.checks]}
+
+    def to_markdown(self) -> str:
+        marks = {PASS: 'PASS', FAIL: 'FAIL', INCONCLUSIVE: '????'}
+        lines = [f"# Validation report ({self.phase})", "",
+                 f"Rule-based validation {'passed' if self.passed else 'found issues'} "
+                 f"({len(self.checks)} checks in {self.duration * 1000:.0f} ms).", ""]
+        lines.extend(f"- [{marks[c.status]}] {c.name}" + (f": {c.detail}" if c.detail else '') for c in self.checks)
+        return '\n'.join(lines)
+
+def load_jsonc(path: str) -> Any:
+    """Parse JSON with comments and trailing commas (tsconfig.json)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    # Drop // and /* */ comments outside strings, then trailing commas
+    text = re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or '', text, flags=re.DOTALL)
+    text = re.sub(r',(\s*[}\]])', r'\1', text)
+    return json.loads(text)
+
+class ProjectValidator:
+    """Mechanical checks of a generated Next.js project, in milliseconds and without the LLM.
+
+    "setup" checks the scaffold (config files, package.json dependencies,
+    TypeScript strict mode, ESLint/Prettier, Jest and coverage settings);
+    "final" adds the document sections, the architecture diagram, API route
+    documentation, the components and modules the technical design names,
+    and test files. A check is inconclusive when the rules can't decide it
+    (a file that can't be parsed, a design that names no components), so
+    the LLM validation still runs for anything they don't cover.
+    """
+
+    def __init__(self, project_root: str):
+        self.project_root = os.path.abspath(project_root)
+
+    def _path(self, rel_path: str) -> str:
+        return os.path.join(self.project_root, rel_path)
+
+    def _first_existing(self, candidates: Sequence[str]) -> Optional[str]:
+        return next((c for c in candidates if os.path.exists(self._path(c))), None)
+
+    def check_config_files(self) -> List[CheckResult]:
+        results = []
+        for name, candidates in CONFIG_FILES.items():
+            found = self._first_existing(candidates)
+            results.append(CheckResult(name, PASS, found) if found else
+                           CheckResult(name, FAIL, f"none of {', '.join(candidates)}"))
+        return results
+
+    def _package_json(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path('package.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def check_dependencies(self) -> List[CheckResult]:
+        package = self._package_json()
+        if package is None:
+            status = INCONCLUSIVE if os.path.exists(self._path('package.json')) else FAIL
+            return [CheckResult('package.json dependencies', status, 'package.json missing or not valid JSON')]
+        dependencies = package.get('dependencies') or {}
+        dev_dependencies = package.get('devDependencies') or {}
+        everything = {**dependencies, **dev_dependencies}
+        missing = [d for d in REQUIRED_DEPENDENCIES if d not in dependencies]
+        missing += [d for d in REQUIRED_DEV_DEPENDENCIES if d not in everything]
+        scripts = package.get('scripts') or {}
+        missing_scripts = [s for s in ('dev', 'build') if s not in scripts]
+        return [
+            CheckResult('package.json dependencies', FAIL if missing else PASS,
+                        f"missing {', '.join(missing)}" if missing else ''),
+            CheckResult('package.json scripts', FAIL if missing_scripts else PASS,
+                        f"missing {', '.join(missing_scripts)}" if missing_scripts else '')
+        ]
+
+    def check_typescript(self) -> CheckResult:
+        path = self._path('tsconfig.json')
+        if not os.path.exists(path):
+            return CheckResult('TypeScript strict mode', FAIL, 'tsconfig.json missing')
+        try:
+            options = (load_jsonc(path) or {}).get('compilerOptions') or {}
+        except (OSError, ValueError) as e:
+            return CheckResult('TypeScript strict mode', INCONCLUSIVE, f"could not parse tsconfig.json: {e}")
+        if options.get('strict') is True:
+            return CheckResult('TypeScript strict mode', PASS)
+        return CheckResult('TypeScript strict mode', FAIL, 'compilerOptions.strict is not true')
+
+    def check_jest(self) -> CheckResult:
+        package = self._package_json() or {}
+        everything = {**(package.get('dependencies') or {}), **(package.get('devDependencies') or {})}
+        config = self._first_existing(JEST_CONFIG_FILES) or ('package.json#jest' if 'jest' in package else None)
+        missing = [d for d in TEST_DEPENDENCIES if d not in everything]
+        if config and not missing:
+            return CheckResult('Jest setup', PASS, config)
+        problems = ([] if config else ['no Jest config']) + ([f"missing {', '.join(missing)}"] if missing else [])
+        return CheckResult('Jest setup', FAIL, '; '.join(problems))
+
+    def check_prettier(self) -> CheckResult:
+        package = self._package_json() or {}
+        everything = {**(package.get('dependencies') or {}), **(package.get('devDependencies') or {})}
+        config = self._first_existing(PRETTIER_CONFIG_FILES) or ('package.json#prettier' if 'prettier' in package else None)
+        problems = ([] if 'prettier' in everything else ['prettier not in dependencies']) + \
+                   ([] if config else ['no Prettier config'])
+        return CheckResult('Prettier setup', FAIL if problems else PASS, '; '.join(problems) or config)
+
+    def check_coverage(self) -> CheckResult:
+        """Coverage settings in the Jest config, package.json "jest" or a --coverage script"""
+        sources = [self._path(c) for c in JEST_CONFIG_FILES if os.path.exists(self._path(c))]
+        if os.path.exists(self._path('package.json')):
+            sources.append(self._path('package.json'))
+        for path in sources:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    if COVERAGE_SETTINGS.search(f.read()):
+                        return CheckResult('coverage configuration', PASS, os.path.basename(path))
+            except OSError:
+                continue
+        return CheckResult('coverage configuration', FAIL, 'no coverageThreshold/collectCoverage or --coverage script')
+
+    def _read_doc(self, name: str) -> Optional[str]:
+        try:
+            with open(self._path(PROJECT_DOCS[name]), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def check_docs(self) -> List[CheckResult]:
+        """Every document exists and has a heading for each section its task asks for"""
+        results = []
+        for name, rel_path in PROJECT_DOCS.items():
+            text = self._read_doc(name)
+            if text is None:
+                results.append(CheckResult(f"{name} document", FAIL, f"{rel_path} missing"))
+                continue
+            headings = [' '.join(chunk.path).lower() for chunk in chunk_markdown(text) if chunk.path]
+            if not headings:
+                results.append(CheckResult(f"{name} document", FAIL, f"{rel_path} has no sections"))
+                continue
+            missing = [pattern.split('|')[0] for pattern in REQUIRED_SECTIONS.get(name, ())
+                       if not any(re.search(pattern, heading) for heading in headings)]
+            results.append(CheckResult(f"{name} document", FAIL if missing else PASS,
+                                       f"no section for: {', '.join(missing)}" if missing else ''))
+        return results
+
+    def check_diagrams(self) -> CheckResult:
+        text = self._read_doc('architecture')
+        if text is None:
+            return CheckResult('architecture diagram', FAIL, f"{PROJECT_DOCS['architecture']} missing")
+        if DIAGRAM_PATTERN.search(text):
+            return CheckResult('architecture diagram', PASS)
+        return CheckResult('architecture diagram', FAIL, 'no Mermaid/PlantUML block or image')
+
+    def check_api_docs(self, index: CodeIndex) -> CheckResult:
+        """Every API route handler is mentioned in some document ([id] may be written :id or {id})"""
+        api_routes = [route for route in index.routes() if route['kind'] == 'api']
+        if not api_routes:
+            return CheckResult('API documentation', PASS, 'no API routes')
+        docs = []
+        for root, _, files in os.walk(self._path('docs')):
+            for name in files:
+                if name.endswith('.md'):
+                    with open(os.path.join(root, name), 'r', encoding='utf-8', errors='replace') as f:
+                        docs.append(f.read())
+        text = '\n'.join(docs)
+        undocumented = []
+        for route in api_routes:
+            pattern = ''.join('/' + (r'[^/\s`)]+' if re.fullmatch(r'\[.*\]', segment) else re.escape(segment))
+                              for segment in route['path'].strip('/').split('/'))
+            if not re.search(pattern + r'(?![\w-])', text):
+                undocumented.append(route['path'])
+        return CheckResult('API documentation', FAIL if undocumented else PASS,
+                           f"undocumented: {', '.join(undocumented)}" if undocumented else f"{len(api_routes)} routes")
+
+    def check_design_references(self, index: CodeIndex) -> CheckResult:
+        """Components and modules the technical design names exist in the code"""
+        text = self._read_doc('technical design')
+        if text is None:
+            return CheckResult('required components and utilities', INCONCLUSIVE, 'no technical design to compare with')
+        components = set()
+        for chunk in chunk_markdown(text):
+            if any('component' in title.lower() for title in chunk.path):
+                components.update(a or b for a, b in DESIGN_COMPONENT.findall(chunk.text))
+        paths = set(DESIGN_PATH.findall(text))
+        if not components and not paths:
+            return CheckResult('required components and utilities', INCONCLUSIVE,
+                               'the technical design names no components or modules')
+        missing = sorted(name for name in components if not index.find_symbol(name))
+        missing += sorted(path for path in paths if not (index.exists(path) or index.exists(f"src/{path}")))
+        if missing:
+            return CheckResult('required components and utilities', FAIL, f"not found: {', '.join(missing[:20])}")
+        return CheckResult('required components and utilities', PASS,
+                           f"{len(components)} components, {len(paths)} modules")
+
+    def check_tests(self) -> CheckResult:
+        for root, dirs, files in os.walk(self.project_root):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+            for name in files:
+                rel_path = os.path.relpath(os.path.join(root, name), self.project_root).replace(os.sep, '/')
+                if TEST_FILE_PATTERN.search(rel_path):
+                    return CheckResult('test files', PASS, rel_path)
+        return CheckResult('test files', FAIL, 'no *.test.* / *.spec.* / __tests__ files')
+
+    def validate(self, phase: str = 'setup') -> ValidationReport:
+        start = time.perf_counter()
+        report = ValidationReport(phase)
+        report.checks.extend(self.check_config_files())
+        report.checks.extend(self.check_dependencies())
+        report.checks.append(self.check_typescript())
+        report.checks.append(self.check_prettier())
+        report.checks.append(self.check_jest())
+        report.checks.append(self.check_coverage())
+        if phase == 'final':
+            index = CodeIndex.for_project(self.project_root)
+            index.refresh()
+            report.checks.extend(self.check_docs())
+            report.checks.append(self.check_diagrams())
+            report.checks.append(self.check_api_docs(index))
+            report.checks.append(self.check_design_references(index))
+            report.checks.append(self.check_tests())
+        report.duration = time.perf_counter() - start
+        return report
+
+    def save(self, report: ValidationReport) -> str:
+        """Write the report to <project>/.devcrew/validation_<phase>.json"""
+        path = os.path.join(self.project_root, '.devcrew', f"validation_{report.phase}.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report.to_dict(), f, indent=2)
+        return path
@@ -0,0 +1,153 @@
+from typing import Dict, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import random
+import re
+from .search_cache import STOPWORDS
+
+_PRIME = (1 << 61) - 1
+
+def query_words(query: str) -> Set[str]:
+    """Normalized non-stopword tokens of a query.
+
+    Punctuation is dropped so "Next.js" and "nextjs" compare equal.
+    """
+    words = re.findall(r"[a-z0-9]+", re.sub(r"[.'_-]", "", query.lower()))
+    return {w for w in words if w not in STOPWORDS}
+
+def query_shingles(query: str, size: int = 3) -> Set[str]:
+    """Character trigrams of the normalized query.
+
+    Word order is ignored. Trigrams make "auth" and "authentication" overlap.
+    """
+    text = ' '.join(sorted(query_words(query)))
+    if len(text) < size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def _stable_hash(value: str) -> int:
+    # Built-in hash() is salted per process; signatures must survive a reload
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def _words_related(a: str, b: str) -> bool:
+    # "auth"/"authentication" and "hook"/"hooks" are the same topic
+    if a.startswith(b) or b.startswith(a):
+        return min(len(a), len(b)) >= 3
+    return jaccard(query_shingles(a), query_shingles(b)) >= 0.5
+
+def substitutes_word(a: Set[str], b: Set[str]) -> bool:
+    """True if each query has a word with no related word in the other.
+
+    That is a substitution ("vue hooks" vs "react hooks") rather than a
+    refinement ("react hooks" vs "react hooks 2024"), so the queries are
+    about different things however many other words they share.
+    """
+    only_a = [w for w in a - b if not any(_words_related(w, o) for o in b)]
+    only_b = [w for w in b - a if not any(_words_related(w, o) for o in a)]
+    return bool(only_a and only_b)
+
+class ResearchIndex:
+    """Near-duplicate lookup of research queries using MinHash with LSH banding.
+
+    Lookups only compare against queries sharing at least one LSH band bucket,
+    then confirm candidates with exact trigram Jaccard similarity against the
+    threshold. A candidate that swaps a word for an unrelated one (a different
+    framework, say) is rejected even when the trigram score passes.
+    """
+
+    def __init__(self, threshold: float = 0.4, num_perm: int = 96, bands: int = 32):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(num_perm)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self.entries: List[Dict] = []
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._exact: Dict[str, int] = {}
+
+    def signature(self, shingles: Set[str]) -> List[int]:
+        hashes = [_stable_hash(s) for s in shingles] or [0]
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms]
+
+    def _bands_of(self, signature: List[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, query: str, result: dict, task_id: Optional[str] = None) -> None:
+        """Index a research query and its result; re-adding a query replaces its result"""
+        if query in self._exact:
+            self.entries[self._exact[query]].update({'result': result, 'task_id': task_id})
+            return
+        signature = self.signature(query_shingles(query))
+        entry_id = len(self.entries)
+        self.entries.append({'query': query, 'result': result, 'task_id': task_id, 'signature': signature})
+        self._exact[query] = entry_id
+        for key in self._bands_of(signature):
+            self._buckets.setdefault(key, []).append(entry_id)
+
+    def lookup(self, query: str, threshold: Optional[float] = None) -> Optional[Dict]:
+        """Find the most similar indexed query at or above the threshold"""
+        if query in self._exact:
+            return {**self.entries[self._exact[query]], 'similarity': 1.0}
+
+        threshold = self.threshold if threshold is None else threshold
+        words = query_words(query)
+        shingles = query_shingles(query)
+        candidates: Set[int] = set()
+        for key in self._bands_of(self.signature(shingles)):
+            candidates.update(self._buckets.get(key, ()))
+
+        best, best_score = None, threshold
+        for entry_id in candidates:
+            entry = self.entries[entry_id]
+            if substitutes_word(words, query_words(entry['query'])):
+                continue
+            score = jaccard(shingles, query_shingles(entry['query']))
+            if score >= best_score:
+                best, best_score = entry, score
+        if best is None:
+            return None
+        return {**best, 'similarity': best_score}
+
+    @staticmethod
+    def default_path(project_root: str) -> str:
+        """Where a project's index is persisted between runs"""
+        return os.path.join(os.path.abspath(project_root), '.devcrew', 'research_index.json')
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {
+            'threshold': self.threshold,
+            'num_perm': self.num_perm,
+            'bands': self.bands,
+            'entries': self.entries
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ResearchIndex":
+        with open(path, 'r') as f:
+            data = json.load(f)
+        index = cls(threshold=data['threshold'], num_perm=data['num_perm'], bands=data['bands'])
+        for entry in data['entries']:
+            entry_id = len(index.entries)
+            index.entries.append(entry)
+            index._exact[entry['query']] = entry_id
+            for key in index._bands_of(entry['signature']):
+                index._buckets.setdefault(key, []).append(entry_id)
+        return index
@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from .disk_cache import get_cache_dir
+
+TEMPLATE_DIR_NAME = 'template'
+
+# Entries directly under node_modules that npm, patch-package and postinstall
+# scripts rewrite in place; a hardlinked copy would write through to the template
+MUTABLE_NODE_MODULES = {'.bin', '.cache', '.package-lock.json', '.yarn-integrity', '.modules.yaml'}
+
+class ScaffoldCache:
+    """Versioned, pre-installed project templates cloned into new projects.
+
+    A template is built once per (init command, Node version, npm version) by
+    running the scaffolding command and `npm install` in a staging directory.
+    New projects are materialized by reflink clone where the filesystem
+    supports it, otherwise by hardlinking node_modules and copying the rest,
+    with a plain copy as the last resort. Files npm rewrites in place are
+    always copied so a project's install never touches the template.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or get_cache_dir('scaffolds')
+        self._versions: Optional[Dict[str, str]] = None
+
+    def toolchain_versions(self) -> Dict[str, str]:
+        """Node and npm versions that built templates depend on"""
+        if self._versions is None:
+            versions = {}
+            for tool in ('node', 'npm'):
+                result = subprocess.run(f"{tool} --version", shell=True, check=True,
+                                        capture_output=True, text=True)
+                versions[tool] = result.stdout.strip()
+            self._versions = versions
+        return self._versions
+
+    def key(self, init_command: str) -> str:
+        payload = json.dumps({'command': init_command, **self.toolchain_versions()}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def template_path(self, key: str) -> str:
+        return os.path.join(self.root, key, TEMPLATE_DIR_NAME)
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.root, key, 'meta.json'))
+
+    def build(self, init_command: str, install_command: str = "npm install") -> str:
+        """Build the template for a command if missing and return its key"""
+        key = self.key(init_command)
+        if self.has(key):
+            return key
+
+        staging = os.path.join(self.root, f".build-{key}-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        template = os.path.join(staging, TEMPLATE_DIR_NAME)
+        os.makedirs(template)
+        try:
+            print(f"Building scaffold template {key}...")
+            started = time.time()
+            subprocess.run(init_command, shell=True, check=True, capture_output=True, text=True, cwd=template)
+            subprocess.run(install_command, shell=True, check=True, capture_output=True, text=True, cwd=template)
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump({
+                    'key': key,
+                    'command': init_command,
+                    'install_command': install_command,
+                    'versions': self.toolchain_versions(),
+                    'created_at': time.time(),
+                    'build_seconds': round(time.time() - started, 2)
+                }, f, indent=2)
+            try:
+                os.rename(staging, os.path.join(self.root, key))
+            except OSError:
+                # Another process finished the same template first; keep theirs
+                if not self.has(key):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return key
+
+    def materialize(self, key: str, dest: str, preserve: Optional[List[str]] = None) -> str:
+        """Clone a template into dest and return the clone strategy used.
+
+        Top-level entries listed in preserve that already exist in dest are
+        left untouched.
+        """
+        template = self.template_path(key)
+        if not os.path.isdir(template):
+            raise FileNotFoundError(f"Scaffold template {key} is not built")
+
+        os.makedirs(dest, exist_ok=True)
+        preserve = set(preserve or [])
+        entries = [
+            name for name in os.listdir(template)
+            if not (name in preserve and os.path.exists(os.path.join(dest, name)))
+        ]
+
+        strategy = os.getenv('DEVCREW_SCAFFOLD_CLONE', 'auto')
+        if strategy == 'auto':
+            strategy = 'reflink' if self._supports_reflink(key, dest) else 'hardlink'
+        if strategy == 'reflink':
+            sources = [os.path.join(template, name) for name in entries]
+            subprocess.run(['cp', '-a', '--reflink=always', *sources, dest],
+                           check=True, capture_output=True, text=True)
+            return strategy
+
+        for name in entries:
+            src = os.path.join(template, name)
+            dst = os.path.join(dest, name)
+            # Only node_modules is hardlinked: agents never edit it in place,
+            # while source files are opened for writing and would corrupt the template
+            link = strategy == 'hardlink' and name == 'node_modules'
+            if os.path.isdir(src) and not os.path.islink(src):
+                copy_function = self._link_immutable(src) if link else shutil.copy2
+                try:
+                    shutil.copytree(src, dst, symlinks=True, copy_function=copy_function, dirs_exist_ok=True)
+                except (OSError, shutil.Error):
+                    if not link:
+                        raise
+                    # Cross-device or unsupported hardlinks
+                    shutil.copytree(src, dst, symlinks=True, dirs_exist_ok=True)
+                    strategy = 'copy'
+            else:
+                shutil.copy2(src, dst, follow_symlinks=False)
+        return strategy
+
+    @staticmethod
+    def _link_immutable(node_modules: str):
+        """copytree copy_function hardlinking package files but copying mutable ones"""
+        def copy(src: str, dst: str):
+            top = os.path.relpath(src, node_modules).split(os.sep)
+            if len(top) == 1 or top[0] in MUTABLE_NODE_MODULES:
+                return shutil.copy2(src, dst)
+            return os.link(src, dst)
+        return copy
+
+    def _supports_reflink(self, key: str, dest: str) -> bool:
+        """Probe copy-on-write cloning between the cache and dest with a single small file"""
+        if not sys.platform.startswith('linux'):
+            return False
+        probe = os.path.join(dest, f".reflink-probe-{os.getpid()}")
+        result = subprocess.run(
+            ['cp', '--reflink=always', os.path.join(self.root, key, 'meta.json'), probe],
+            capture_output=True, text=True
+        )
+        if os.path.exists(probe):
+            os.remove(probe)
+        return result.returncode == 0
+
+    def set_package_name(self, dest: str) -> None:
+        """Rename the cloned package after its project directory"""
+        package_json = os.path.join(dest, 'package.json')
+        if not os.path.exists(package_json):
+            return
+        with open(package_json, 'r') as f:
+            package = json.load(f)
+        package['name'] = os.path.basename(os.path.abspath(dest)).lower().replace(' ', '-')
+        with open(package_json, 'w') as f:
+            json.dump(package, f, indent=2)
+            f.write('\n')
+
+    def list(self) -> List[Dict]:
+        """Metadata of all built templates"""
+        templates = []
+        for key in sorted(os.listdir(self.root)):
+            meta_path = os.path.join(self.root, key, 'meta.json')
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r') as f:
+                    templates.append(json.load(f))
+        return templates
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """Remove one template, or all of them; returns the number removed"""
+        keys = [key] if key else [t['key'] for t in self.list()]
+        removed = 0
+        for template_key in keys:
+            path = os.path.join(self.root, template_key)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+                removed += 1
+        return removed
@@ -0,0 +1,118 @@
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import os
+import re
+import threading
+from .disk_cache import DiskCache, get_cache_dir
+
+# Function words only: content words like "best" or "use" change what a query asks for
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'do', 'does', 'for', 'from',
+    'how', 'i', 'in', 'is', 'it', 'of', 'on', 'or', 'the', 'to', 'what',
+    'when', 'where', 'which', 'with'
+}
+
+# Queries mentioning these change quickly, so their results are kept for a shorter time
+VOLATILE_TERMS = {'latest', 'new', 'news', 'release', 'released', 'today', 'update', 'updates'}
+
+DAY = 24 * 3600
+
+def normalize_query(query: str) -> str:
+    """Normalize case, whitespace, punctuation and stopwords.
+
+    Word order is kept: "use X instead of Y" and "use Y instead of X" are different queries.
+    """
+    # Keep characters that carry meaning in tech names (next.js, c++, c#, @types/node)
+    tokens = re.findall(r"[a-z0-9][a-z0-9.+#@/_-]*", query.lower())
+    tokens = [t.rstrip('.') for t in tokens]
+    words = [t for t in tokens if t and t not in STOPWORDS]
+    return ' '.join(words) or ' '.join(query.lower().split())
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, Any]] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+
+class SearchCache:
+    """Disk-backed search results shared by all projects, with per-query TTL"""
+
+    def __init__(self, path: Optional[str] = None, default_ttl: Optional[float] = None):
+        self.default_ttl = default_ttl or float(os.getenv('DEVCREW_SEARCH_CACHE_TTL', str(7 * DAY)))
+        self.cache = DiskCache(path or os.path.join(get_cache_dir('search'), 'results.sqlite'))
+        self.flights = SingleFlight()
+
+    def ttl_for(self, query: str, search_type: str = 'search') -> float:
+        """News and time-sensitive queries expire sooner than reference lookups"""
+        if search_type == 'news':
+            return min(self.default_ttl, DAY / 4)
+        words = set(query.lower().split())
+        if words & VOLATILE_TERMS or re.search(r'\b20\d\d\b', query):
+            return min(self.default_ttl, DAY)
+        return self.default_ttl
+
+    @staticmethod
+    def make_key(query: str, search_type: str = 'search', n_results: int = 10) -> str:
+        raw = f"{search_type}|{n_results}|{normalize_query(query)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_or_fetch(self, query: str, fetch: Callable[[], dict],
+                     search_type: str = 'search', n_results: int = 10) -> dict:
+        """Return cached results, or fetch once even if many threads ask at the same time"""
+        key = self.make_key(query, search_type, n_results)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        def load() -> dict:
+            # A caller that missed the cache just before an earlier flight stored its
+            # results becomes a new leader; reuse those results instead of fetching again
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            results = fetch()
+            if results:
+                self.cache.set(key, results, ttl=self.ttl_for(query, search_type))
+            return results
+
+        return self.flights.do(key, load)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search cache"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+        return _search_cache
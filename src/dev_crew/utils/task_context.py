@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+from .research_index import ResearchIndex
 
 @dataclass
 class TaskContext:
@@ -52,6 +53,9 @@ class ProjectContext:
     tasks: Dict[str, TaskContext] = field(default_factory=dict)
     global_context: Dict = field(default_factory=dict)
     
+    # Near-duplicate index over research queries from all tasks
+    research_index: ResearchIndex = field(default_factory=ResearchIndex)
+    
     def create_task(self, task_type: str, parent_task: Optional[str] = None) -> TaskContext:
         """Create a new task context"""
         task_id = f"{task_type}_{len(self.tasks)}"
@@ -0,0 +1,123 @@
+from typing import Any, Dict, List, Optional, Set
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import threading
+
+@dataclass
+class TaskNode:
+    """A schedulable task with the artifacts it reads and writes"""
+    name: str
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    payload: Any = None
+    order: int = 0
+
+class TaskScheduler:
+    """Build a dependency graph from task inputs/outputs and group it into parallel waves"""
+
+    def __init__(self, max_parallel: int = 1):
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        self.max_parallel = max_parallel
+        self.nodes: Dict[str, TaskNode] = {}
+
+    def add_task(self, name: str, inputs: Optional[List[str]] = None,
+                 outputs: Optional[List[str]] = None, payload: Any = None) -> TaskNode:
+        """Register a task; declaration order breaks ties between writers of the same artifact"""
+        if name in self.nodes:
+            raise ValueError(f"Task '{name}' is already scheduled")
+        node = TaskNode(
+            name=name,
+            inputs=list(inputs or []),
+            outputs=list(outputs or []),
+            payload=payload,
+            order=len(self.nodes)
+        )
+        self.nodes[name] = node
+        return node
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """Map each task to the tasks that must finish before it starts.
+
+        A task depends on the latest earlier writer of every artifact it reads,
+        on the previous writer of every artifact it writes, and on every reader
+        of the version it is about to overwrite.
+        """
+        deps: Dict[str, Set[str]] = {name: set() for name in self.nodes}
+        last_writer: Dict[str, str] = {}
+        readers: Dict[str, List[str]] = {}
+
+        for node in sorted(self.nodes.values(), key=lambda n: n.order):
+            for artifact in node.inputs:
+                if artifact in last_writer:
+                    deps[node.name].add(last_writer[artifact])
+                readers.setdefault(artifact, []).append(node.name)
+            for artifact in node.outputs:
+                if artifact in last_writer:
+                    deps[node.name].add(last_writer[artifact])
+                deps[node.name].update(r for r in readers.get(artifact, []) if r != node.name)
+                last_writer[artifact] = node.name
+                readers[artifact] = []
+
+        return deps
+
+    def levels(self) -> List[List[TaskNode]]:
+        """Group tasks into dependency levels; tasks within a level are independent"""
+        deps = self.dependencies()
+        level_of: Dict[str, int] = {}
+
+        # Dependencies always point to earlier declarations, so one ordered pass suffices
+        for node in sorted(self.nodes.values(), key=lambda n: n.order):
+            level_of[node.name] = max((level_of[d] + 1 for d in deps[node.name]), default=0)
+
+        levels: List[List[TaskNode]] = [[] for _ in range(max(level_of.values(), default=-1) + 1)]
+        for node in sorted(self.nodes.values(), key=lambda n: n.order):
+            levels[level_of[node.name]].append(node)
+        return levels
+
+    def waves(self) -> List[List[TaskNode]]:
+        """Split dependency levels into waves of at most max_parallel tasks"""
+        waves = []
+        for level in self.levels():
+            for start in range(0, len(level), self.max_parallel):
+                waves.append(level[start:start + self.max_parallel])
+        return waves
+
+class DependencyFailed(Exception):
+    """A task was not run because a task it depends on failed"""
+
+class DependencyGate:
+    """Run concurrently started tasks in dependency order, at most max_parallel at a time.
+
+    crewAI joins asynchronous tasks only when it reaches the next synchronous
+    task, so a sync task closing each wave serializes the wave. Instead every
+    task is started asynchronously and blocks here until the tasks it depends
+    on have finished and a slot is free. A failed task fails its dependents
+    instead of leaving them waiting.
+    """
+
+    def __init__(self, dependencies: Dict[str, Set[str]], max_parallel: int = 1):
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        self.dependencies = {name: set(deps) for name, deps in dependencies.items()}
+        self._finished = {name: threading.Event() for name in self.dependencies}
+        self._failed: Set[str] = set()
+        self._slots = threading.BoundedSemaphore(max_parallel)
+
+    @contextmanager
+    def slot(self, name: str):
+        """Wait for the task's dependencies and a free slot for the duration of the block"""
+        try:
+            for dependency in sorted(self.dependencies.get(name, ())):
+                self._finished[dependency].wait()
+            failed = sorted(self.dependencies.get(name, set()) & self._failed)
+            if failed:
+                raise DependencyFailed(f"Task '{name}' depends on failed task(s): {', '.join(failed)}")
+            with self._slots:
+                yield
+        except BaseException:
+            self._failed.add(name)
+            raise
+        finally:
+            if name in self._finished:
+                self._finished[name].set()
@@ -0,0 +1,166 @@
+from typing import Any, Callable, Dict, Optional
+from contextlib import contextmanager
+import copy
+import json
+import os
+import threading
+
+# USD per million tokens (prompt, completion); extend or override with DEVCREW_MODEL_PRICES
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4': (30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'o1-mini': (3.00, 12.00),
+    'o1': (15.00, 60.00)
+}
+
+BUDGET_MODES = ('abort', 'degrade')
+
+class BudgetExceeded(Exception):
+    """Raised from an LLM call once a project's token or cost budget is used up"""
+
+def load_prices() -> Dict[str, tuple]:
+    prices = dict(MODEL_PRICES)
+    overrides = os.getenv('DEVCREW_MODEL_PRICES')
+    if overrides:
+        prices.update({model: tuple(price) for model, price in json.loads(overrides).items()})
+    return prices
+
+def price_for(model: str, prices: Dict[str, tuple]) -> tuple:
+    """Match provider-prefixed and dated model names (openai/gpt-4o-2024-08-06) to a price"""
+    name = model.split('/')[-1]
+    for known in sorted(prices, key=len, reverse=True):
+        if name == known or name.startswith(known + '-'):
+            return prices[known]
+    return (0.0, 0.0)
+
+_current = threading.local()
+
+@contextmanager
+def task_scope(task_name: str):
+    """Attribute LLM usage in this thread to a task (crewAI runs async tasks in their own threads)"""
+    previous = getattr(_current, 'task', None)
+    _current.task = task_name
+    try:
+        yield
+    finally:
+        _current.task = previous
+
+def current_task() -> Optional[str]:
+    return getattr(_current, 'task', None)
+
+def _empty() -> Dict[str, Any]:
+    return {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0, 'cost_usd': 0.0, 'requests': 0}
+
+class UsageLedger:
+    """Token and cost accounting for one project, with an optional budget.
+
+    Usage is totalled per project, per task and per agent. When the budget is
+    exceeded in "abort" mode further LLM calls raise BudgetExceeded; in
+    "degrade" mode tasks that haven't started are skipped and calls already in
+    flight may continue up to hard_limit_factor times the budget.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, max_cost_usd: Optional[float] = None,
+                 on_exceeded: str = 'abort', hard_limit_factor: Optional[float] = None,
+                 sink: Optional[Callable[..., None]] = None):
+        if on_exceeded not in BUDGET_MODES:
+            raise ValueError(f"on_exceeded must be one of {', '.join(BUDGET_MODES)}")
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.on_exceeded = on_exceeded
+        self.hard_limit_factor = hard_limit_factor or float(os.getenv('DEVCREW_BUDGET_HARD_FACTOR', '1.5'))
+        self.sink = sink
+        self.prices = load_prices()
+        self.totals = _empty()
+        self.by_task: Dict[str, Dict[str, Any]] = {}
+        self.by_agent: Dict[str, Dict[str, Any]] = {}
+        self.exceeded = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_budget(cls, budget: Optional[Dict[str, Any]], sink: Optional[Callable[..., None]] = None) -> 'UsageLedger':
+        budget = budget or {}
+        return cls(
+            max_tokens=budget.get('max_tokens'),
+            max_cost_usd=budget.get('max_cost_usd'),
+            on_exceeded=budget.get('on_exceeded') or 'abort',
+            sink=sink
+        )
+
+    @property
+    def has_budget(self) -> bool:
+        return self.max_tokens is not None or self.max_cost_usd is not None
+
+    def _over(self, factor: float = 1.0) -> bool:
+        if self.max_tokens is not None and self.totals['total_tokens'] >= self.max_tokens * factor:
+            return True
+        if self.max_cost_usd is not None and self.totals['cost_usd'] >= self.max_cost_usd * factor:
+            return True
+        return False
+
+    def check(self) -> None:
+        """Called before each LLM request; raises once the budget (or hard limit) is used up"""
+        with self._lock:
+            limit = 1.0 if self.on_exceeded == 'abort' else self.hard_limit_factor
+            if self._over(limit):
+                raise BudgetExceeded(self._describe())
+
+    def should_skip(self, task: Any) -> Optional[str]:
+        """skip_if hook for tasks: in degrade mode, don't start new tasks once over budget"""
+        if self.on_exceeded == 'degrade' and self.exceeded:
+            return f"Skipped: project budget exceeded ({self._describe()})"
+        return None
+
+    def record(self, model: str, prompt_tokens: int, completion_tokens: int,
+               agent: Optional[str] = None, task: Optional[str] = None) -> None:
+        prompt_price, completion_price = price_for(model, self.prices)
+        cost = (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+        task = task or current_task()
+        with self._lock:
+            buckets = [self.totals]
+            if task:
+                buckets.append(self.by_task.setdefault(task, _empty()))
+            if agent:
+                buckets.append(self.by_agent.setdefault(agent, _empty()))
+            for bucket in buckets:
+                bucket['prompt_tokens'] += prompt_tokens
+                bucket['completion_tokens'] += completion_tokens
+                bucket['total_tokens'] += prompt_tokens + completion_tokens
+                bucket['cost_usd'] = round(bucket['cost_usd'] + cost, 6)
+                bucket['requests'] += 1
+            if not self.exceeded and self._over():
+                self.exceeded = True
+        if self.sink:
+            self.sink('usage', usage=self.snapshot())
+
+    def _describe(self) -> str:
+        limits = []
+        if self.max_tokens is not None:
+            limits.append(f"{self.totals['total_tokens']}/{self.max_tokens} tokens")
+        if self.max_cost_usd is not None:
+            limits.append(f"${self.totals['cost_usd']:.4f}/${self.max_cost_usd:.4f}")
+        return ', '.join(limits)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **copy.deepcopy(self.totals),
+                'by_task': copy.deepcopy(self.by_task),
+                'by_agent': copy.deepcopy(self.by_agent),
+                'budget': {
+                    'max_tokens': self.max_tokens,
+                    'max_cost_usd': self.max_cost_usd,
+                    'on_exceeded': self.on_exceeded
+                } if self.has_budget else None,
+                'budget_exceeded': self.exceeded
+            }
+
+def bind_llm(llm: Any, ledger: UsageLedger, agent_role: str) -> Any:
+    """Per-agent copy of a shared LLM that charges its usage to a ledger"""
+    bound = copy.copy(llm)
+    bound.usage_ledger = ledger
+    bound.agent_role = agent_role
+    return bound
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from dev_crew.api import main as api
+from dev_crew.api.store import MemoryProjectStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = MemoryProjectStore()
+    monkeypatch.setattr(api, "get_store", lambda: store)
+    return store
+
+
+def test_cancel_is_refused_in_thread_mode(store, monkeypatch):
+    store.create("p", {"status": "running", "created_at": "2026-01-01", "updated_at": "2026-01-01"})
+    monkeypatch.setattr(api, "EXECUTION_MODE", "thread")
+    monkeypatch.setitem(api.running_tasks, "p", object())
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(api.cancel_project("p"))
+    assert error.value.status_code == 409
+    assert store.get("p")["status"] == "running"
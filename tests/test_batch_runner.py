@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from dev_crew.api.worker import CrewWorkerPool
+from dev_crew.utils import scaffold_cache
+from dev_crew.utils.batch_runner import BatchRunner, format_report, load_specs
+
+
+def write_specs(tmp_path, lines):
+    path = tmp_path / "specs.jsonl"
+    path.write_text("\n".join(lines))
+    return str(path)
+
+
+def test_load_specs_validates_lines(tmp_path):
+    specs = load_specs(write_specs(tmp_path, [
+        '# comment', '', '{"requirements": "todo app", "id": "todo"}', '{"requirements": "blog"}'
+    ]))
+    assert [(s.id, s.project_name) for s in specs] == [("todo", "todo"), ("batch_project_2", "batch_project_2")]
+    with pytest.raises(ValueError, match="duplicate"):
+        load_specs(write_specs(tmp_path, ['{"requirements": "a", "id": "x"}', '{"requirements": "b", "id": "x"}']))
+    with pytest.raises(ValueError, match="requirements"):
+        load_specs(write_specs(tmp_path, ['{"id": "x"}']))
+
+
+@pytest.fixture
+def fake_workers(monkeypatch):
+    calls = {"pools": set(), "active": 0, "max_active": 0, "builds": []}
+    monkeypatch.setattr(scaffold_cache.ScaffoldCache, "build",
+                        lambda self, command: calls["builds"].append(calls["active"]) or "key")
+
+    async def run(self, project_id, requirements, project_name=None, timeout=None, on_start=None,
+                  on_event=None, budget=None, resume=False, incremental=None):
+        calls["pools"].add(id(self))
+        async with self._slots:
+            await on_start()
+            calls["active"] += 1
+            calls["max_active"] = max(calls["max_active"], calls["active"])
+            await asyncio.sleep(0.05)
+            await on_event({"type": "task_finished", "task": "plan", "duration": 0.05})
+            calls["active"] -= 1
+        if requirements == "slow":
+            raise asyncio.TimeoutError()
+        return {"status": "completed", "artifacts_path": project_name,
+                "usage": {"total_tokens": 10, "cost_usd": 0.01, "requests": 2}}
+
+    monkeypatch.setattr(CrewWorkerPool, "run", run)
+    return calls
+
+
+def test_batch_report(tmp_path, fake_workers, monkeypatch):
+    monkeypatch.delenv("DEVCREW_LLM_CACHE", raising=False)
+    specs = load_specs(write_specs(tmp_path, [
+        json.dumps({"requirements": "app", "id": f"p{i}"}) for i in range(4)
+    ] + ['{"requirements": "slow", "id": "late", "timeout": 1}']))
+    runner = BatchRunner(specs, concurrency=2, workspace_dir=str(tmp_path))
+    report = runner.run()
+
+    # One shared pool capped at the concurrency, with the scaffold built before any worker started
+    assert len(fake_workers["pools"]) == 1
+    assert fake_workers["max_active"] == 2
+    assert fake_workers["builds"] == [0]
+
+    assert report["counts"] == {"completed": 4, "timeout": 1}
+    assert report["usage"] == {"total_tokens": 40, "cost_usd": 0.04, "requests": 8}
+    assert report["llm_cache"] is False
+    project = report["projects"][0]
+    assert project["tasks"] == {"plan": 0.05} and project["status"] == "completed"
+    assert "exceeded timeout of 1 seconds" in report["projects"][4]["error"]
+    with open(f"{runner.report_dir}/report.json") as f:
+        assert json.load(f)["counts"] == report["counts"]
+    assert "5 projects (4 completed, 1 timeout)" in format_report(report)[-1]
+
+
+def test_scaffold_warm_up_is_skipped_or_tolerated(monkeypatch):
+    builds = []
+    monkeypatch.setattr(scaffold_cache.ScaffoldCache, "build", lambda self, command: builds.append(command))
+    monkeypatch.setenv("DEVCREW_SCAFFOLD_CACHE", "0")
+    BatchRunner.warm_scaffold()
+    assert builds == []
+
+    def fail(self, command):
+        raise RuntimeError("npx not found")
+
+    monkeypatch.setenv("DEVCREW_SCAFFOLD_CACHE", "1")
+    monkeypatch.setattr(scaffold_cache.ScaffoldCache, "build", fail)
+    BatchRunner.warm_scaffold()
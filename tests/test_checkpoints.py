@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from dev_crew.utils.checkpoints import CheckpointStore
+
+
+def make_task(name, description="Write the requirements", output_file=None):
+    return SimpleNamespace(name=name, description=description, expected_output="A markdown document",
+                           output_file=output_file, context=None, agent=SimpleNamespace(role="Analyst"))
+
+
+def test_checkpoint_is_reused_only_while_the_prompt_is_unchanged(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.save(make_task("analyze"), SimpleNamespace(raw="# Requirements", agent="Analyst"))
+
+    checkpoint = store.resumable(make_task("analyze"))
+    assert checkpoint["raw"] == "# Requirements"
+    assert checkpoint["agent"] == "Analyst"
+    assert store.resumable(make_task("analyze", "Write the requirements for a blog")) is None
+    assert store.resumable(make_task("design")) is None
+
+
+def test_checkpoint_needs_its_output_file(tmp_path):
+    output_file = tmp_path / "docs" / "requirements.md"
+    output_file.parent.mkdir()
+    output_file.write_text("# Requirements")
+    store = CheckpointStore(str(tmp_path))
+    task = make_task("analyze", output_file=str(output_file))
+    store.save(task, "# Requirements")
+    assert store.resumable(task)["raw"] == "# Requirements"
+
+    output_file.unlink()
+    assert store.resumable(task) is None
+
+
+def test_completed_in_finish_order_and_clear(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    for name in ("design", "analyze/phase 1"):
+        store.save(make_task(name), name)
+    assert [c["task"] for c in store.completed()] == ["design", "analyze/phase 1"]
+
+    (tmp_path / ".devcrew" / "checkpoints" / "broken.json").write_text("{")
+    assert len(store.completed()) == 2
+    store.clear()
+    assert store.completed() == []
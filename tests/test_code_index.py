@@ -0,0 +1,77 @@
+from dev_crew.tools.code_index_tool import ProjectIndexTool
+from dev_crew.utils.code_index import CodeIndex
+
+
+def write(root, rel_path, text):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def make_project(root):
+    write(root, "src/lib/db.ts", "export async function connect() {}\nexport const POOL_SIZE = 4;\n"
+                                 "export { connect as open, type Row };\n")
+    write(root, "src/components/Header.tsx",
+          "import Link from 'next/link';\nimport { connect } from '@/lib/db';\n\n"
+          "export default function Header() {\n  return null;\n}\nconst NavItem = () => null;\n")
+    write(root, "src/app/(marketing)/about/page.tsx",
+          "import Header from '../../../components/Header';\nexport default function AboutPage() { return null; }\n")
+    write(root, "src/app/api/users/[id]/route.ts",
+          "const db = require('@/lib/db');\nexport async function GET() {}\nexport async function DELETE() {}\n")
+    write(root, "node_modules/next/index.js", "export const ignored = 1;\n")
+
+
+def test_symbols_imports_and_routes(tmp_path):
+    make_project(tmp_path)
+    index = CodeIndex(str(tmp_path))
+    assert index.refresh() == {"added": 4, "updated": 0, "unchanged": 0, "removed": 0}
+
+    assert index.find_symbol("connect") == [
+        {"file": "src/lib/db.ts", "name": "connect", "kind": "function", "default": False, "line": 1}
+    ]
+    assert [m["kind"] for m in index.find_symbol("open")] == ["reexport"]
+    assert index.find_symbol("Header")[0]["default"]
+    assert index.components() == [("AboutPage", "src/app/(marketing)/about/page.tsx"),
+                                  ("Header", "src/components/Header.tsx"),
+                                  ("NavItem", "src/components/Header.tsx")]
+
+    assert index.imports_of("src/components/Header.tsx") == ["src/lib/db.ts", "next/link"]
+    assert index.importers_of("src/lib/db") == ["src/app/api/users/[id]/route.ts", "src/components/Header.tsx"]
+    assert index.importers_of("next/link") == ["src/components/Header.tsx"]
+
+    assert [(r["path"], r["kind"], r.get("methods")) for r in index.routes()] == [
+        ("/about", "page", None),
+        ("/api/users/[id]", "api", ["DELETE", "GET"])
+    ]
+    assert not index.exists("node_modules/next/index.js")
+
+
+def test_refresh_reparses_only_changed_files_and_drops_removed_ones(tmp_path):
+    make_project(tmp_path)
+    index = CodeIndex(str(tmp_path))
+    index.refresh()
+    write(tmp_path, "src/lib/db.ts", "export function connect() {}\n// longer than before\n")
+    (tmp_path / "src/app/api/users/[id]/route.ts").unlink()
+    assert index.refresh() == {"added": 0, "updated": 1, "unchanged": 2, "removed": 1}
+    assert CodeIndex(str(tmp_path)).find_symbol("POOL_SIZE") == []
+
+
+def test_tool_rescans_on_a_miss_and_otherwise_throttles_refresh(tmp_path, monkeypatch):
+    make_project(tmp_path / "app")
+    monkeypatch.setenv("DEVCREW_WORKSPACE", str(tmp_path))
+    index = CodeIndex.for_project(str(tmp_path / "app"))
+    walks = []
+    refresh = index.refresh
+    monkeypatch.setattr(index, "refresh", lambda: walks.append(1) or refresh())
+    tool = ProjectIndexTool()
+
+    assert "src/lib/db.ts:1 function connect" in tool._run("app", "find", "connect")
+    assert "src/lib/db.ts:1 function connect" in tool._run("app", "find", "connect")
+    assert len(walks) == 1
+
+    write(tmp_path / "app", "src/lib/cache.ts", "export class LruCache {}\n")
+    assert tool._run("app", "find", "LruCache").startswith("src/lib/cache.ts:1 class LruCache")
+    assert len(walks) == 2
+    assert tool._run("app", "find", "Missing") == "No results for find 'Missing'"
+    assert tool._run("app", "imports", "src/nope.ts") == "Error: src/nope.ts is not in the index"
+    assert tool._run("app", "imports") == "Error: 'imports' needs a target"
@@ -0,0 +1,64 @@
+import os
+
+from dev_crew.utils.command_memo import CommandMemo
+
+
+def make_project(tmp_path):
+    (tmp_path / "package.json").write_text('{"name": "app"}')
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "index.ts").write_text("export const a = 1;\n")
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "index.js").write_text("1")
+    return str(tmp_path)
+
+
+def test_key_changes_when_an_input_file_changes(tmp_path):
+    cwd = make_project(tmp_path)
+    memo = CommandMemo(path=str(tmp_path / "memo.sqlite"))
+    rule = memo.plan("npx tsc --noEmit")
+    key = memo.make_key("npx tsc --noEmit", cwd, {}, rule)
+
+    assert memo.make_key("npx tsc --noEmit ", cwd, {}, rule) == key
+    (tmp_path / "node_modules" / "dep" / "index.js").write_text("2")
+    assert memo.make_key("npx tsc --noEmit", cwd, {}, rule) == key
+
+    source = tmp_path / "src" / "index.ts"
+    source.write_text("export const a = 2;\n")
+    os.utime(source, ns=(1, 1))
+    changed = memo.make_key("npx tsc --noEmit", cwd, {}, rule)
+    assert changed != key
+
+    (tmp_path / "src" / "extra.ts").write_text("")
+    assert memo.make_key("npx tsc --noEmit", cwd, {}, rule) != changed
+    assert memo.make_key("npx tsc --noEmit", cwd, {"NODE_ENV": "test"}, rule) != key
+
+
+def test_lookup_hits_until_inputs_change(tmp_path):
+    cwd = make_project(tmp_path)
+    memo = CommandMemo(path=str(tmp_path / "memo.sqlite"))
+    rule = memo.plan("npm run lint")
+    assert memo.store("npm run lint", cwd, {}, rule, "ok", 0, "clean", 1.0)
+    assert memo.lookup("npm run lint", cwd, {}, rule)["output"] == "clean"
+
+    (tmp_path / "package.json").write_text('{"name": "app", "private": true}')
+    assert memo.lookup("npm run lint", cwd, {}, rule) is None
+
+
+def test_installs_need_their_outputs_and_never_cache_failures(tmp_path):
+    cwd = make_project(tmp_path)
+    memo = CommandMemo(path=str(tmp_path / "memo.sqlite"))
+    rule = memo.plan("npm ci")
+    assert rule.outputs == ("node_modules",)
+    assert not memo.store("npm ci", cwd, {}, rule, "failed", 1, "ERR", 1.0)
+    assert not memo.store("npm ci", cwd, {}, rule, "timeout", None, "", 1.0)
+    assert memo.store("npm ci", cwd, {}, rule, "ok", 0, "added 1 package", 1.0)
+    assert memo.lookup("npm ci", cwd, {}, rule) is not None
+
+    os.rename(tmp_path / "node_modules", tmp_path / "gone")
+    assert memo.lookup("npm ci", cwd, {}, rule) is None
+
+
+def test_only_known_or_declared_commands_are_memoized(tmp_path):
+    memo = CommandMemo(path=str(tmp_path / "memo.sqlite"))
+    assert memo.plan("npm run dev") is None
+    assert memo.plan("python build.py", ["build.py"]).inputs == ("build.py",)
@@ -0,0 +1,68 @@
+import pytest
+
+from dev_crew.utils.context_compactor import ContextCompactor, chunk_markdown
+
+DOC = """Intro line
+
+# Architecture
+
+The app uses the Next.js app router.
+
+## Components
+
+```
+# not a heading
+```
+Button and Card live in src/components.
+
+# Deployment
+
+Deploy to Vercel.
+"""
+
+
+def test_chunks_record_line_ranges():
+    chunks = chunk_markdown(DOC, "design.md")
+    assert [(c.title, c.start_line, c.end_line) for c in chunks] == [
+        ("(preamble)", 1, 1),
+        ("Architecture", 3, 5),
+        ("Architecture > Components", 7, 12),
+        ("Deployment", 14, 16),
+    ]
+    lines = DOC.splitlines()
+    components = chunks[2]
+    assert '\n'.join(lines[components.start_line - 1:components.end_line]) == components.text
+
+
+def test_omitted_sections_list_line_ranges(tmp_path):
+    (tmp_path / "design.md").write_text(DOC)
+    context = ContextCompactor().compact(["design.md"], "components button card", max_tokens=20,
+                                         base_dir=str(tmp_path))
+    assert "Button and Card" in context
+    assert "- Deployment (design.md:L14-L16)" in context
+
+
+def test_crew_compacts_upstream_documents_into_task_context(tmp_path, monkeypatch):
+    pytest.importorskip('crewai')
+    from crewai import Agent
+    import dev_crew.crew as crew_module
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    monkeypatch.setenv('SERPER_API_KEY', 'test')
+    monkeypatch.setenv('DEVCREW_RULE_VALIDATION', 'false')
+    monkeypatch.setenv('OTEL_SDK_DISABLED', 'true')
+    monkeypatch.setattr(Agent, '_validate_docker_installation', lambda self: None)
+    contexts = {}
+
+    def execute_task(self, task, context=None, tools=None):
+        contexts[task.name] = context or ''
+        return f"# {task.name}\n\nOutput of {task.name}."
+
+    monkeypatch.setattr(Agent, 'execute_task', execute_task)
+    monkeypatch.chdir(tmp_path)
+    crew_module.DevCrew('x', project_name='p', workspace_dir=str(tmp_path)).crew().kickoff()
+
+    for name in ('implement_requirements', 'test_solution', 'create_documentation', 'review_implementation'):
+        assert contexts[name].startswith('[Context for: '), name
+    assert '## From p/docs/implementation/implementation_summary.md' in contexts['test_solution']
+    assert 'Output of implement_requirements' in contexts['test_solution']
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from dev_crew.api import main as api
+from dev_crew.api.events import ProjectEventBus, format_sse
+from dev_crew.api.store import MemoryProjectStore
+
+
+def test_replay_after_last_event_id_and_bounded_buffer():
+    bus = ProjectEventBus(buffer_size=3)
+
+    async def scenario():
+        for i in range(5):
+            await bus.publish("p", "progress", {"n": i})
+        return bus.events_after("p", 0), bus.events_after("p", 4)
+
+    buffered, after = asyncio.run(scenario())
+    assert [event[0] for event in buffered] == [3, 4, 5]
+    assert after == [(5, "progress", {"n": 4})]
+
+
+def test_subscribe_yields_buffered_then_live_events_and_heartbeats():
+    bus = ProjectEventBus()
+
+    async def scenario():
+        await bus.publish("p", "task_started", {"task": "plan"})
+        stream = bus.subscribe("p", last_event_id=0, heartbeat=0.05)
+        first = await stream.__anext__()
+        idle = await stream.__anext__()
+        asyncio.get_running_loop().call_later(0.01, lambda: asyncio.ensure_future(
+            bus.publish("p", "task_finished", {"task": "plan"})))
+        live = await stream.__anext__()
+        await stream.aclose()
+        return first, idle, live
+
+    first, idle, live = asyncio.run(scenario())
+    assert first == (1, "task_started", {"task": "plan"})
+    assert idle is None
+    assert live == (2, "task_finished", {"task": "plan"})
+
+
+def test_format_sse():
+    assert format_sse(7, "status", {"status": "running"}) == 'id: 7\nevent: status\ndata: {"status": "running"}\n\n'
+    assert format_sse(None, "status", {}).startswith("event: status\n")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    store = MemoryProjectStore()
+    monkeypatch.setattr(api, "get_store", lambda: store)
+    monkeypatch.setattr(api, "event_bus", ProjectEventBus())
+    return store, TestClient(api.app)
+
+
+def test_stream_resumes_from_last_event_id(client):
+    store, http = client
+    store.create("p", {"status": "running", "created_at": "2026-01-01", "updated_at": "2026-01-01"})
+
+    async def publish():
+        await api.event_bus.publish("p", "task_started", {"task": "plan"})
+        await api.event_bus.publish("p", "task_finished", {"task": "plan"})
+        await api.event_bus.publish("p", "status", {"status": "completed", "error": None})
+
+    asyncio.run(publish())
+    body = http.get("/projects/p/events", headers={"Last-Event-ID": "1"}).text
+    assert "id: 1\n" not in body
+    assert body.index("id: 2\nevent: task_finished") < body.index("id: 3\nevent: status")
+
+
+def test_stream_of_finished_project_without_buffer_reports_its_status(client):
+    store, http = client
+    store.create("p", {"status": "failed", "error": "boom", "created_at": "2026-01-01", "updated_at": "2026-01-01"})
+    body = http.get("/projects/p/events").text
+    assert body == 'event: status\ndata: {"status": "failed", "error": "boom"}\n\n'
@@ -0,0 +1,47 @@
+import os
+
+from dev_crew.utils.file_cache import ReadCache, read_window
+
+
+def test_cached_content_is_reread_when_mtime_or_size_changes(tmp_path):
+    path = tmp_path / "page.tsx"
+    path.write_bytes(b"version one\n")
+    cache = ReadCache(max_bytes=1024)
+    assert cache.get(str(path)) == b"version one\n"
+    assert cache.get(str(path)) == b"version one\n"
+    assert cache.stats()["hits"] == 1
+
+    stat_result = path.stat()
+    path.write_bytes(b"version two\n")
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+    assert cache.get(str(path)) == b"version two\n"
+
+    stat_result = path.stat()
+    path.write_bytes(b"version three\n")
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    assert cache.get(str(path)) == b"version three\n"
+    assert cache.stats() == {"entries": 1, "bytes": 14, "hits": 1, "misses": 3}
+
+
+def test_lru_stays_within_its_byte_budget(tmp_path):
+    cache = ReadCache(max_bytes=20, max_entry_bytes=10)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_bytes(name.encode() * 8)
+        cache.get(str(tmp_path / name))
+    (tmp_path / "big").write_bytes(b"x" * 11)
+    cache.get(str(tmp_path / "big"))
+
+    assert list(cache.entries) == [str(tmp_path / "b"), str(tmp_path / "c")]
+    assert cache.stats()["bytes"] == 16
+    cache.invalidate(str(tmp_path / "b"))
+    assert list(cache.entries) == [str(tmp_path / "c")]
+
+
+def test_read_window_ranges_and_truncation(tmp_path):
+    path = tmp_path / "notes.md"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 11)))
+    assert read_window(str(path), start_line=2, end_line=3) == "line 2\nline 3\n"
+    assert read_window(str(path), offset=0, length=4) == "line"
+    truncated = read_window(str(path), start_line=1, max_bytes=15)
+    assert truncated.startswith("line 1\nline 2\n")
+    assert "continue with start_line=3" in truncated
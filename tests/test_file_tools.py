@@ -0,0 +1,16 @@
+from dev_crew.tools.file_tools import BatchFileWriteTool, FileTools
+
+
+def test_batch_write_reports_directory_fsync_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVCREW_WORKSPACE", str(tmp_path))
+
+    def fail(dir_path):
+        raise OSError("fsync not supported")
+
+    monkeypatch.setattr(FileTools, "fsync_dir", staticmethod(fail))
+    summary = BatchFileWriteTool()._run(
+        files=[{"path": "src/a.ts", "content": "a"}, {"path": "src/b.ts", "content": "bb"}], fsync=True
+    )
+    assert "Wrote 2 of 2 files (3 bytes)" in summary
+    assert "- src/a.ts: ok (1 bytes); directory fsync failed: fsync not supported" in summary
+    assert (tmp_path / "src" / "b.ts").read_text() == "bb"
@@ -0,0 +1,63 @@
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from dev_crew.api import files
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "app.ts").write_text("export const value = 1;\n" * 200)
+    (tmp_path / "small.md").write_text("# Title\n")
+
+    async def serve(request):
+        return files.file_response(files.resolve_within(str(tmp_path), request.path_params["path"]), request)
+
+    return TestClient(Starlette(routes=[Route("/{path:path}", serve)]))
+
+
+def test_etag_and_if_none_match(client):
+    first = client.get("/small.md")
+    assert first.status_code == 200
+    assert first.headers["content-type"].startswith("text/markdown")
+    cached = client.get("/small.md", headers={"If-None-Match": f'W/{first.headers["etag"]}'})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == first.headers["etag"]
+
+
+def test_gzip_for_large_text_files(client):
+    response = client.get("/app.ts", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"].endswith('-gzip"')
+    assert response.text == "export const value = 1;\n" * 200
+
+    plain = client.get("/app.ts", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert client.get("/app.ts", headers={"If-None-Match": response.headers["etag"],
+                                          "Accept-Encoding": "gzip"}).status_code == 304
+
+
+def test_range_is_served_uncompressed(client):
+    response = client.get("/app.ts", headers={"Range": "bytes=0-5", "Accept-Encoding": "gzip"})
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.content == b"export"
+
+
+def test_compressed_chunks_round_trip(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"x" * (files.CHUNK_SIZE * 2 + 10))
+    assert gzip.decompress(b"".join(files.compressed_chunks(str(path), "gzip"))) == path.read_bytes()
+
+
+def test_choose_encoding_and_resolve_within(tmp_path):
+    assert files.choose_encoding("gzip;q=0, br") is None
+    assert files.choose_encoding("br, gzip;q=0.5") == "gzip"
+    (tmp_path / "a.txt").write_text("a")
+    assert files.resolve_within(str(tmp_path), "a.txt") == str((tmp_path / "a.txt").resolve())
+    assert files.resolve_within(str(tmp_path / "sub"), "../a.txt") is None
@@ -0,0 +1,27 @@
+import importlib.util
+import os
+
+import pytest
+
+import dev_crew
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.dirname(os.path.dirname(dev_crew.__file__))
+
+spec = importlib.util.spec_from_file_location("import_time", os.path.join(ROOT, "benchmarks", "import_time.py"))
+import_time = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(import_time)
+
+ENTRY_POINTS = ['dev_crew.main', 'dev_crew.api.main', 'dev_crew.api.worker']
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_cold_import_stays_within_budget(module, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", SRC_DIR)
+    budget_ms, forbidden = import_time.BUDGETS[module]
+    # Best of three fresh interpreters, like the benchmark, so one slow start doesn't fail the suite
+    best, imports = min((import_time.measure(module) for _ in range(3)), key=lambda run: run[0])
+
+    loaded = {name for name, _, _ in imports}
+    assert not loaded & set(forbidden), f"{module} imports {sorted(loaded & set(forbidden))} eagerly"
+    assert best <= budget_ms, f"{module} took {best:.0f} ms (budget {budget_ms:.0f} ms)"
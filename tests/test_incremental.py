@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from dev_crew.utils.incremental import BuildState
+
+
+def make_task(name, description="do it"):
+    return SimpleNamespace(name=name, description=description, expected_output="done",
+                           agent=SimpleNamespace(role="Engineer"))
+
+
+def make_state(tmp_path):
+    workspace = tmp_path / "workspace"
+    (workspace / "docs").mkdir(parents=True, exist_ok=True)
+    if not (workspace / "docs" / "requirements.md").exists():
+        (workspace / "docs" / "requirements.md").write_text("# Requirements\n")
+    state = BuildState(str(tmp_path), str(workspace))
+    state.set_graph([
+        ("scaffold", [], ["src"]),
+        ("implement", ["docs/requirements.md", "src"], ["src"])
+    ])
+    return state, workspace
+
+
+def run(state, workspace, task, content):
+    (workspace / "src").mkdir(exist_ok=True)
+    (workspace / "src" / "index.ts").write_text(content)
+    state.task_finished(task)
+
+
+def test_task_is_skipped_only_while_prompt_and_inputs_are_unchanged(tmp_path):
+    state, workspace = make_state(tmp_path)
+    scaffold, implement = make_task("scaffold"), make_task("implement")
+    assert state.up_to_date_reason(implement) is None
+
+    run(state, workspace, scaffold, "// scaffold\n")
+    run(state, workspace, implement, "// implemented\n")
+    assert state.up_to_date_reason(implement).startswith("Up to date: inputs unchanged")
+    assert make_state(tmp_path)[0].up_to_date_reason(implement) is not None
+
+    assert state.up_to_date_reason(make_task("implement", "do it differently")) is None
+    (workspace / "docs" / "requirements.md").write_text("# Requirements\n- login\n")
+    assert state.up_to_date_reason(implement) is None
+
+
+def test_own_edits_keep_a_task_fresh_but_an_upstream_rerun_does_not(tmp_path):
+    state, workspace = make_state(tmp_path)
+    scaffold, implement = make_task("scaffold"), make_task("implement")
+    run(state, workspace, scaffold, "// scaffold\n")
+    run(state, workspace, implement, "// implemented\n")
+    (workspace / "src" / "index.ts").write_text("// edited again by implement\n")
+    assert state.up_to_date_reason(implement) is not None
+
+    run(state, workspace, scaffold, "// new scaffold\n")
+    assert state.up_to_date_reason(implement) is None
+
+
+def test_missing_outputs_and_clear_force_a_rerun(tmp_path):
+    state, workspace = make_state(tmp_path)
+    scaffold = make_task("scaffold")
+    run(state, workspace, scaffold, "// scaffold\n")
+    assert state.up_to_date_reason(scaffold) is not None
+
+    (workspace / "src" / "index.ts").unlink()
+    (workspace / "src").rmdir()
+    assert state.up_to_date_reason(scaffold) is None
+
+    run(state, workspace, scaffold, "// scaffold\n")
+    state.clear()
+    assert state.up_to_date_reason(scaffold) is None
+    assert not (tmp_path / ".devcrew" / "build_state.json").exists()
@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import dev_crew
+
+pytest.importorskip('crewai')
+
+from crewai import LLM
+
+from dev_crew.utils import llm_cache
+from dev_crew.utils.llm_cache import CachedLLM, InstrumentedLLM, LLMResponseCache
+
+MESSAGES = [{"role": "user", "content": "Write a component"}]
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Stub for the underlying crewAI LLM.call; queue exceptions or responses in `script`"""
+    calls = []
+    script = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        calls.append(messages)
+        outcome = script.pop(0) if script else f"response {len(calls)}"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(LLM, "call", call)
+    monkeypatch.setattr(llm_cache.time, "sleep", lambda seconds: None)
+    return calls, script
+
+
+def cached_llm(tmp_path):
+    return CachedLLM(model="gpt-4o-mini", response_cache=LLMResponseCache(path=str(tmp_path / "llm.sqlite")))
+
+
+def test_cache_hit_and_miss(tmp_path, provider):
+    calls, _ = provider
+    llm = cached_llm(tmp_path)
+    assert llm.call(MESSAGES) == "response 1"
+    assert llm.call([{"role": "user", "content": "Write a component  \r\n"}]) == "response 1"
+    assert llm.call([{"role": "user", "content": "Write a page"}]) == "response 2"
+    assert len(calls) == 2
+
+
+def test_indentation_changes_the_key():
+    key = LLMResponseCache.make_key
+    flat = [{"role": "user", "content": "if x:\nreturn 1"}]
+    indented = [{"role": "user", "content": "if x:\n    return 1"}]
+    assert key("m", flat) != key("m", indented)
+    assert key("m", [{"role": "user", "content": "  a"}]) != key("m", [{"role": "user", "content": "a"}])
+
+
+def test_tool_calls_bypass_the_cache(tmp_path, provider):
+    calls, _ = provider
+    llm = cached_llm(tmp_path)
+    tools = {"write_file": lambda **kwargs: None}
+    llm.call(MESSAGES, available_functions=tools)
+    llm.call(MESSAGES, available_functions=tools)
+    assert len(calls) == 2
+
+
+def test_transient_errors_are_retried(provider, monkeypatch):
+    calls, script = provider
+    monkeypatch.setattr(llm_cache, "LLM_MAX_RETRIES", 2)
+    script.extend([ProviderError(503), ProviderError(429)])
+    assert InstrumentedLLM(model="gpt-4o-mini").call(MESSAGES) == "response 3"
+
+    calls.clear()
+    script.extend([ProviderError(400)])
+    with pytest.raises(ProviderError):
+        InstrumentedLLM(model="gpt-4o-mini").call(MESSAGES)
+    assert len(calls) == 1
+
+    calls.clear()
+    script.extend([ProviderError(503)] * 3)
+    with pytest.raises(ProviderError):
+        InstrumentedLLM(model="gpt-4o-mini").call(MESSAGES)
+    assert len(calls) == 3
+
+
+def test_negative_retry_setting_still_calls_once(provider, monkeypatch):
+    calls, _ = provider
+    src_dir = os.path.dirname(os.path.dirname(dev_crew.__file__))
+    env = {**os.environ, "DEVCREW_LLM_RETRIES": "-3", "PYTHONPATH": src_dir}
+    retries = subprocess.run(
+        [sys.executable, "-c", "from dev_crew.utils.llm_cache import LLM_MAX_RETRIES; print(LLM_MAX_RETRIES)"],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert retries == "0"
+
+    monkeypatch.setattr(llm_cache, "LLM_MAX_RETRIES", int(retries))
+    assert InstrumentedLLM(model="gpt-4o-mini").call(MESSAGES) == "response 1"
+    assert len(calls) == 1
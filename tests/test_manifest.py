@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from dev_crew.api import main as api
+from dev_crew.api.store import MemoryProjectStore
+from dev_crew.utils import manifest as manifest_module
+from dev_crew.utils.manifest import ArtifactManifest
+
+
+def write(root, rel_path, text):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return text.encode()
+
+
+def test_record_get_and_docs(tmp_path):
+    manifest = ArtifactManifest(str(tmp_path))
+    manifest.record("docs/architecture/architecture.md", write(tmp_path, "docs/architecture/architecture.md", "# A"))
+    manifest.record("src/app/page.tsx", write(tmp_path, "src/app/page.tsx", "export {}"))
+    manifest.flush()
+
+    entry = manifest.get("./docs/architecture/architecture.md")
+    assert entry["doc_type"] == "architecture" and entry["size"] == 3
+    assert manifest.get("../outside.md") is None
+    assert [e["path"] for e in manifest.docs()] == ["docs/architecture/architecture.md"]
+
+    reloaded = ArtifactManifest(str(tmp_path))
+    assert set(reloaded.entries) == {"docs/architecture/architecture.md", "src/app/page.tsx"}
+
+
+def test_record_saves_at_most_once_per_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifest_module, "SAVE_INTERVAL", 3600)
+    manifest = ArtifactManifest(str(tmp_path))
+    saves = []
+    original_save = manifest.save
+    monkeypatch.setattr(manifest, "save", lambda: (saves.append(1), original_save()))
+
+    for i in range(50):
+        manifest.record(f"src/file_{i}.ts", write(tmp_path, f"src/file_{i}.ts", str(i)))
+    assert len(saves) == 1
+    manifest.flush()
+    assert len(saves) == 2
+    with open(manifest.path) as f:
+        assert len(json.load(f)["entries"]) == 50
+
+
+def test_pending_entries_survive_a_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifest_module, "SAVE_INTERVAL", 3600)
+    writer = ArtifactManifest(str(tmp_path))
+    writer.record("a.txt", write(tmp_path, "a.txt", "a"))
+    other = ArtifactManifest(str(tmp_path))
+    other.record("b.txt", write(tmp_path, "b.txt", "b"), save=False)
+    other.save()
+
+    writer.record("c.txt", write(tmp_path, "c.txt", "c"))
+    writer.flush()
+    assert set(ArtifactManifest(str(tmp_path)).entries) == {"a.txt", "b.txt", "c.txt"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    store = MemoryProjectStore()
+    monkeypatch.setattr(api, "get_store", lambda: store)
+    api.load_manifest.cache_clear()
+    yield store, TestClient(api.app)
+    api.load_manifest.cache_clear()
+
+
+def test_docs_endpoint_falls_back_to_disk(tmp_path, client):
+    store, http = client
+    store.create("p", {"status": "completed", "created_at": "2026-01-01", "updated_at": "2026-01-01",
+                       "artifacts_path": str(tmp_path)})
+    manifest = ArtifactManifest(str(tmp_path))
+    manifest.record("docs/requirements/plan.md", write(tmp_path, "docs/requirements/plan.md", "# Plan"))
+    manifest.flush()
+    write(tmp_path, "docs/testing/coverage.md", "# Coverage")
+
+    assert http.get("/projects/p/docs/requirements/plan.md").text == "# Plan"
+    assert http.get("/projects/p/docs/testing/coverage.md").text == "# Coverage"
+    assert http.get("/projects/p/docs/missing.md").status_code == 404
+    assert http.get("/projects/p/docs/../../etc/passwd").status_code == 404
@@ -0,0 +1,50 @@
+import pytest
+
+from dev_crew.utils import metrics
+from dev_crew.utils.metrics import Metric, MetricsRegistry
+
+
+def test_prometheus_text_output():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("devcrew_step_seconds", "Step time", ["step"], buckets=(1, 0.5))
+    counter = registry.counter("devcrew_files_total", "Files written", ["path"])
+    gauge = registry.gauge("devcrew_queue_depth", "Queued projects")
+    for value in (0.2, 0.7, 3):
+        histogram.observe(value, step="build")
+    counter.inc(path='docs\\"a"\nb')
+    counter.inc(2, path='docs\\"a"\nb')
+    gauge.set(0.25)
+    registry.record("devcrew_unknown", 1)
+
+    assert registry.render() == "\n".join([
+        "# HELP devcrew_step_seconds Step time",
+        "# TYPE devcrew_step_seconds histogram",
+        'devcrew_step_seconds_bucket{step="build",le="0.5"} 1',
+        'devcrew_step_seconds_bucket{step="build",le="1"} 2',
+        'devcrew_step_seconds_bucket{step="build",le="+Inf"} 3',
+        'devcrew_step_seconds_sum{step="build"} 3.9',
+        'devcrew_step_seconds_count{step="build"} 3',
+        "# HELP devcrew_files_total Files written",
+        "# TYPE devcrew_files_total counter",
+        'devcrew_files_total{path="docs\\\\\\"a\\"\\nb"} 3',
+        "# HELP devcrew_queue_depth Queued projects",
+        "# TYPE devcrew_queue_depth gauge",
+        "devcrew_queue_depth 0.25",
+    ]) + "\n"
+
+
+def test_metric_subclasses_must_implement_record_and_samples():
+    class Summary(Metric):
+        def record(self, value, **labels):
+            pass
+
+    with pytest.raises(TypeError):
+        Summary("devcrew_summary", "Incomplete metric")
+
+
+def test_observe_goes_to_the_forwarder_in_worker_processes(monkeypatch):
+    forwarded = []
+    monkeypatch.setattr(metrics, "_forwarder", forwarded.append)
+    metrics.observe(metrics.PROJECTS.name, 1, status="completed")
+    assert forwarded == [{"type": "metric", "metric": "devcrew_projects_total", "value": 1,
+                          "labels": {"status": "completed"}}]
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import dev_crew
+from dev_crew.api.store import MemoryProjectStore, ProjectStore, SQLiteProjectStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryProjectStore()
+    return SQLiteProjectStore(str(tmp_path / "projects.sqlite"))
+
+
+def add(store, project_id, created_at, status="completed"):
+    store.create(project_id, {"status": status, "created_at": created_at, "updated_at": created_at})
+
+
+def test_list_pages_newest_first(store):
+    for i in range(5):
+        add(store, f"p{i}", f"2026-01-0{i + 1}T00:00:00")
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.list(limit=2, cursor=cursor)
+        seen.extend(record["project_id"] for record in page)
+        if cursor is None:
+            break
+    assert seen == ["p4", "p3", "p2", "p1", "p0"]
+
+
+def test_list_filters_by_status(store):
+    add(store, "a", "2026-01-01T00:00:00", status="failed")
+    add(store, "b", "2026-01-02T00:00:00")
+    add(store, "c", "2026-01-03T00:00:00", status="failed")
+    page, cursor = store.list(status="failed", limit=1)
+    assert [r["project_id"] for r in page] == ["c"]
+    page, cursor = store.list(status="failed", limit=1, cursor=cursor)
+    assert [r["project_id"] for r in page] == ["a"]
+    assert cursor is None
+
+
+def test_invalid_cursor_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.list(cursor="not-a-cursor")
+
+
+def test_get_many_and_update(store):
+    add(store, "a", "2026-01-01T00:00:00", status="running")
+    assert store.update("a", {"status": "completed", "progress": 100})
+    assert not store.update("missing", {"status": "failed"})
+    assert store.get("a")["status"] == "completed"
+    assert store.get("a")["updated_at"] != "2026-01-01T00:00:00"
+    assert set(store.get_many(["a", "missing"])) == {"a"}
+    assert "a" in store and "missing" not in store
+
+
+def test_concurrent_updates_are_not_lost(store):
+    add(store, "a", "2026-01-01T00:00:00", status="running")
+
+    def worker(n):
+        for i in range(20):
+            store.update("a", {f"key_{n}_{i}": i})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    record = store.get("a")
+    assert all(f"key_{n}_{i}" in record for n in range(8) for i in range(20))
+
+
+def test_store_backends_must_implement_the_whole_interface(store):
+    class ReadOnlyStore(ProjectStore):
+        def get(self, project_id):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnlyStore()
+    add(store, "p1", "2026-01-01")
+    assert "p1" in store
+    assert "missing" not in store
+
+
+def test_importing_the_app_creates_no_database(tmp_path):
+    src_dir = os.path.dirname(os.path.dirname(dev_crew.__file__))
+    env = {**os.environ, "DEVCREW_WORKSPACE": str(tmp_path), "PYTHONPATH": src_dir}
+    env.pop("DEVCREW_PROJECT_DB", None)
+    subprocess.run([sys.executable, "-c", "import dev_crew.api.main"], cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / ".devcrew").exists()
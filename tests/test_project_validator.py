@@ -0,0 +1,84 @@
+import json
+
+from dev_crew.utils.project_validator import FAIL, INCONCLUSIVE, PASS, ProjectValidator
+
+DOCS = {
+    'docs/requirements/project_plan.md': "# Plan\n## Task breakdown\n- a\n## Estimates\n- 2 days\n",
+    'docs/architecture/architecture.md': (
+        "# Architecture\n## System Overview\n```mermaid\ngraph TD; A-->B\n```\n## Technology Stack\nNext.js\n"
+        "## Component Architecture\nx\n## Data Flow\nx\n## Non-Functional Requirements\nx\n## Infrastructure\nx\n"
+    ),
+    'docs/technical_design/technical_design.md': (
+        "# Technical design\n## Component Implementation Details\n- `TaskList` renders `<TaskItem />`\n"
+        "- helpers in `src/lib/format.ts`\n## Development Standards\nx\n## Technical Requirements\nx\n"
+    ),
+    'docs/implementation/implementation_summary.md': "# Summary\nGET `/api/tasks/:id` returns a task\n",
+    'docs/testing/test_results.md': "# Results\n## Unit\n## Integration\n## E2E\n## Coverage\n"
+}
+SOURCES = {
+    'src/components/TaskList.tsx': "export default function TaskList() { return <TaskItem /> }\n",
+    'src/components/TaskItem.tsx': "export function TaskItem() { return null }\n",
+    'src/lib/format.ts': "export const format = (s: string) => s\n",
+    'src/app/api/tasks/[id]/route.ts': "export async function GET() {}\n",
+    'src/app/page.test.tsx': "test('renders', () => {})\n",
+    'tsconfig.json': '{\n  // comment\n  "compilerOptions": {"strict": true,},\n}\n',
+    'next.config.ts': '', 'eslint.config.mjs': '', 'postcss.config.mjs': '', '.prettierrc': '{}',
+    'jest.config.ts': "export default { collectCoverageFrom: ['src/**/*.tsx'] }\n"
+}
+PACKAGE = {
+    'scripts': {'dev': 'next dev', 'build': 'next build'},
+    'dependencies': {'next': '15', 'react': '19', 'react-dom': '19'},
+    'devDependencies': {'typescript': '5', 'jest': '29', '@testing-library/react': '16', 'prettier': '3'}
+}
+
+def make_project(root, **overrides):
+    files = {**DOCS, **SOURCES, 'package.json': json.dumps(PACKAGE), **overrides}
+    for rel_path, content in files.items():
+        if content is None:
+            continue
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return ProjectValidator(str(root))
+
+def statuses(report):
+    return {check.name: check.status for check in report.checks}
+
+def test_complete_project_passes_both_phases(tmp_path):
+    validator = make_project(tmp_path)
+    assert validator.validate('setup').passed
+    report = validator.validate('final')
+    assert report.passed, report.to_markdown()
+
+def test_missing_sections_and_diagram_fail(tmp_path):
+    validator = make_project(tmp_path, **{
+        'docs/architecture/architecture.md': "# Architecture\n## System Overview\n" + "text " * 50,
+        'docs/testing/test_results.md': "# Results\n## Unit\n"
+    })
+    result = statuses(validator.validate('final'))
+    assert result['architecture document'] == FAIL
+    assert result['test results document'] == FAIL
+    assert result['architecture diagram'] == FAIL
+
+def test_prettier_coverage_api_docs_and_components_are_checked(tmp_path):
+    validator = make_project(tmp_path, **{
+        '.prettierrc': None,
+        'jest.config.ts': "export default {}\n",
+        'docs/implementation/implementation_summary.md': "# Summary\nNo routes listed\n",
+        'src/components/TaskItem.tsx': "export const unrelated = 1\n"
+    })
+    result = statuses(validator.validate('final'))
+    assert result['Prettier setup'] == FAIL
+    assert result['coverage configuration'] == FAIL
+    assert result['API documentation'] == FAIL
+    assert result['required components and utilities'] == FAIL
+
+def test_design_without_named_components_is_inconclusive(tmp_path):
+    validator = make_project(tmp_path, **{
+        'docs/technical_design/technical_design.md': "# Design\n## Components\nSome prose\n"
+                                                     "## Standards\nx\n## Requirements\nx\n"
+    })
+    report = validator.validate('final')
+    assert statuses(report)['required components and utilities'] == INCONCLUSIVE
+    assert not report.passed
+    assert statuses(report)['technical design document'] == PASS
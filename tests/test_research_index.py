@@ -0,0 +1,28 @@
+import os
+
+from dev_crew.utils.research_index import ResearchIndex
+
+
+def test_near_duplicate_queries_match():
+    index = ResearchIndex()
+    index.add("Next.js authentication best practices", {"answer": "auth"})
+    match = index.lookup("nextjs auth best practices")
+    assert match is not None
+    assert match["result"] == {"answer": "auth"}
+
+
+def test_different_framework_does_not_match():
+    index = ResearchIndex()
+    index.add("react hooks tutorial", {"answer": "react"})
+    index.add("next.js app router caching", {"answer": "next"})
+    assert index.lookup("vue hooks tutorial") is None
+    assert index.lookup("svelte app router caching") is None
+
+
+def test_default_path_round_trip(tmp_path):
+    path = ResearchIndex.default_path(str(tmp_path))
+    assert path == os.path.join(str(tmp_path), ".devcrew", "research_index.json")
+    index = ResearchIndex()
+    index.add("tailwind dark mode", {"answer": "class strategy"})
+    index.save(path)
+    assert ResearchIndex.load(path).lookup("tailwind dark mode")["result"] == {"answer": "class strategy"}
@@ -0,0 +1,54 @@
+import os
+
+from dev_crew.utils.scaffold_cache import ScaffoldCache
+
+
+def test_hardlink_copies_mutable_node_modules_files(tmp_path, monkeypatch):
+    cache = ScaffoldCache(str(tmp_path / "cache"))
+    template = cache.template_path("key")
+    os.makedirs(os.path.join(template, "node_modules", ".bin"))
+    os.makedirs(os.path.join(template, "node_modules", "react"))
+    (tmp_path / "cache" / "key" / "meta.json").write_text("{}")
+    files = ["node_modules/.package-lock.json", "node_modules/.bin/next",
+             "node_modules/react/index.js", "package.json"]
+    for name in files:
+        with open(os.path.join(template, name), "w") as f:
+            f.write("original")
+
+    monkeypatch.setenv("DEVCREW_SCAFFOLD_CLONE", "hardlink")
+    dest = str(tmp_path / "project")
+    assert cache.materialize("key", dest) == "hardlink"
+
+    for name in files:
+        expected = 2 if name == "node_modules/react/index.js" else 1
+        assert os.stat(os.path.join(dest, name)).st_nlink == expected
+
+    with open(os.path.join(dest, "node_modules", ".package-lock.json"), "w") as f:
+        f.write("rewritten by npm")
+    with open(os.path.join(template, "node_modules", ".package-lock.json")) as f:
+        assert f.read() == "original"
+
+
+def test_materialize_keeps_existing_devcrew_state(tmp_path, monkeypatch):
+    from dev_crew.tools.framework_tool import PRESERVED_ENTRIES
+
+    cache = ScaffoldCache(str(tmp_path / "cache"))
+    template = cache.template_path("key")
+    os.makedirs(os.path.join(template, ".devcrew"))
+    (tmp_path / "cache" / "key" / "meta.json").write_text("{}")
+    with open(os.path.join(template, ".devcrew", "manifest.json"), "w") as f:
+        f.write("template")
+    with open(os.path.join(template, "package.json"), "w") as f:
+        f.write("{}")
+
+    dest = tmp_path / "project"
+    (dest / ".devcrew" / "checkpoints").mkdir(parents=True)
+    (dest / ".devcrew" / "manifest.json").write_text("project")
+    (dest / ".devcrew" / "checkpoints" / "analyze_requirements.json").write_text("{}")
+
+    monkeypatch.setenv("DEVCREW_SCAFFOLD_CLONE", "copy")
+    cache.materialize("key", str(dest), preserve=PRESERVED_ENTRIES)
+
+    assert (dest / "package.json").exists()
+    assert (dest / ".devcrew" / "manifest.json").read_text() == "project"
+    assert (dest / ".devcrew" / "checkpoints" / "analyze_requirements.json").exists()
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from dev_crew.utils.search_cache import SearchCache, SingleFlight, normalize_query
+
+
+def test_normalize_query_keeps_order_and_content_words():
+    assert normalize_query("  How to use  Next.js?  ") == "use next.js"
+    assert normalize_query("use redux instead of zustand") != normalize_query("use zustand instead of redux")
+    assert normalize_query("best react state library") != normalize_query("react state library")
+    assert normalize_query("The REACT hooks") == normalize_query("react   hooks")
+
+
+def test_concurrent_lookups_fetch_once(tmp_path):
+    cache = SearchCache(path=str(tmp_path / "search.sqlite"))
+    fetches = []
+    barrier = threading.Barrier(8)
+    results = []
+
+    def fetch():
+        fetches.append(1)
+        time.sleep(0.1)
+        return {"organic": [{"title": "hooks"}]}
+
+    def lookup():
+        barrier.wait()
+        results.append(cache.get_or_fetch("react hooks", fetch))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fetches) == 1
+    assert results == [{"organic": [{"title": "hooks"}]}] * 8
+
+
+def test_late_follower_reuses_the_finished_result(tmp_path):
+    cache = SearchCache(path=str(tmp_path / "search.sqlite"))
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {"organic": []} if len(fetches) > 1 else {"organic": [{"title": "first"}]}
+
+    cache.get_or_fetch("react hooks", fetch)
+    # A caller whose cache lookup ran before the leader's write, and whose flight starts after it ended
+    real_get = cache.cache.get
+    lookups = []
+
+    def get(key):
+        lookups.append(key)
+        return None if len(lookups) == 1 else real_get(key)
+
+    cache.cache.get = get
+    assert cache.get_or_fetch("react hooks", fetch) == {"organic": [{"title": "first"}]}
+    assert len(fetches) == 1
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait()
+        raise RuntimeError("boom")
+
+    def call(fn):
+        try:
+            flight.do("k", fn)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call, args=(failing,))
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call, args=(lambda: "never",))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2 and errors[0] is errors[1]
@@ -0,0 +1,22 @@
+import sys
+
+from dev_crew.tools.shell_tool import TAIL_BYTES, ShellCommand, run_command
+
+
+def python_command(code):
+    return f'"{sys.executable}" -c "{code}"'
+
+
+def test_progress_bars_keep_last_frame(tmp_path):
+    code = "import sys; sys.stdout.write(chr(13).join(['10%', '50%', '100%']) + chr(10) + 'done' + chr(13) + chr(10))"
+    result = run_command(ShellCommand(command=python_command(code)), str(tmp_path), str(tmp_path / "out.log"))
+    assert result.status == 'ok'
+    assert result.tail_lines() == ['100%\n', 'done\n']
+
+
+def test_output_without_newlines_is_bounded(tmp_path):
+    code = "import sys; sys.stdout.write('x' * 1000000)"
+    result = run_command(ShellCommand(command=python_command(code)), str(tmp_path), str(tmp_path / "out.log"))
+    assert result.status == 'ok'
+    assert result.tail_text() == 'x' * TAIL_BYTES
+    assert (tmp_path / "out.log").stat().st_size == 1000000
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from dev_crew.utils.task_scheduler import DependencyFailed, DependencyGate, TaskScheduler
+
+TASK_SECONDS = 0.3
+
+def test_gate_runs_independent_tasks_together_and_dependents_after():
+    gate = DependencyGate({'a': set(), 'b': set(), 'c': {'a', 'b'}}, max_parallel=2)
+    spans = {}
+
+    def run(name):
+        with gate.slot(name):
+            start = time.perf_counter()
+            time.sleep(TASK_SECONDS)
+            spans[name] = (start, time.perf_counter())
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in ('c', 'a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert spans['a'][0] < spans['b'][1] and spans['b'][0] < spans['a'][1]
+    assert spans['c'][0] >= max(spans['a'][1], spans['b'][1])
+
+def test_gate_limits_concurrency():
+    gate = DependencyGate({name: set() for name in 'abcd'}, max_parallel=2)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def run(name):
+        with gate.slot(name):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in 'abcd']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+def test_gate_fails_dependents_of_a_failed_task():
+    gate = DependencyGate({'a': set(), 'b': {'a'}})
+    with pytest.raises(RuntimeError):
+        with gate.slot('a'):
+            raise RuntimeError("boom")
+    with pytest.raises(DependencyFailed):
+        with gate.slot('b'):
+            pass
+
+def test_crew_overlaps_independent_tasks(tmp_path, monkeypatch):
+    """Pipeline tasks that don't depend on each other execute at the same time"""
+    pytest.importorskip('crewai')
+    from crewai import Agent
+    import dev_crew.crew as crew_module
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    monkeypatch.setenv('SERPER_API_KEY', 'test')
+    monkeypatch.setenv('DEVCREW_RULE_VALIDATION', 'false')
+    monkeypatch.setenv('OTEL_SDK_DISABLED', 'true')
+    monkeypatch.setattr(Agent, '_validate_docker_installation', lambda self: None)
+    spans = {}
+
+    def execute_task(self, task, context=None, tools=None):
+        start = time.perf_counter()
+        time.sleep(TASK_SECONDS)
+        spans[task.name] = (start, time.perf_counter())
+        return "done"
+
+    monkeypatch.setattr(Agent, 'execute_task', execute_task)
+    monkeypatch.chdir(tmp_path)
+    dev_crew = crew_module.DevCrew('x', project_name='p', workspace_dir=str(tmp_path), max_parallel_tasks=2)
+    crew = dev_crew.crew()
+
+    started = time.perf_counter()
+    crew.kickoff()
+    elapsed = time.perf_counter() - started
+
+    scheduler = TaskScheduler()
+    for task, inputs, outputs in dev_crew.task_graph():
+        scheduler.add_task(task.name, inputs=inputs, outputs=outputs)
+    levels = scheduler.levels()
+    assert len(spans) == len(crew.tasks)
+    # Every level of independent tasks overlaps; only the crew's final synchronous task runs alone
+    assert elapsed < (len(levels) + 1.5) * TASK_SECONDS < len(crew.tasks) * TASK_SECONDS
+    for name, deps in scheduler.dependencies().items():
+        for dependency in deps:
+            assert spans[name][0] >= spans[dependency][1]
+    first, second = (spans[node.name] for node in levels[0][:2])
+    assert first[0] < second[1] and second[0] < first[1]
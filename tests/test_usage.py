@@ -0,0 +1,48 @@
+import pytest
+
+from dev_crew.utils.usage import BudgetExceeded, UsageLedger, price_for
+
+
+def test_abort_mode_raises_once_budget_is_used_up():
+    ledger = UsageLedger(max_tokens=100)
+    ledger.record("gpt-4o-mini", 40, 20, agent="Architect", task="plan")
+    ledger.check()
+    assert not ledger.exceeded
+
+    ledger.record("gpt-4o-mini", 30, 10, agent="Architect", task="plan")
+    assert ledger.exceeded
+    with pytest.raises(BudgetExceeded, match="100/100 tokens"):
+        ledger.check()
+    assert ledger.should_skip(None) is None
+
+
+def test_degrade_mode_skips_new_tasks_but_lets_calls_run_to_the_hard_limit():
+    ledger = UsageLedger(max_tokens=100, on_exceeded="degrade", hard_limit_factor=1.5)
+    ledger.record("gpt-4o", 80, 30)
+    assert ledger.exceeded
+    assert ledger.should_skip(None).startswith("Skipped: project budget exceeded")
+    ledger.check()
+
+    ledger.record("gpt-4o", 40, 0)
+    with pytest.raises(BudgetExceeded):
+        ledger.check()
+
+
+def test_cost_budget_uses_model_prices():
+    ledger = UsageLedger(max_cost_usd=0.01)
+    ledger.record("openai/gpt-4o-2024-08-06", 2_000, 500, task="build")
+    snapshot = ledger.snapshot()
+    assert snapshot["cost_usd"] == pytest.approx(0.01)
+    assert snapshot["by_task"]["build"]["requests"] == 1
+    assert snapshot["budget"] == {"max_tokens": None, "max_cost_usd": 0.01, "on_exceeded": "abort"}
+    assert snapshot["budget_exceeded"]
+    assert price_for("unknown-model", ledger.prices) == (0.0, 0.0)
+
+
+def test_without_a_budget_nothing_is_enforced():
+    ledger = UsageLedger.from_budget(None)
+    ledger.record("gpt-4", 10**6, 10**6)
+    ledger.check()
+    assert ledger.snapshot()["budget"] is None
+    with pytest.raises(ValueError):
+        UsageLedger(on_exceeded="ignore")
@@ -0,0 +1,52 @@
+import asyncio
+import os
+import sys
+import time
+
+import dev_crew
+from dev_crew.api.worker import CrewWorkerPool
+
+SRC_DIR = os.path.dirname(os.path.dirname(dev_crew.__file__))
+
+WORKER = """
+import sys
+from dev_crew.api.worker import install_termination_handler
+from dev_crew.tools.shell_tool import ShellTool
+install_termination_handler()
+ShellTool()._run(commands=[{"command": "echo $$ > " + sys.argv[1] + "; exec sleep 60", "timeout": 120}])
+"""
+
+
+def alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] not in ("Z", "X")
+    except FileNotFoundError:
+        return False
+
+
+def test_terminate_kills_shell_commands_of_the_worker(tmp_path):
+    pid_file = tmp_path / "sleep.pid"
+    pool = CrewWorkerPool(max_workers=1, workspace_dir=str(tmp_path))
+
+    async def scenario():
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", WORKER, str(pid_file),
+            env={**os.environ, "DEVCREW_WORKSPACE": str(tmp_path), "PYTHONPATH": SRC_DIR},
+            start_new_session=True
+        )
+        pool.processes["project"] = process
+        deadline = time.monotonic() + 60
+        while not (pid_file.exists() and pid_file.read_text().strip()):
+            assert time.monotonic() < deadline, "command never started"
+            await asyncio.sleep(0.1)
+        sleep_pid = int(pid_file.read_text())
+        assert alive(sleep_pid)
+        assert await pool.terminate("project")
+        return sleep_pid
+
+    sleep_pid = asyncio.run(scenario())
+    deadline = time.monotonic() + 5
+    while alive(sleep_pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not alive(sleep_pid)